@@ -4,14 +4,65 @@
 from flask import Blueprint, jsonify, request
 from backend.db import execute_query
 from backend.api.auth import login_required
+from backend.columnar import columnar_query, format_error, response_format
+from backend.projection import fields_error, join_list, plain_fields, requested_fields, select_list
 
 bp = Blueprint('compare', __name__, url_prefix='/api/compare')
 
+# 可投影的字段（fields 参数）：只有请求 CountyName / Province 时才连接 county 表
+COUNTY_JOINS = {'county': 'JOIN county c ON t.CountyCode = c.CountyCode'}
+COUNTY_NAME_FIELDS = {
+    'CountyCode': ('t.CountyCode', None),
+    'CountyName': ('c.CountyName', 'county'),
+    'Province': ('c.Province', 'county'),
+}
+ECONOMY_FIELDS = {
+    **COUNTY_NAME_FIELDS,
+    **plain_fields('Year', 'GDP', 'GDP_Primary', 'GDP_Secondary', 'GDP_Tertiary',
+                   'PerCapitaGDP', 'RuralDisposableIncome',
+                   'FiscalRevenue', 'FiscalExpenditure', table='t'),
+}
+AGRICULTURE_FIELDS = {
+    **COUNTY_NAME_FIELDS,
+    **plain_fields('Year', 'CropArea', 'GrainOutput', 'MeatOutput',
+                   'AgriOutputValue', 'RuralLaborForce', table='t'),
+}
+# 趋势对比中取自 county_agriculture 的指标，其余取自 county_economy
+TREND_AGRICULTURE_METRICS = ['AgriOutputValue', 'GrainOutput', 'MeatOutput']
+
+
+def trend_fields(metric):
+    """趋势对比可投影的字段"""
+    return {**COUNTY_NAME_FIELDS, **plain_fields('Year', metric, table='t')}
+
+
+def trend_sql(fields, metric, county_codes, start_year, end_year):
+    """趋势对比查询，返回 (sql, params)；init_indexes --check 用同一函数生成检查的SQL"""
+    table = 'county_agriculture' if metric in TREND_AGRICULTURE_METRICS else 'county_economy'
+    spec = trend_fields(metric)
+    placeholders = ','.join(['%s'] * len(county_codes))
+    sql = f"""
+        SELECT {select_list(fields, spec)}
+        FROM {table} t
+        {join_list(fields, spec, COUNTY_JOINS)}
+        WHERE t.CountyCode IN ({placeholders})
+          AND t.Year >= %s AND t.Year <= %s
+    """
+    # 按主键 (CountyCode, Year) 顺序读取，避免 filesort；结果至多10县×若干年，在应用层按 年份、县 排序
+    sql += " ORDER BY t.CountyCode, t.Year"
+    return sql, list(county_codes) + [start_year, end_year]
+
 
 @bp.route('/economy', methods=['GET'])
 @login_required
 def compare_economy():
     """对比多个县的经济数据"""
+    fmt = response_format()
+    if fmt is None:
+        return jsonify(format_error()), 400
+    fields = requested_fields(ECONOMY_FIELDS)
+    if fields is None:
+        return jsonify(fields_error(ECONOMY_FIELDS)), 400
     county_codes = request.args.getlist('county_code')
     year = request.args.get('year', type=int)
     
@@ -23,23 +74,22 @@ def compare_economy():
     
     placeholders = ','.join(['%s'] * len(county_codes))
     sql = f"""
-        SELECT c.CountyCode, c.CountyName, c.Province,
-               e.Year, e.GDP, e.GDP_Primary, e.GDP_Secondary, e.GDP_Tertiary,
-               e.PerCapitaGDP, e.RuralDisposableIncome,
-               e.FiscalRevenue, e.FiscalExpenditure
-        FROM county_economy e
-        JOIN county c ON e.CountyCode = c.CountyCode
-        WHERE e.CountyCode IN ({placeholders})
+        SELECT {select_list(fields, ECONOMY_FIELDS)}
+        FROM county_economy t
+        {join_list(fields, ECONOMY_FIELDS, COUNTY_JOINS)}
+        WHERE t.CountyCode IN ({placeholders})
     """
     params = list(county_codes)
     
     if year:
-        sql += " AND e.Year = %s"
+        sql += " AND t.Year = %s"
         params.append(year)
     
-    sql += " ORDER BY e.Year, e.GDP DESC"
+    sql += " ORDER BY t.Year, t.GDP DESC"
     
     try:
+        if fmt == 'columnar':
+            return jsonify({'success': True, **columnar_query(sql, params)})
         result = execute_query(sql, params)
         return jsonify({'success': True, 'data': result, 'count': len(result)})
     except Exception as e:
@@ -50,6 +100,12 @@ def compare_economy():
 @login_required
 def compare_agriculture():
     """对比多个县的农业数据"""
+    fmt = response_format()
+    if fmt is None:
+        return jsonify(format_error()), 400
+    fields = requested_fields(AGRICULTURE_FIELDS)
+    if fields is None:
+        return jsonify(fields_error(AGRICULTURE_FIELDS)), 400
     county_codes = request.args.getlist('county_code')
     year = request.args.get('year', type=int)
     
@@ -61,22 +117,22 @@ def compare_agriculture():
     
     placeholders = ','.join(['%s'] * len(county_codes))
     sql = f"""
-        SELECT c.CountyCode, c.CountyName, c.Province,
-               a.Year, a.CropArea, a.GrainOutput, a.MeatOutput,
-               a.AgriOutputValue, a.RuralLaborForce
-        FROM county_agriculture a
-        JOIN county c ON a.CountyCode = c.CountyCode
-        WHERE a.CountyCode IN ({placeholders})
+        SELECT {select_list(fields, AGRICULTURE_FIELDS)}
+        FROM county_agriculture t
+        {join_list(fields, AGRICULTURE_FIELDS, COUNTY_JOINS)}
+        WHERE t.CountyCode IN ({placeholders})
     """
     params = list(county_codes)
     
     if year:
-        sql += " AND a.Year = %s"
+        sql += " AND t.Year = %s"
         params.append(year)
     
-    sql += " ORDER BY a.Year, a.AgriOutputValue DESC"
+    sql += " ORDER BY t.Year, t.AgriOutputValue DESC"
     
     try:
+        if fmt == 'columnar':
+            return jsonify({'success': True, **columnar_query(sql, params)})
         result = execute_query(sql, params)
         return jsonify({'success': True, 'data': result, 'count': len(result)})
     except Exception as e:
@@ -87,6 +143,9 @@ def compare_agriculture():
 @login_required
 def compare_trend():
     """对比多个县的趋势数据"""
+    fmt = response_format()
+    if fmt is None:
+        return jsonify(format_error()), 400
     county_codes = request.args.getlist('county_code')
     start_year = request.args.get('start_year', type=int, default=2000)
     end_year = request.args.get('end_year', type=int, default=2020)
@@ -104,27 +163,19 @@ def compare_trend():
     if metric not in valid_metrics:
         return jsonify({'success': False, 'error': f'指标必须是: {", ".join(valid_metrics)}'}), 400
     
-    placeholders = ','.join(['%s'] * len(county_codes))
-    
-    if metric in ['AgriOutputValue', 'GrainOutput', 'MeatOutput']:
-        table = 'county_agriculture'
-    else:
-        table = 'county_economy'
-    
-    sql = f"""
-        SELECT c.CountyCode, c.CountyName, c.Province,
-               t.Year, t.{metric}
-        FROM {table} t
-        JOIN county c ON t.CountyCode = c.CountyCode
-        WHERE t.CountyCode IN ({placeholders})
-          AND t.Year >= %s AND t.Year <= %s
-    """
-    params = list(county_codes) + [start_year, end_year]
+    # 应用层排序需要 CountyCode、Year，两者总会返回
+    spec = trend_fields(metric)
+    fields = requested_fields(spec, required=('CountyCode', 'Year'))
+    if fields is None:
+        return jsonify(fields_error(spec)), 400
     
-    sql += " ORDER BY t.Year, c.CountyCode"
+    sql, params = trend_sql(fields, metric, county_codes, start_year, end_year)
     
     try:
+        if fmt == 'columnar':
+            return jsonify({'success': True, **columnar_query(sql, params, sort_by=('Year', 'CountyCode'))})
         result = execute_query(sql, params)
+        result = sorted(result, key=lambda row: (row['Year'], row['CountyCode']))
         return jsonify({'success': True, 'data': result, 'count': len(result)})
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
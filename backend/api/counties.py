@@ -4,30 +4,43 @@
 import pymysql
 from flask import Blueprint, jsonify, request
 from backend.db import execute_query, get_db_connection
+from backend.cache import cached
+from backend.columnar import columnar_query, format_error, response_format
+from backend.projection import fields_error, plain_fields, requested_fields, select_list
 
 bp = Blueprint('counties', __name__, url_prefix='/api/counties')
 
+# 各列表接口可投影的字段（fields 参数）
+COUNTY_FIELDS = {
+    **plain_fields('CountyCode', 'CountyName', 'Province', 'City',
+                   'Longitude', 'Latitude', 'ExitYear', 'Region',
+                   'GDP', 'PerCapitaGDP', 'RuralDisposableIncome',
+                   'InterviewCount', 'DataCompleteness'),
+}
+ECONOMY_FIELDS = plain_fields(
+    'Year', 'GDP', 'GDP_Primary', 'GDP_Secondary', 'GDP_Tertiary',
+    'PerCapitaGDP', 'UrbanAvgWage', 'RuralDisposableIncome',
+    'FiscalRevenue', 'FiscalExpenditure', 'SavingsDeposit', 'LoanBalance',
+    'IndustrialOutput', 'IndustrialEnterpriseCount',
+    'FixedAssetInvestment', 'RetailSales'
+)
+AGRICULTURE_FIELDS = plain_fields(
+    'Year', 'CropArea', 'MachineryPower', 'GrainOutput',
+    'CottonOutput', 'OilOutput', 'MeatOutput', 'AgriOutputValue',
+    'RuralLaborForce', 'AgriLaborForce'
+)
+POPULATION_FIELDS = plain_fields(
+    'Year', 'RegisteredPopulation',
+    'PrimarySchoolTeachers', 'MiddleSchoolTeachers',
+    'PrimarySchoolStudents', 'MiddleSchoolStudents'
+)
 
-@bp.route('', methods=['GET'])
-def get_counties():
-    """获取县列表，使用视图简化查询"""
-    region = request.args.get('region')
-    exit_year = request.args.get('exit_year')
-    province = request.args.get('province')
-    
-    # 使用视图 v_county_complete_info 简化查询
-    sql = """
-        SELECT CountyCode, CountyName, Province, City,
-               Longitude, Latitude, ExitYear, Region,
-               GDP, PerCapitaGDP, RuralDisposableIncome,
-               InterviewCount,
-               -- 数据完整性评分：基于视图中的指标
-               (
-                   CASE WHEN GDP IS NOT NULL THEN 1 ELSE 0 END +
-                   CASE WHEN AgriOutputValue IS NOT NULL THEN 1 ELSE 0 END +
-                   CASE WHEN InterviewCount > 0 THEN 1 ELSE 0 END
-               ) as DataCompleteness
-        FROM v_county_complete_info
+
+def county_list_sql(fields, region=None, exit_year=None, province=None):
+    """县列表查询，返回 (sql, params)；init_indexes --check 用同一函数生成检查的SQL"""
+    sql = f"""
+        SELECT {select_list(fields, COUNTY_FIELDS)}
+        FROM county_complete_info
         WHERE 1=1
     """
     params = []
@@ -42,11 +55,103 @@ def get_counties():
         sql += " AND Province = %s"
         params.append(province)
     
+    # 数据完整性评分由汇总表存储，按 idx_completeness_order 索引顺序读取
     sql += " ORDER BY DataCompleteness DESC, ExitYear, Province, CountyName"
+    return sql, params
+
+
+def yearly_series_sql(table, fields, spec, county_code, start_year=None, end_year=None):
+    """单县年度数据查询（经济/农业/人口），按主键 (CountyCode, Year) 顺序读取，返回 (sql, params)"""
+    sql = f"""
+        SELECT {select_list(fields, spec)}
+        FROM {table}
+        WHERE CountyCode = %s
+    """
+    params = [county_code]
+    
+    if start_year:
+        sql += " AND Year >= %s"
+        params.append(start_year)
+    if end_year:
+        sql += " AND Year <= %s"
+        params.append(end_year)
+    
+    sql += " ORDER BY Year"
+    return sql, params
+
+
+def county_map_sql(year=None):
+    """地图数据查询，返回 (sql, params)；year 为空时取各县GDP非空的最新年份"""
+    # 如果没有指定年份，按 county_latest_year 主键连接每个县GDP非空的最新年份
+    if year:
+        sql = """
+            SELECT 
+                c.CountyCode,
+                c.CountyName,
+                c.Province,
+                c.Longitude,
+                c.Latitude,
+                e.GDP,
+                p.ExitYear,
+                CASE WHEN p.ExitYear IS NOT NULL THEN 1 ELSE 0 END as IsExited
+            FROM county c
+            LEFT JOIN county_economy e ON c.CountyCode = e.CountyCode AND e.Year = %s
+            LEFT JOIN poverty_counties p ON c.CountyCode = p.CountyCode
+            WHERE c.Longitude IS NOT NULL 
+              AND c.Latitude IS NOT NULL
+              AND c.Longitude != 0 
+              AND c.Latitude != 0
+        """
+        params = [year]
+    else:
+        # 获取每个县最新年份的GDP
+        sql = """
+            SELECT 
+                c.CountyCode,
+                c.CountyName,
+                c.Province,
+                c.Longitude,
+                c.Latitude,
+                e.GDP,
+                p.ExitYear,
+                CASE WHEN p.ExitYear IS NOT NULL THEN 1 ELSE 0 END as IsExited
+            FROM county c
+            LEFT JOIN county_latest_year ly ON ly.CountyCode = c.CountyCode AND ly.SourceTable = 'county_economy'
+            LEFT JOIN county_economy e ON e.CountyCode = ly.CountyCode AND e.Year = ly.LatestYear
+            LEFT JOIN poverty_counties p ON c.CountyCode = p.CountyCode
+            WHERE c.Longitude IS NOT NULL 
+              AND c.Latitude IS NOT NULL
+              AND c.Longitude != 0 
+              AND c.Latitude != 0
+        """
+        params = []
+    
+    sql += " ORDER BY c.Province, c.CountyName"
+    return sql, params
+
+
+@bp.route('', methods=['GET'])
+@cached(tables=['county_complete_info'])
+def get_counties():
+    """获取县列表，读取汇总表 county_complete_info（v_county_complete_info 的物化结果）"""
+    fmt = response_format()
+    if fmt is None:
+        return jsonify(format_error()), 400
+    fields = requested_fields(COUNTY_FIELDS)
+    if fields is None:
+        return jsonify(fields_error(COUNTY_FIELDS)), 400
+    region = request.args.get('region')
+    exit_year = request.args.get('exit_year')
+    province = request.args.get('province')
+    
+    sql, params = county_list_sql(fields, region, exit_year, province)
     
     try:
+        if fmt == 'columnar':
+            return jsonify({'success': True, **columnar_query(sql, params),
+                            'note': 'Using summary table: county_complete_info'})
         result = execute_query(sql, params)
-        return jsonify({'success': True, 'data': result, 'count': len(result), 'note': 'Using view: v_county_complete_info'})
+        return jsonify({'success': True, 'data': result, 'count': len(result), 'note': 'Using summary table: county_complete_info'})
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
@@ -101,30 +206,20 @@ def get_county_report(county_code):
 @bp.route('/<county_code>/economy', methods=['GET'])
 def get_county_economy(county_code):
     """获取县经济数据"""
+    fmt = response_format()
+    if fmt is None:
+        return jsonify(format_error()), 400
+    fields = requested_fields(ECONOMY_FIELDS)
+    if fields is None:
+        return jsonify(fields_error(ECONOMY_FIELDS)), 400
     start_year = request.args.get('start_year', type=int)
     end_year = request.args.get('end_year', type=int)
     
-    sql = """
-        SELECT Year, GDP, GDP_Primary, GDP_Secondary, GDP_Tertiary,
-               PerCapitaGDP, UrbanAvgWage, RuralDisposableIncome,
-               FiscalRevenue, FiscalExpenditure, SavingsDeposit, LoanBalance,
-               IndustrialOutput, IndustrialEnterpriseCount,
-               FixedAssetInvestment, RetailSales
-        FROM county_economy
-        WHERE CountyCode = %s
-    """
-    params = [county_code]
-    
-    if start_year:
-        sql += " AND Year >= %s"
-        params.append(start_year)
-    if end_year:
-        sql += " AND Year <= %s"
-        params.append(end_year)
-    
-    sql += " ORDER BY Year"
+    sql, params = yearly_series_sql('county_economy', fields, ECONOMY_FIELDS, county_code, start_year, end_year)
     
     try:
+        if fmt == 'columnar':
+            return jsonify({'success': True, **columnar_query(sql, params)})
         result = execute_query(sql, params)
         return jsonify({'success': True, 'data': result, 'count': len(result)})
     except Exception as e:
@@ -134,28 +229,20 @@ def get_county_economy(county_code):
 @bp.route('/<county_code>/agriculture', methods=['GET'])
 def get_county_agriculture(county_code):
     """获取县农业数据"""
+    fmt = response_format()
+    if fmt is None:
+        return jsonify(format_error()), 400
+    fields = requested_fields(AGRICULTURE_FIELDS)
+    if fields is None:
+        return jsonify(fields_error(AGRICULTURE_FIELDS)), 400
     start_year = request.args.get('start_year', type=int)
     end_year = request.args.get('end_year', type=int)
     
-    sql = """
-        SELECT Year, CropArea, MachineryPower, GrainOutput,
-               CottonOutput, OilOutput, MeatOutput, AgriOutputValue,
-               RuralLaborForce, AgriLaborForce
-        FROM county_agriculture
-        WHERE CountyCode = %s
-    """
-    params = [county_code]
-    
-    if start_year:
-        sql += " AND Year >= %s"
-        params.append(start_year)
-    if end_year:
-        sql += " AND Year <= %s"
-        params.append(end_year)
-    
-    sql += " ORDER BY Year"
+    sql, params = yearly_series_sql('county_agriculture', fields, AGRICULTURE_FIELDS, county_code, start_year, end_year)
     
     try:
+        if fmt == 'columnar':
+            return jsonify({'success': True, **columnar_query(sql, params)})
         result = execute_query(sql, params)
         return jsonify({'success': True, 'data': result, 'count': len(result)})
     except Exception as e:
@@ -190,28 +277,20 @@ def get_county_crops(county_code):
 @bp.route('/<county_code>/population', methods=['GET'])
 def get_county_population(county_code):
     """获取县人口数据"""
+    fmt = response_format()
+    if fmt is None:
+        return jsonify(format_error()), 400
+    fields = requested_fields(POPULATION_FIELDS)
+    if fields is None:
+        return jsonify(fields_error(POPULATION_FIELDS)), 400
     start_year = request.args.get('start_year', type=int)
     end_year = request.args.get('end_year', type=int)
     
-    sql = """
-        SELECT Year, RegisteredPopulation,
-               PrimarySchoolTeachers, MiddleSchoolTeachers,
-               PrimarySchoolStudents, MiddleSchoolStudents
-        FROM county_population
-        WHERE CountyCode = %s
-    """
-    params = [county_code]
-    
-    if start_year:
-        sql += " AND Year >= %s"
-        params.append(start_year)
-    if end_year:
-        sql += " AND Year <= %s"
-        params.append(end_year)
-    
-    sql += " ORDER BY Year"
+    sql, params = yearly_series_sql('county_population', fields, POPULATION_FIELDS, county_code, start_year, end_year)
     
     try:
+        if fmt == 'columnar':
+            return jsonify({'success': True, **columnar_query(sql, params)})
         result = execute_query(sql, params)
         return jsonify({'success': True, 'data': result, 'count': len(result)})
     except Exception as e:
@@ -219,62 +298,12 @@ def get_county_population(county_code):
 
 
 @bp.route('/map', methods=['GET'])
+@cached(tables=['county', 'county_economy', 'county_latest_year', 'poverty_counties'])
 def get_counties_map():
     """获取地图可视化数据：经纬度、GDP、摘帽状态"""
     year = request.args.get('year', type=int)  # 可选：指定年份，默认使用最新年份
     
-    # 如果没有指定年份，使用子查询获取每个县的最新GDP年份
-    if year:
-        sql = """
-            SELECT 
-                c.CountyCode,
-                c.CountyName,
-                c.Province,
-                c.Longitude,
-                c.Latitude,
-                e.GDP,
-                p.ExitYear,
-                CASE WHEN p.ExitYear IS NOT NULL THEN 1 ELSE 0 END as IsExited
-            FROM county c
-            LEFT JOIN county_economy e ON c.CountyCode = e.CountyCode AND e.Year = %s
-            LEFT JOIN poverty_counties p ON c.CountyCode = p.CountyCode
-            WHERE c.Longitude IS NOT NULL 
-              AND c.Latitude IS NOT NULL
-              AND c.Longitude != 0 
-              AND c.Latitude != 0
-        """
-        params = [year]
-    else:
-        # 获取每个县最新年份的GDP
-        sql = """
-            SELECT 
-                c.CountyCode,
-                c.CountyName,
-                c.Province,
-                c.Longitude,
-                c.Latitude,
-                latest_economy.GDP,
-                p.ExitYear,
-                CASE WHEN p.ExitYear IS NOT NULL THEN 1 ELSE 0 END as IsExited
-            FROM county c
-            LEFT JOIN (
-                SELECT e1.CountyCode, e1.GDP, e1.Year
-                FROM county_economy e1
-                INNER JOIN (
-                    SELECT CountyCode, MAX(Year) as MaxYear
-                    FROM county_economy
-                    GROUP BY CountyCode
-                ) e2 ON e1.CountyCode = e2.CountyCode AND e1.Year = e2.MaxYear
-            ) latest_economy ON c.CountyCode = latest_economy.CountyCode
-            LEFT JOIN poverty_counties p ON c.CountyCode = p.CountyCode
-            WHERE c.Longitude IS NOT NULL 
-              AND c.Latitude IS NOT NULL
-              AND c.Longitude != 0 
-              AND c.Latitude != 0
-        """
-        params = []
-    
-    sql += " ORDER BY c.Province, c.CountyName"
+    sql, params = county_map_sql(year)
     
     try:
         result = execute_query(sql, params)
@@ -5,11 +5,53 @@
 import csv
 import io
 from flask import Blueprint, jsonify, request, Response
-from backend.db import execute_query
+from backend.db import iter_query
+from backend.compression import negotiate_encoding, stream_compress
 from backend.api.auth import login_required, admin_required
 
 bp = Blueprint('export', __name__, url_prefix='/api/export')
 
+# 流式导出时每累积这么多字节的CSV文本向客户端发送一次
+CSV_FLUSH_SIZE = 64 * 1024
+
+
+def stream_csv(rows, filename, exclude=()):
+    """
+    将行迭代器以CSV流式返回，不在内存中缓存整个结果集。
+    先取第一行确定表头（并让SQL错误在响应开始前抛出），无数据时返回404。
+    客户端接受 gzip/brotli 时逐块压缩输出。
+    """
+    first = next(rows, None)
+    if first is None:
+        return jsonify({'success': False, 'error': '没有数据可导出'}), 404
+
+    fieldnames = [k for k in first.keys() if k not in exclude]
+
+    def generate():
+        output = io.StringIO()
+        writer = csv.DictWriter(output, fieldnames=fieldnames, extrasaction='ignore')
+        try:
+            writer.writeheader()
+            writer.writerow(first)
+            for row in rows:
+                writer.writerow(row)
+                if output.tell() >= CSV_FLUSH_SIZE:
+                    yield output.getvalue()
+                    output.seek(0)
+                    output.truncate()
+            yield output.getvalue()
+        finally:
+            rows.close()
+
+    headers = {'Content-Disposition': f'attachment; filename={filename}', 'Vary': 'Accept-Encoding'}
+    encoding = negotiate_encoding()
+    body = generate()
+    if encoding is not None:
+        body = stream_compress(body, encoding)
+        headers['Content-Encoding'] = encoding
+
+    return Response(body, mimetype='text/csv', headers=headers)
+
 
 @bp.route('/counties', methods=['GET'])
 @login_required
@@ -24,7 +66,7 @@ def export_counties():
             SELECT CountyCode, CountyName, Province, City,
                    Longitude, Latitude, ExitYear, Region,
                    GDP, PerCapitaGDP, RuralDisposableIncome
-            FROM v_county_complete_info
+            FROM county_complete_info
             WHERE 1=1
         """
         params = []
@@ -36,26 +78,8 @@ def export_counties():
             sql += " AND ExitYear = %s"
             params.append(int(exit_year))
         
-        result = execute_query(sql, params)
-        
-        if not result:
-            return jsonify({'success': False, 'error': '没有数据可导出'}), 404
-        
-        # 创建CSV
-        output = io.StringIO()
-        if result:
-            fieldnames = list(result[0].keys())
-            writer = csv.DictWriter(output, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(result)
-        
-        # 返回CSV文件
-        output.seek(0)
-        return Response(
-            output.getvalue(),
-            mimetype='text/csv',
-            headers={'Content-Disposition': 'attachment; filename=counties.csv'}
-        )
+        # 流式读取并输出CSV
+        return stream_csv(iter_query(sql, params), 'counties.csv')
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
@@ -89,29 +113,8 @@ def export_interviews():
         
         sql += " ORDER BY i.InterviewDate DESC"
         
-        result = execute_query(sql, params)
-        
-        if not result:
-            return jsonify({'success': False, 'error': '没有数据可导出'}), 404
-        
-        # 创建CSV（不包含Content字段，太长）
-        output = io.StringIO()
-        if result:
-            # 移除Content字段
-            fieldnames = [k for k in result[0].keys() if k != 'Content']
-            writer = csv.DictWriter(output, fieldnames=fieldnames)
-            writer.writeheader()
-            for row in result:
-                row_clean = {k: v for k, v in row.items() if k in fieldnames}
-                writer.writerow(row_clean)
-        
-        # 返回CSV文件
-        output.seek(0)
-        return Response(
-            output.getvalue(),
-            mimetype='text/csv',
-            headers={'Content-Disposition': 'attachment; filename=interviews.csv'}
-        )
+        # 流式输出CSV（不包含Content字段，太长）
+        return stream_csv(iter_query(sql, params), 'interviews.csv', exclude=('Content',))
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
@@ -130,26 +133,8 @@ def export_surveyors():
             ORDER BY v.ActualInterviewCount DESC
         """
         
-        result = execute_query(sql)
-        
-        if not result:
-            return jsonify({'success': False, 'error': '没有数据可导出'}), 404
-        
-        # 创建CSV
-        output = io.StringIO()
-        if result:
-            fieldnames = list(result[0].keys())
-            writer = csv.DictWriter(output, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(result)
-        
-        # 返回CSV文件
-        output.seek(0)
-        return Response(
-            output.getvalue(),
-            mimetype='text/csv',
-            headers={'Content-Disposition': 'attachment; filename=surveyors.csv'}
-        )
+        # 流式读取并输出CSV
+        return stream_csv(iter_query(sql), 'surveyors.csv')
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
@@ -2,7 +2,11 @@
 访谈记录API
 """
 from flask import Blueprint, jsonify, request, session
-from backend.db import execute_query
+from backend.db import execute_query, get_db_connection, use_consistent_snapshot
+from backend.summaries import refresh_county_complete_info
+from backend.region_cube import refresh_region_cube_interviews
+from backend.cache import bump_data_versions, cached, invalidate_tables
+from backend.projection import fields_error, join_list, requested_fields, select_list
 from backend.api.auth import login_required, admin_required
 import jieba
 import re
@@ -16,6 +20,72 @@ import uuid
 # 中文停用词列表（简化版）
 STOP_WORDS = {'的', '了', '在', '是', '我', '有', '和', '就', '不', '人', '都', '一', '一个', '上', '也', '很', '到', '说', '要', '去', '你', '会', '着', '没有', '看', '好', '自己', '这'}
 
+# 新增访谈会改动的表（含触发器维护的统计表和同步刷新的汇总表），用于接口缓存失效
+INTERVIEW_WRITE_TABLES = [
+    'interviews', 'surveyors', 'surveyor_interview_stats', 'county_interview_stats', 'surveyor_county_interviews',
+    'county_complete_info', 'region_statistics_cube',
+]
+
+# 访谈列表可投影的字段（fields 参数），SurveyorName / CountyName 需要连接 surveyors / county
+INTERVIEW_FIELDS = {
+    'InterviewID': ('i.InterviewID', None),
+    'InterviewDate': ('i.InterviewDate', None),
+    'IntervieweeName': ('i.IntervieweeName', None),
+    'IntervieweeInfo': ('i.IntervieweeInfo', None),
+    'Content': ('i.Content', None),
+    'InterviewLocation': ('i.InterviewLocation', None),
+    'Quality': ('i.Quality', None),
+    'CountyCode': ('i.CountyCode', None),
+    'CountyName': ('c.CountyName', 'county'),
+    'SurveyorName': ('s.Name', 'surveyors'),
+    'SurveyorID': ('i.SurveyorID', None),
+}
+INTERVIEW_JOINS = {
+    'county': 'JOIN county c ON i.CountyCode = c.CountyCode',
+    'surveyors': 'LEFT JOIN surveyors s ON i.SurveyorID = s.SurveyorID',
+}
+
+
+def _interview_filters(county_code=None, surveyor_id=None, keyword=None):
+    """访谈列表与总数共用的过滤条件，返回 (SQL片段, 参数)"""
+    sql = ""
+    params = []
+    if county_code:
+        sql += " AND i.CountyCode = %s"
+        params.append(county_code)
+    if surveyor_id:
+        sql += " AND i.SurveyorID = %s"
+        params.append(surveyor_id)
+    if keyword:
+        sql += " AND (i.Content LIKE %s OR i.IntervieweeName LIKE %s)"
+        keyword_pattern = f'%{keyword}%'
+        params.extend([keyword_pattern, keyword_pattern])
+    return sql, params
+
+
+def interview_list_sql(fields, county_code=None, surveyor_id=None, keyword=None, limit=50, offset=0):
+    """访谈列表查询，返回 (sql, params)；init_indexes --check 用同一函数生成检查的SQL"""
+    conditions, params = _interview_filters(county_code, surveyor_id, keyword)
+    sql = f"""
+        SELECT {select_list(fields, INTERVIEW_FIELDS)}
+        FROM interviews i
+        {join_list(fields, INTERVIEW_FIELDS, INTERVIEW_JOINS)}
+        WHERE 1=1{conditions}
+        ORDER BY i.InterviewDate DESC LIMIT %s OFFSET %s
+    """
+    return sql, params + [limit, offset]
+
+
+def interview_count_sql(county_code=None, surveyor_id=None, keyword=None):
+    """访谈总数查询，返回 (sql, params)"""
+    conditions, params = _interview_filters(county_code, surveyor_id, keyword)
+    sql = f"""
+        SELECT COUNT(*) as total
+        FROM interviews i
+        WHERE 1=1{conditions}
+    """
+    return sql, params
+
 # ... existing imports ...
 
 @bp.route('', methods=['POST'])
@@ -59,8 +129,13 @@ def create_interview():
             data.get('location'),
             data.get('quality', 5.0)
         ))
+        # 同一事务中刷新该县的汇总行，以及立方体中包含该县的切片的访谈列
+        refresh_county_complete_info(conn, [data['county_code']])
+        refresh_region_cube_interviews(conn, [data['county_code']])
+        bump_data_versions(conn, INTERVIEW_WRITE_TABLES)
         
         conn.commit()
+        invalidate_tables(INTERVIEW_WRITE_TABLES)
         
         return jsonify({'success': True, 'interview_id': interview_id})
     except Exception as e:
@@ -72,65 +147,31 @@ def create_interview():
 
 @bp.route('', methods=['GET'])
 def get_interviews():
-    """获取访谈列表"""
+    """获取访谈列表（fields 指定返回字段，未请求的列和连接不会查询）"""
+    fields = requested_fields(INTERVIEW_FIELDS)
+    if fields is None:
+        return jsonify(fields_error(INTERVIEW_FIELDS)), 400
     county_code = request.args.get('county_code')
     surveyor_id = request.args.get('surveyor_id')
     keyword = request.args.get('keyword')
     limit = request.args.get('limit', type=int, default=50)
     offset = request.args.get('offset', type=int, default=0)
     
-    sql = """
-        SELECT i.InterviewID, i.InterviewDate, i.IntervieweeName,
-               i.IntervieweeInfo, i.Content, i.InterviewLocation, i.Quality,
-               i.CountyCode, c.CountyName, s.Name as SurveyorName, s.SurveyorID
-        FROM interviews i
-        JOIN county c ON i.CountyCode = c.CountyCode
-        LEFT JOIN surveyors s ON i.SurveyorID = s.SurveyorID
-        WHERE 1=1
-    """
-    params = []
-    
-    if county_code:
-        sql += " AND i.CountyCode = %s"
-        params.append(county_code)
-    if surveyor_id:
-        sql += " AND i.SurveyorID = %s"
-        params.append(surveyor_id)
-    if keyword:
-        sql += " AND (i.Content LIKE %s OR i.IntervieweeName LIKE %s)"
-        keyword_pattern = f'%{keyword}%'
-        params.extend([keyword_pattern, keyword_pattern])
-    
-    sql += " ORDER BY i.InterviewDate DESC LIMIT %s OFFSET %s"
-    params.extend([limit, offset])
+    sql, params = interview_list_sql(fields, county_code, surveyor_id, keyword, limit, offset)
     
     try:
+        # 列表与总数在同一快照中查询，保证分页数字一致
+        use_consistent_snapshot()
         result = execute_query(sql, params)
         
         # 如果未登录，隐藏访谈内容详情
-        if 'user_id' not in session:
+        if 'user_id' not in session and 'Content' in fields:
             for row in result:
                 row['Content'] = "请登录分析师账号查看详细访谈内容"
                 # 也可以截取前几个字: row['Content'] = (row['Content'] or '')[:50] + '...'
         
         # 获取总数
-        count_sql = """
-            SELECT COUNT(*) as total
-            FROM interviews i
-            WHERE 1=1
-        """
-        count_params = []
-        if county_code:
-            count_sql += " AND i.CountyCode = %s"
-            count_params.append(county_code)
-        if surveyor_id:
-            count_sql += " AND i.SurveyorID = %s"
-            count_params.append(surveyor_id)
-        if keyword:
-            count_sql += " AND (i.Content LIKE %s OR i.IntervieweeName LIKE %s)"
-            keyword_pattern = f'%{keyword}%'
-            count_params.extend([keyword_pattern, keyword_pattern])
-        
+        count_sql, count_params = interview_count_sql(county_code, surveyor_id, keyword)
         total_result = execute_query(count_sql, count_params)
         total = total_result[0]['total'] if total_result else 0
         
@@ -170,6 +211,7 @@ def get_interview_detail(interview_id):
 
 
 @bp.route('/stats', methods=['GET'])
+@cached(tables=['interviews'])
 def get_interview_stats():
     """获取访谈统计"""
     county_code = request.args.get('county_code')
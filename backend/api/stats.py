@@ -1,26 +1,123 @@
 """
 统计数据API
 """
-import pymysql
 from flask import Blueprint, jsonify, request
-from backend.db import execute_query, get_db_connection
+from backend.db import execute_query, get_pool_stats, use_consistent_snapshot
+from backend.api.auth import admin_required
+from backend.cache import cached, response_cache
+from backend.region_cube import REGION_CUBE_COLUMNS, normalize_group_by
 
 bp = Blueprint('stats', __name__, url_prefix='/api/stats')
 
+# 立方体维度参数 -> region_statistics_cube 中的列
+CUBE_DIMENSION_PARAMS = {'region': 'Region', 'province': 'Province', 'exit_year': 'ExitYear'}
+
+# 增长排名参数 -> county_growth_metrics 中的指标名 / 增长列
+GROWTH_METRIC_PARAMS = {'gdp': 'GDP', 'income': 'Income', 'fiscal': 'Fiscal'}
+GROWTH_RANK_PARAMS = {
+    'post_growth': 'PostExitGrowth',
+    'post_cagr': 'PostExitCAGR',
+    'pre_growth': 'PreExitGrowth',
+    'pre_cagr': 'PreExitCAGR',
+}
+
+# 概览：全国合计、按地区、按摘帽年份三个切片一次读出（按 idx_slice 顺序）
+OVERVIEW_SLICES_SQL = """
+    SELECT GroupBy, Region, ExitYear, CountyCount, ExitedCount
+    FROM region_statistics_cube
+    WHERE GroupBy IN ('', 'Region', 'ExitYear')
+    ORDER BY GroupBy, Region, Province, ExitYear
+"""
+
+# 访谈次数超过平均值的调研员：从 surveyor_interview_stats 出发，按 idx_interview_count 倒序读取
+ABOVE_AVERAGE_SURVEYORS_SQL = """
+    SELECT 
+        st.SurveyorID,
+        s.Name,
+        s.TeamID,
+        st.InterviewCount,
+        st.QualitySum / NULLIF(st.QualityCount, 0) as AvgQuality
+    FROM surveyor_interview_stats st
+    LEFT JOIN surveyors s ON s.SurveyorID = st.SurveyorID
+    WHERE st.InterviewCount > (
+        SELECT AVG(InterviewCount)
+        FROM surveyor_interview_stats
+        WHERE InterviewCount > 0
+    )
+    ORDER BY st.InterviewCount DESC
+"""
+
+
+def region_cube_sql(group_by, filters=None):
+    """立方体切片查询，filters 为 {列: 值}；返回 (sql, params)。init_indexes --check 用同一函数生成检查的SQL"""
+    sql = f"""
+        SELECT {', '.join(REGION_CUBE_COLUMNS)}
+        FROM region_statistics_cube
+        WHERE GroupBy = %s
+    """
+    params = [group_by]
+    for column, value in (filters or {}).items():
+        sql += f" AND {column} = %s"
+        params.append(value)
+    sql += " ORDER BY Region, Province, ExitYear"
+    return sql, params
+
+
+def top_growth_sql(metric, measure, region=None, province=None, n=10):
+    """增长排名查询（metric、measure 为 county_growth_metrics 的指标名和增长列），返回 (sql, params)"""
+    # metric=gdp 时保留原接口的字段名，已有调用方不受影响
+    gdp_aliases = ''
+    if metric == 'GDP':
+        gdp_aliases = f""",
+            g.LatestValue as LatestGDP,
+            g.AnchorValue as EarliestGDP,
+            g.{measure} as GDPGrowthRate"""
+
+    sql = f"""
+        SELECT 
+            g.CountyCode,
+            c.CountyName,
+            g.Province,
+            g.Region,
+            g.ExitYear,
+            g.Metric,
+            g.StartYear, g.StartValue,
+            g.AnchorYear, g.AnchorValue,
+            g.LatestYear, g.LatestValue,
+            g.PostExitGrowth, g.PostExitCAGR,
+            g.PreExitGrowth, g.PreExitCAGR,
+            g.{measure} as GrowthRate{gdp_aliases}
+        FROM county_growth_metrics g
+        LEFT JOIN county c ON g.CountyCode = c.CountyCode
+        WHERE g.Metric = %s AND g.{measure} IS NOT NULL
+    """
+    params = [metric]
+    if region:
+        sql += " AND g.Region = %s"
+        params.append(region)
+    if province:
+        sql += " AND g.Province = %s"
+        params.append(province)
+    sql += f" ORDER BY g.{measure} DESC LIMIT %s"
+    params.append(n)
+    return sql, params
+
 
 @bp.route('/overview', methods=['GET'])
+@cached(tables=['region_statistics_cube', 'interviews', 'surveyors'])
 def get_overview():
-    """获取系统概览统计"""
+    """获取系统概览统计（贫困县相关计数读取地区统计立方体）"""
     try:
         stats = {}
+        # 各项统计共享同一连接与快照
+        use_consistent_snapshot()
         
-        # 贫困县总数
-        result = execute_query("SELECT COUNT(*) as total FROM poverty_counties")
-        stats['poverty_counties'] = result[0]['total'] if result else 0
-        
-        # 已摘帽县数
-        result = execute_query("SELECT COUNT(*) as total FROM poverty_counties WHERE ExitYear IS NOT NULL")
-        stats['exited_counties'] = result[0]['total'] if result else 0
+        # 全国合计、按地区、按摘帽年份三个切片一次读出
+        slices = execute_query(OVERVIEW_SLICES_SQL)
+        total = next((row for row in slices if row['GroupBy'] == ''), None)
+        # 贫困县总数 / 已摘帽县数
+        stats['poverty_counties'] = total['CountyCount'] if total else 0
+        stats['exited_counties'] = total['ExitedCount'] if total else 0
         
         # 访谈记录总数
         result = execute_query("SELECT COUNT(*) as total FROM interviews")
@@ -31,22 +128,16 @@ def get_overview():
         stats['surveyors'] = result[0]['total'] if result else 0
         
         # 按地区分布
-        result = execute_query("""
-            SELECT Region, COUNT(*) as count
-            FROM poverty_counties
-            GROUP BY Region
-        """)
-        stats['by_region'] = result if result else []
+        stats['by_region'] = [
+            {'Region': row['Region'], 'count': row['CountyCount']}
+            for row in slices if row['GroupBy'] == 'Region'
+        ]
         
         # 按摘帽年份分布
-        result = execute_query("""
-            SELECT ExitYear, COUNT(*) as count
-            FROM poverty_counties
-            WHERE ExitYear IS NOT NULL
-            GROUP BY ExitYear
-            ORDER BY ExitYear
-        """)
-        stats['by_exit_year'] = result if result else []
+        stats['by_exit_year'] = [
+            {'ExitYear': row['ExitYear'], 'count': row['CountyCount']}
+            for row in slices if row['GroupBy'] == 'ExitYear' and row['ExitYear'] is not None
+        ]
         
         return jsonify({'success': True, 'data': stats})
     except Exception as e:
@@ -55,65 +146,83 @@ def get_overview():
 
 @bp.route('/region', methods=['GET'])
 def get_region_statistics():
-    """按地区统计分析（使用存储过程）"""
+    """按地区统计分析（读取地区统计立方体的 Region 切片，字段与 sp_statistics_by_region 一致）"""
     region = request.args.get('region')
     if not region:
         return jsonify({'success': False, 'error': '缺少region参数'}), 400
     
-    conn = get_db_connection()
-    cursor = conn.cursor(pymysql.cursors.DictCursor)
+    sql = """
+        SELECT 
+            Region,
+            CountyCount as TotalCounties,
+            ExitedCount as ExitedCounties,
+            CountyCount - ExitedCount as ActivePovertyCounties,
+            GDPMean as AvgGDP,
+            PerCapitaGDPMean as AvgPerCapitaGDP,
+            RuralIncomeMean as AvgRuralIncome,
+            AgriOutputMean as AvgAgriOutput,
+            GDPMedian as MedianGDP,
+            PerCapitaGDPMedian as MedianPerCapitaGDP,
+            RuralIncomeMedian as MedianRuralIncome,
+            AgriOutputMedian as MedianAgriOutput,
+            InterviewCount as TotalInterviews,
+            AvgInterviewQuality,
+            ActiveSurveyors,
+            CoveredCounties
+        FROM region_statistics_cube
+        WHERE GroupBy = 'Region' AND Region = %s
+    """
     
     try:
-        # 调用存储过程
-        cursor.callproc('sp_statistics_by_region', (region,))
-        result = cursor.fetchall()
-        
+        result = execute_query(sql, (region,))
         if result:
             return jsonify({
                 'success': True,
-                'data': result[0] if len(result) == 1 else result,
-                'note': 'Using stored procedure: sp_statistics_by_region'
+                'data': result[0],
+                'note': 'Using precomputed table: region_statistics_cube'
             })
         else:
             return jsonify({'success': False, 'error': '该地区无数据'}), 404
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
-    finally:
-        cursor.close()
-        conn.close()
+
+
+@bp.route('/cube', methods=['GET'])
+def get_region_cube():
+    """
+    地区统计立方体：group_by 为 region/province/exit_year 的任意组合（逗号分隔，空为全国合计，默认 region），
+    可再用 region、province、exit_year 过滤切片；一次返回所有分组
+    """
+    requested = [dim.strip().lower() for dim in request.args.get('group_by', 'region').split(',') if dim.strip()]
+    unknown = [dim for dim in requested if dim not in CUBE_DIMENSION_PARAMS]
+    if unknown:
+        return jsonify({'success': False, 'error': f'group_by 可选值: {", ".join(CUBE_DIMENSION_PARAMS)}'}), 400
+    group_by = normalize_group_by([CUBE_DIMENSION_PARAMS[dim] for dim in requested])
+    filters = {column: request.args.get(param)
+               for param, column in CUBE_DIMENSION_PARAMS.items() if request.args.get(param)}
+    
+    sql, params = region_cube_sql(group_by, filters)
+    
+    try:
+        result = execute_query(sql, params)
+        return jsonify({'success': True, 'data': result, 'count': len(result), 'group_by': group_by})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
 
 
 @bp.route('/complex/above-average', methods=['GET'])
 def get_above_average_surveyors():
-    """使用HAVING子句：找出访谈次数超过平均值的调研员"""
-    sql = """
-        SELECT 
-            s.SurveyorID,
-            s.Name,
-            s.TeamID,
-            COUNT(i.InterviewID) as InterviewCount,
-            AVG(i.Quality) as AvgQuality
-        FROM surveyors s
-        LEFT JOIN interviews i ON s.SurveyorID = i.SurveyorID
-        GROUP BY s.SurveyorID, s.Name, s.TeamID
-        HAVING InterviewCount > (
-            SELECT AVG(cnt) 
-            FROM (
-                SELECT COUNT(*) as cnt
-                FROM interviews
-                GROUP BY SurveyorID
-            ) sub
-        )
-        ORDER BY InterviewCount DESC
     """
-    
+    聚合子查询：找出访谈次数超过平均值的调研员（访谈数取自触发器维护的 surveyor_interview_stats）。
+    没有访谈的调研员不可能超过平均值，查询从统计表出发，按 idx_interview_count 索引倒序读取
+    """
     try:
-        result = execute_query(sql)
+        result = execute_query(ABOVE_AVERAGE_SURVEYORS_SQL)
         return jsonify({
             'success': True,
             'data': result,
             'count': len(result) if result else 0,
-            'note': 'Using HAVING clause to filter by aggregate function'
+            'note': 'Filtering by an aggregate subquery on surveyor_interview_stats'
         })
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -121,57 +230,46 @@ def get_above_average_surveyors():
 
 @bp.route('/complex/top-gdp-growth', methods=['GET'])
 def get_top_gdp_growth():
-    """使用窗口函数和子查询：找出摘帽后GDP增长最快的10个县"""
-    sql = """
-        SELECT 
-            pc.CountyCode,
-            c.CountyName,
-            pc.Province,
-            pc.ExitYear,
-            latest.GDP as LatestGDP,
-            earliest.GDP as EarliestGDP,
-            CASE 
-                WHEN earliest.GDP > 0 
-                THEN ((latest.GDP - earliest.GDP) / earliest.GDP * 100)
-                ELSE 0
-            END as GDPGrowthRate
-        FROM poverty_counties pc
-        LEFT JOIN county c ON pc.CountyCode = c.CountyCode
-        LEFT JOIN (
-            SELECT CountyCode, GDP
-            FROM county_economy ce1
-            WHERE ce1.Year = (
-                SELECT MAX(Year) 
-                FROM county_economy 
-                WHERE CountyCode = ce1.CountyCode
-            )
-        ) latest ON pc.CountyCode = latest.CountyCode
-        LEFT JOIN (
-            SELECT CountyCode, GDP
-            FROM county_economy ce2
-            WHERE ce2.Year = (
-                SELECT MIN(Year) 
-                FROM county_economy 
-                WHERE CountyCode = ce2.CountyCode
-                    AND Year >= (SELECT ExitYear FROM poverty_counties WHERE CountyCode = ce2.CountyCode)
-            )
-        ) earliest ON pc.CountyCode = earliest.CountyCode
-        WHERE pc.ExitYear IS NOT NULL
-            AND latest.GDP IS NOT NULL
-            AND earliest.GDP IS NOT NULL
-            AND earliest.GDP > 0
-        ORDER BY GDPGrowthRate DESC
-        LIMIT 10
     """
+    摘帽后增长最快的县：读取预计算的 county_growth_metrics，按 (Metric, 增长列) 索引顺序取前N行。
+    参数：metric（gdp/income/fiscal）、rank_by（post_growth/post_cagr/pre_growth/pre_cagr）、region、province、n
+    """
+    metric = GROWTH_METRIC_PARAMS.get(request.args.get('metric', 'gdp').lower())
+    measure = GROWTH_RANK_PARAMS.get(request.args.get('rank_by', 'post_growth').lower())
+    region = request.args.get('region')
+    province = request.args.get('province')
+    n = request.args.get('n', 10, type=int)
+    if metric is None:
+        return jsonify({'success': False, 'error': f'metric 可选值: {", ".join(GROWTH_METRIC_PARAMS)}'}), 400
+    if measure is None:
+        return jsonify({'success': False, 'error': f'rank_by 可选值: {", ".join(GROWTH_RANK_PARAMS)}'}), 400
+    n = max(1, min(n, 100))
+    
+    sql, params = top_growth_sql(metric, measure, region, province, n)
     
     try:
-        result = execute_query(sql)
+        result = execute_query(sql, params)
         return jsonify({
             'success': True,
             'data': result,
             'count': len(result) if result else 0,
-            'note': 'Using subqueries to calculate GDP growth rate'
+            'metric': metric,
+            'rank_by': measure,
+            'note': 'Using precomputed table: county_growth_metrics'
         })
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
+
+@bp.route('/pool', methods=['GET'])
+@admin_required
+def get_connection_pool_stats():
+    """获取当前worker进程的数据库连接池统计（仅管理员）"""
+    return jsonify({'success': True, 'data': get_pool_stats()})
+
+
+@bp.route('/cache', methods=['GET'])
+@admin_required
+def get_cache_stats():
+    """获取当前worker进程的接口响应缓存统计（仅管理员），用于调整缓存容量"""
+    return jsonify({'success': True, 'data': response_cache.stats()})
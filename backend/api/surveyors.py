@@ -1,30 +1,54 @@
 import pymysql
 from flask import Blueprint, jsonify, request, session
-from backend.db import execute_query, get_db_connection
+from backend.db import execute_query, get_db_connection, use_consistent_snapshot
+from backend.cache import cached
+from backend.projection import fields_error, join_list, requested_fields, select_list
 
 bp = Blueprint('surveyors', __name__, url_prefix='/api/surveyors')
 
+# 调研员列表可投影的字段（fields 参数）：Expertise / Notes 需要连接 surveyors 表，
+# Phone / Email 不在主查询中，有权限且被请求时单独查询后合并
+SURVEYOR_FIELDS = {
+    'SurveyorID': ('v.SurveyorID', None),
+    'Name': ('v.Name', None),
+    'Department': ('v.Department', None),
+    'Education': ('v.Education', None),
+    'Major': ('v.Major', None),
+    'TeamID': ('v.TeamID', None),
+    'Role': ('v.Role', None),
+    'Batch': ('v.Batch', None),
+    'CountyCode': ('v.AssignedCountyCode', None),
+    'CountyName': ('v.AssignedCountyName', None),
+    'Province': ('v.AssignedProvince', None),
+    'CompletedInterviews': ('v.CompletedInterviews', None),
+    'PendingInterviews': ('v.PendingInterviews', None),
+    'ActualInterviewCount': ('v.ActualInterviewCount', None),
+    'AvgInterviewQuality': ('v.AvgInterviewQuality', None),
+    'LatestInterviewDate': ('v.LatestInterviewDate', None),
+    'CoveredCounties': ('v.CoveredCounties', None),
+    'Expertise': ('s.Expertise', 'surveyors'),
+    'Notes': ('s.Notes', 'surveyors'),
+    'Phone': (None, None),
+    'Email': (None, None),
+}
+SURVEYOR_JOINS = {'surveyors': 'LEFT JOIN surveyors s ON v.SurveyorID = s.SurveyorID'}
+
 @bp.route('', methods=['GET'])
 def get_surveyors():
-    """获取调研员列表 - 使用视图简化查询"""
+    """获取调研员列表 - 使用视图简化查询（fields 指定返回字段，SurveyorID 总会返回）"""
+    fields = requested_fields(SURVEYOR_FIELDS, required=('SurveyorID',))
+    if fields is None:
+        return jsonify(fields_error(SURVEYOR_FIELDS)), 400
     keyword = request.args.get('keyword')
     county_code = request.args.get('county_code')
     limit = request.args.get('limit', type=int, default=50)
     offset = request.args.get('offset', type=int, default=0)
 
     # 使用视图 v_surveyor_work_statistics 简化查询，但需要额外JOIN获取Expertise等字段
-    sql = """
-        SELECT v.SurveyorID, v.Name, v.Department, v.Education, v.Major,
-               v.TeamID, v.Role, v.Batch,
-               v.AssignedCountyCode AS CountyCode,
-               v.AssignedCountyName AS CountyName,
-               v.AssignedProvince AS Province,
-               v.CompletedInterviews, v.PendingInterviews,
-               v.ActualInterviewCount, v.AvgInterviewQuality,
-               v.LatestInterviewDate, v.CoveredCounties,
-               s.Expertise, s.Notes
+    sql = f"""
+        SELECT {select_list(fields, SURVEYOR_FIELDS)}
         FROM v_surveyor_work_statistics v
-        LEFT JOIN surveyors s ON v.SurveyorID = s.SurveyorID
+        {join_list(fields, SURVEYOR_FIELDS, SURVEYOR_JOINS)}
         WHERE 1=1
     """
     params = []
@@ -41,6 +65,8 @@ def get_surveyors():
     params.extend([limit, offset])
 
     try:
+        # 列表、联系方式与总数在同一快照中查询
+        use_consistent_snapshot()
         result = execute_query(sql, params)
         
         # 视图不包含Phone和Email，需要额外JOIN surveyors表获取敏感字段
@@ -48,12 +74,13 @@ def get_surveyors():
         is_privileged = user_role in ['admin', 'analyst', 'surveyor']
         
         # 如果需要联系方式，额外查询并合并
-        if result and is_privileged:
+        contact_fields = [name for name in ('Phone', 'Email') if name in fields]
+        if result and is_privileged and contact_fields:
             surveyor_ids = [row['SurveyorID'] for row in result]
             if surveyor_ids:
                 placeholders = ','.join(['%s'] * len(surveyor_ids))
                 contact_sql = f"""
-                    SELECT SurveyorID, Phone, Email
+                    SELECT SurveyorID, {', '.join(contact_fields)}
                     FROM surveyors
                     WHERE SurveyorID IN ({placeholders})
                 """
@@ -64,8 +91,8 @@ def get_surveyors():
                 for row in result:
                     surveyor_id = row['SurveyorID']
                     if surveyor_id in contact_map:
-                        row['Phone'] = contact_map[surveyor_id].get('Phone')
-                        row['Email'] = contact_map[surveyor_id].get('Email')
+                        for name in contact_fields:
+                            row[name] = contact_map[surveyor_id].get(name)
         
         # 获取总数
         count_sql = """
@@ -95,6 +122,7 @@ def get_surveyors():
         return jsonify({'success': False, 'error': str(e)}), 500
 
 @bp.route('/stats', methods=['GET'])
+@cached(tables=['surveyors'])
 def get_surveyor_stats():
     """获取调研团队统计信息"""
     sql = """
@@ -3,21 +3,44 @@
 """
 from flask import Blueprint, jsonify, request
 from backend.db import execute_query
+from backend.cache import cached
+from backend.projection import fields_error, plain_fields, requested_fields, select_list
 
 bp = Blueprint('views_demo', __name__, url_prefix='/api/views')
 
+# 各视图接口可投影的字段（fields 参数）
+COUNTY_COMPLETE_FIELDS = plain_fields(
+    'CountyCode', 'CountyName', 'Province', 'Region', 'ExitYear',
+    'LatestEconYear', 'GDP', 'PerCapitaGDP', 'RuralDisposableIncome',
+    'LatestAgriYear', 'AgriOutputValue',
+    'InterviewCount', 'AvgInterviewQuality'
+)
+SURVEYOR_STATS_FIELDS = plain_fields(
+    'SurveyorID', 'Name', 'Department', 'Role', 'TeamID',
+    'AssignedCountyName', 'AssignedProvince',
+    'CompletedInterviews', 'ActualInterviewCount',
+    'CoveredCounties', 'AvgInterviewQuality', 'LatestInterviewDate'
+)
+POVERTY_SUMMARY_FIELDS = plain_fields(
+    'CountyCode', 'CountyName', 'Province', 'Region',
+    'ExitYear', 'ExitStatus',
+    'LatestGDP', 'LatestPerCapitaGDP', 'LatestRuralIncome',
+    'GDPGrowthRate', 'InterviewCount'
+)
+
 @bp.route('/county-complete', methods=['GET'])
+@cached(tables=['county_complete_info'])
 def get_county_complete():
-    """使用视图 v_county_complete_info 获取县域完整信息"""
+    """获取县域完整信息：读取 v_county_complete_info 的物化汇总表 county_complete_info"""
+    fields = requested_fields(COUNTY_COMPLETE_FIELDS)
+    if fields is None:
+        return jsonify(fields_error(COUNTY_COMPLETE_FIELDS)), 400
     limit = request.args.get('limit', type=int, default=10)
     region = request.args.get('region')
     
-    sql = """
-        SELECT CountyCode, CountyName, Province, Region, ExitYear,
-               LatestEconYear, GDP, PerCapitaGDP, RuralDisposableIncome,
-               LatestAgriYear, AgriOutputValue,
-               InterviewCount, AvgInterviewQuality
-        FROM v_county_complete_info
+    sql = f"""
+        SELECT {select_list(fields, COUNTY_COMPLETE_FIELDS)}
+        FROM county_complete_info
         WHERE 1=1
     """
     params = []
@@ -35,22 +58,24 @@ def get_county_complete():
             'success': True, 
             'data': result,
             'view_name': 'v_county_complete_info',
-            'description': '整合县域基础信息、贫困县状态、最新经济指标和农业数据'
+            'table_name': 'county_complete_info',
+            'description': '整合县域基础信息、贫困县状态、最新经济指标和农业数据（物化汇总表）'
         })
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
 @bp.route('/surveyor-stats', methods=['GET'])
+@cached(tables=['surveyors', 'county', 'surveyor_interview_stats'])
 def get_surveyor_stats():
     """使用视图 v_surveyor_work_statistics 获取调研员工作统计"""
+    fields = requested_fields(SURVEYOR_STATS_FIELDS)
+    if fields is None:
+        return jsonify(fields_error(SURVEYOR_STATS_FIELDS)), 400
     limit = request.args.get('limit', type=int, default=10)
     team_id = request.args.get('team_id')
     
-    sql = """
-        SELECT SurveyorID, Name, Department, Role, TeamID,
-               AssignedCountyName, AssignedProvince,
-               CompletedInterviews, ActualInterviewCount,
-               CoveredCounties, AvgInterviewQuality, LatestInterviewDate
+    sql = f"""
+        SELECT {select_list(fields, SURVEYOR_STATS_FIELDS)}
         FROM v_surveyor_work_statistics
         WHERE 1=1
     """
@@ -75,17 +100,18 @@ def get_surveyor_stats():
         return jsonify({'success': False, 'error': str(e)}), 500
 
 @bp.route('/poverty-summary', methods=['GET'])
+@cached(tables=['poverty_counties', 'county_economy', 'county_latest_year', 'county_interview_stats'])
 def get_poverty_summary():
     """使用视图 v_poverty_county_summary 获取贫困县汇总"""
+    fields = requested_fields(POVERTY_SUMMARY_FIELDS)
+    if fields is None:
+        return jsonify(fields_error(POVERTY_SUMMARY_FIELDS)), 400
     limit = request.args.get('limit', type=int, default=10)
     region = request.args.get('region')
     exit_status = request.args.get('exit_status')  # '已摘帽' or '未摘帽'
     
-    sql = """
-        SELECT CountyCode, CountyName, Province, Region,
-               ExitYear, ExitStatus,
-               LatestGDP, LatestPerCapitaGDP, LatestRuralIncome,
-               GDPGrowthRate, InterviewCount
+    sql = f"""
+        SELECT {select_list(fields, POVERTY_SUMMARY_FIELDS)}
         FROM v_poverty_county_summary
         WHERE 1=1
     """
@@ -113,6 +139,7 @@ def get_poverty_summary():
         return jsonify({'success': False, 'error': str(e)}), 500
 
 @bp.route('/list', methods=['GET'])
+@cached()  # 视图定义只在 init_views.py 时变化，仅靠 TTL 过期
 def list_views():
     """列出所有已创建的视图"""
     sql = """
@@ -3,11 +3,16 @@
 """
 from flask import Flask
 from flask_cors import CORS
+from backend import compression, db
+from backend.json_provider import FastJSONProvider
 from backend.api import counties, interviews, compare, stats, auth, surveyors, views_demo, export
 
 app = Flask(__name__)
+app.json = FastJSONProvider(app)  # 数据库行直接序列化（Decimal、日期），优先使用orjson
 app.secret_key = 'dev_secret_key_832_project'  # 开发环境密钥，生产环境应使用环境变量
 CORS(app, supports_credentials=True)  # 允许跨域携带 Cookie
+db.init_app(app)  # 请求级数据库连接在请求结束时归还连接池
+compression.init_app(app)  # 按 Accept-Encoding 压缩较大的响应
 
 # 注册蓝图
 app.register_blueprint(counties.bp)
@@ -49,6 +54,7 @@ def internal_error(error):
 if __name__ == '__main__':
     app.run(debug=True, host='0.0.0.0', port=5001)
 else:
-    # 用于生产环境部署
+    # 用于生产环境部署：每个worker进程导入时预热自己的数据库连接池
+    db.warm_up_pool()
     application = app
 
@@ -0,0 +1,137 @@
+"""
+JSON 序列化基准
+对比 Flask 默认的 JSON provider 与 backend.json_provider.FastJSONProvider 在
+/api/counties 和 /api/compare/trend 响应上的序列化耗时。默认使用按接口列结构生成的样例行
+（Decimal、date 与数据库返回的类型一致），--db 时执行接口的实际查询取数。
+"""
+import argparse
+import datetime
+import os
+import random
+import sys
+import timeit
+from decimal import Decimal
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from backend import json_provider
+from backend.json_provider import FastJSONProvider
+
+# 与 counties.get_counties / compare.compare_trend 一致的查询
+COUNTIES_SQL = """
+    SELECT CountyCode, CountyName, Province, City,
+           Longitude, Latitude, ExitYear, Region,
+           GDP, PerCapitaGDP, RuralDisposableIncome,
+           InterviewCount, DataCompleteness
+    FROM county_complete_info
+    ORDER BY DataCompleteness DESC, ExitYear, Province, CountyName
+"""
+
+TREND_SQL = """
+    SELECT c.CountyCode, c.CountyName, c.Province,
+           t.Year, t.GDP
+    FROM county_economy t
+    JOIN county c ON t.CountyCode = c.CountyCode
+    WHERE t.CountyCode IN (SELECT CountyCode FROM (
+        SELECT CountyCode FROM county_economy GROUP BY CountyCode LIMIT 10) s)
+      AND t.Year >= 2000 AND t.Year <= 2020
+    ORDER BY t.Year, t.CountyCode
+"""
+
+
+def _money(rng, low, high):
+    return Decimal(f'{rng.uniform(low, high):.2f}')
+
+
+def sample_counties(rng, n=2100):
+    """/api/counties 的样例行（13 列，数值列为 Decimal）"""
+    rows = []
+    for i in range(n):
+        rows.append({
+            'CountyCode': f'{520000 + i}',
+            'CountyName': f'样例县{i}',
+            'Province': '贵州省',
+            'City': '样例市',
+            'Longitude': _money(rng, 97, 122),
+            'Latitude': _money(rng, 21, 42),
+            'ExitYear': rng.choice([None, 2016, 2017, 2018, 2019, 2020]),
+            'Region': rng.choice(['东部', '中部', '西部']),
+            'GDP': _money(rng, 1e5, 5e6),
+            'PerCapitaGDP': _money(rng, 1e4, 8e4),
+            'RuralDisposableIncome': _money(rng, 5e3, 2e4),
+            'InterviewCount': rng.randint(0, 30),
+            'DataCompleteness': rng.randint(0, 3),
+        })
+    return rows
+
+
+def sample_trend(rng, counties=10, years=range(2000, 2021)):
+    """/api/compare/trend 的样例行"""
+    return [
+        {'CountyCode': f'{520000 + c}', 'CountyName': f'样例县{c}', 'Province': '贵州省',
+         'Year': year, 'GDP': _money(rng, 1e5, 5e6)}
+        for year in years for c in range(counties)
+    ]
+
+
+def sample_interviews(rng, n=500):
+    """带日期列的访谈行，检查 date 的序列化"""
+    start = datetime.date(2019, 1, 1)
+    return [
+        {'InterviewID': f'I{i:06d}', 'InterviewDate': start + datetime.timedelta(days=rng.randint(0, 700)),
+         'Quality': Decimal(f'{rng.uniform(1, 5):.1f}'), 'Content': '访谈内容' * 20}
+        for i in range(n)
+    ]
+
+
+def load_payloads(use_db):
+    if use_db:
+        from backend.db import execute_query
+        return {
+            '/api/counties': execute_query(COUNTIES_SQL),
+            '/api/compare/trend': execute_query(TREND_SQL),
+        }
+    rng = random.Random(832)
+    return {
+        '/api/counties': sample_counties(rng),
+        '/api/compare/trend': sample_trend(rng),
+        'interviews (dates)': sample_interviews(rng),
+    }
+
+
+def bench(provider, app, payload, repeat):
+    """与接口相同的方式生成响应体：jsonify -> response.get_data()，返回 (每次毫秒, 字节数)"""
+    body = {'success': True, 'data': payload, 'count': len(payload)}
+    with app.app_context():
+        run = lambda: provider.response(body).get_data()
+        size = len(run())
+        seconds = min(timeit.repeat(run, number=repeat, repeat=3)) / repeat
+    return seconds * 1000, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description='对比默认JSON provider与FastJSONProvider的序列化耗时')
+    parser.add_argument('--db', action='store_true', help='执行接口的实际查询取数（默认使用样例行）')
+    parser.add_argument('--repeat', type=int, default=50, help='每轮序列化次数（默认 50）')
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    providers = [('flask default', DefaultJSONProvider(app)), ('fast', FastJSONProvider(app))]
+    encoder = 'orjson' if json_provider.orjson is not None else 'stdlib json'
+    print(f"Fast provider encoder: {encoder}, Decimal as {json_provider.JSON_CONFIG['decimal']}")
+
+    for name, payload in load_payloads(args.db).items():
+        print(f"\n{name}: {len(payload)} rows")
+        baseline = None
+        for label, provider in providers:
+            ms, size = bench(provider, app, payload, args.repeat)
+            baseline = baseline or ms
+            print(f"  {label:<14}{ms:>9.2f} ms{size:>10} bytes{baseline / ms:>8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
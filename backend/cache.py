@@ -0,0 +1,338 @@
+"""
+接口响应缓存
+进程内 LRU + TTL 缓存，总字节数有上限。键由 端点 + 规范化的查询参数 + 会话角色 组成，
+每个缓存项带有它读取的表名标签：
+
+- 本进程的写接口提交后调用 invalidate_tables()，立即淘汰带这些标签的缓存项；
+- 其他进程（多worker部署、导入脚本）的写入通过 data_versions 表传播：写入方在同一事务中
+  调用 bump_data_versions() 递增表版本，读取方每隔 version_check_interval 秒刷新一次版本号，
+  缓存项记录的版本与当前版本不一致即视为失效。
+
+同一组表版本还用于条件请求：响应带有由 缓存键 + 所读表版本 计算出的强 ETag 和
+各表最近写入时间的 Last-Modified，客户端携带 If-None-Match / If-Modified-Since 且数据未变时
+直接返回 304，不执行任何业务查询。缓存项写入时按 backend.compression 预压缩各编码的响应体，
+命中时按 Accept-Encoding 直接返回压缩结果。
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from functools import wraps
+
+from flask import Response, make_response, request, session
+
+from backend.compression import ENCODINGS, compress, compressible, etag_variants, negotiate_encoding, tag_encoding
+
+# 缓存配置
+CACHE_CONFIG = {
+    'max_entries': 512,              # 最多缓存的响应数
+    'max_bytes': 32 * 1024 * 1024,   # 缓存响应体总字节数上限
+    'ttl': 300,                      # 缓存项存活秒数
+    'version_check_interval': 2,     # 跨进程失效：data_versions 的刷新间隔（秒）
+}
+
+# 建表语句（与 plan/16_create_summary_tables.sql 一致，由 summaries.ensure_summary_tables 执行）
+CREATE_DATA_VERSIONS = """
+    CREATE TABLE IF NOT EXISTS data_versions (
+        TableName VARCHAR(64) PRIMARY KEY COMMENT '表名',
+        Version BIGINT NOT NULL DEFAULT 0 COMMENT '数据版本号，每次写入递增',
+        UpdatedAt TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT '最近写入时间'
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='缓存失效用的表数据版本'
+"""
+
+
+def bump_data_versions(conn, tables):
+    """在调用方的事务中递增这些表的数据版本（只执行DML，由调用方提交）"""
+    tables = sorted(set(tables))
+    if not tables:
+        return
+    cursor = conn.cursor()
+    try:
+        cursor.executemany(
+            "INSERT INTO data_versions (TableName, Version) VALUES (%s, 1) "
+            "ON DUPLICATE KEY UPDATE Version = Version + 1",
+            [(table,) for table in tables]
+        )
+    finally:
+        cursor.close()
+
+
+class _CacheEntry:
+    __slots__ = ('body', 'encoded', 'status', 'mimetype', 'tags', 'versions', 'expires_at', 'size')
+
+    def __init__(self, body, encoded, status, mimetype, tags, versions, expires_at):
+        self.body = body
+        self.encoded = encoded  # 编码 -> 预压缩的响应体
+        self.status = status
+        self.mimetype = mimetype
+        self.tags = tags
+        self.versions = versions
+        self.expires_at = expires_at
+        self.size = len(body) + sum(len(data) for data in encoded.values())
+
+
+class ResponseCache:
+    """线程安全的 LRU + TTL 响应缓存，按表名标签失效"""
+
+    def __init__(self, max_entries=512, max_bytes=32 * 1024 * 1024, ttl=300, version_check_interval=2):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.version_check_interval = version_check_interval
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        # 本进程内每个标签的失效代数：填充期间发生失效时放弃写入缓存
+        self._generations = {}
+        self._versions = {}
+        self._modified = {}
+        self._versions_ok = False
+        self._versions_loaded_at = None
+        self._stats = {
+            'hits': 0,
+            'misses': 0,
+            'stores': 0,
+            'expired': 0,
+            'stale': 0,
+            'evictions': 0,
+            'invalidations': 0,
+            'skipped_stores': 0,
+            'version_errors': 0,
+            'not_modified': 0,
+        }
+
+    def _count(self, key, delta=1):
+        self._stats[key] += delta
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+
+    def data_versions(self):
+        """当前各表的数据版本（按 version_check_interval 节流刷新；读取失败时沿用上次结果）"""
+        now = time.monotonic()
+        with self._lock:
+            loaded_at = self._versions_loaded_at
+            if loaded_at is not None and now - loaded_at < self.version_check_interval:
+                return self._versions
+            self._versions_loaded_at = now
+        from backend.db import get_db_connection
+        try:
+            conn = get_db_connection()
+            try:
+                cursor = conn.cursor()
+                try:
+                    cursor.execute("SELECT TableName, Version, UNIX_TIMESTAMP(UpdatedAt) AS UpdatedAt FROM data_versions")
+                    rows = cursor.fetchall()
+                finally:
+                    cursor.close()
+            finally:
+                conn.close()
+        except Exception:
+            # data_versions 尚未创建或数据库暂不可用：只依赖 TTL 和本进程失效
+            with self._lock:
+                self._count('version_errors')
+            return self._versions
+        versions = {row['TableName']: row['Version'] for row in rows}
+        with self._lock:
+            self._versions = versions
+            self._modified = {row['TableName']: int(row['UpdatedAt'] or 0) for row in rows}
+            self._versions_ok = True
+        return versions
+
+    def validators(self, key, tags):
+        """
+        条件请求的 (ETag, Last-Modified)。data_versions 从未成功读取时无法判断数据是否变化，返回 (None, None)
+        """
+        versions = self.data_versions()
+        with self._lock:
+            if not self._versions_ok:
+                return None, None
+            modified = max((self._modified.get(tag, 0) for tag in tags), default=0)
+        stamp = repr((key, tuple((tag, versions.get(tag, 0)) for tag in sorted(tags))))
+        etag = hashlib.sha1(stamp.encode('utf-8')).hexdigest()[:20]
+        last_modified = datetime.fromtimestamp(modified, timezone.utc) if modified else None
+        return etag, last_modified
+
+    def count_not_modified(self):
+        with self._lock:
+            self._count('not_modified')
+
+    def generations(self, tags):
+        with self._lock:
+            return tuple(self._generations.get(tag, 0) for tag in tags)
+
+    def get(self, key):
+        versions = self.data_versions()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._count('misses')
+                return None
+            if entry.expires_at <= time.monotonic():
+                self._remove(key)
+                self._count('expired')
+                self._count('misses')
+                return None
+            if any(versions.get(tag, 0) != version for tag, version in entry.versions.items()):
+                self._remove(key)
+                self._count('stale')
+                self._count('misses')
+                return None
+            self._entries.move_to_end(key)
+            self._count('hits')
+            return entry
+
+    def put(self, key, body, status, mimetype, tags, generations, ttl=None):
+        """
+        写入缓存并返回缓存项；填充期间这些标签被失效过，或响应体超过总上限时不写入，返回 None
+        """
+        versions = self.data_versions()
+        encoded = {}
+        if compressible(mimetype, len(body)):
+            encoded = {encoding: compress(body, encoding, cached=True) for encoding in ENCODINGS}
+        entry = _CacheEntry(
+            body, encoded, status, mimetype, tags,
+            {tag: versions.get(tag, 0) for tag in tags},
+            time.monotonic() + (self.ttl if ttl is None else ttl)
+        )
+        with self._lock:
+            current = tuple(self._generations.get(tag, 0) for tag in sorted(tags))
+            if current != generations or entry.size > self.max_bytes:
+                self._count('skipped_stores')
+                return None
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = entry
+            self._bytes += entry.size
+            self._count('stores')
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self._count('evictions')
+            return entry
+
+    def invalidate(self, tables):
+        """淘汰带有任一表名标签的缓存项，返回淘汰数"""
+        tables = set(tables)
+        with self._lock:
+            for table in tables:
+                self._generations[table] = self._generations.get(table, 0) + 1
+            keys = [key for key, entry in self._entries.items() if tables & entry.tags]
+            for key in keys:
+                self._remove(key)
+            self._count('invalidations', len(keys))
+            # 下次读取时重新加载 data_versions，其他进程看到的版本也随之更新
+            self._versions_loaded_at = None
+            return len(keys)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """缓存统计信息"""
+        with self._lock:
+            result = dict(self._stats)
+            result.update({
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'ttl': self.ttl,
+            })
+        lookups = result['hits'] + result['misses']
+        result['hit_rate'] = round(result['hits'] / lookups, 4) if lookups else 0
+        return result
+
+
+response_cache = ResponseCache(**CACHE_CONFIG)
+
+
+def cache_key():
+    """端点 + 路径参数 + 规范化的查询参数（排序、保留重复键）+ 会话角色"""
+    args = tuple(sorted((key, value) for key, value in request.args.items(multi=True)))
+    view_args = tuple(sorted((request.view_args or {}).items()))
+    return (request.endpoint, view_args, args, session.get('role') or 'anonymous')
+
+
+def _set_validators(response, etag, last_modified):
+    """200/304 响应都带上校验器；no-cache 让浏览器每次携带 If-None-Match 重新验证"""
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    response.headers['Cache-Control'] = 'no-cache'
+
+
+def _not_modified(etag, last_modified):
+    """
+    按 RFC 7232：有 If-None-Match 时只比较 ETag（任一编码表示的 ETag 均可），否则比较 If-Modified-Since。
+    数据未变化时返回客户端持有的 ETag，否则返回 None
+    """
+    if request.if_none_match:
+        return next((tag for tag in etag_variants(etag) if request.if_none_match.contains(tag)), None)
+    since = request.if_modified_since
+    if since is not None and last_modified is not None and last_modified <= since:
+        return etag
+    return None
+
+
+def _entry_response(entry):
+    """用缓存项构造响应，客户端接受时直接使用预压缩的响应体；返回 (响应, 编码)"""
+    encoding = negotiate_encoding()
+    if encoding in entry.encoded:
+        return Response(entry.encoded[encoding], status=entry.status, mimetype=entry.mimetype), encoding
+    return Response(entry.body, status=entry.status, mimetype=entry.mimetype), None
+
+
+def cached(tables=(), ttl=None):
+    """
+    缓存 GET 接口的成功响应。tables 为该接口读取的表，用于写入后的失效和条件请求的 ETag；
+    只缓存 200 响应，错误响应每次重新执行。未声明 tables 的接口只做 TTL 缓存，不参与条件请求
+    """
+    tags = frozenset(tables)
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if request.method != 'GET':
+                return view(*args, **kwargs)
+            key = cache_key()
+            etag, last_modified = response_cache.validators(key, tags) if tags else (None, None)
+            matched = _not_modified(etag, last_modified) if etag is not None else None
+            if matched is not None:
+                response_cache.count_not_modified()
+                response = Response(status=304)
+                _set_validators(response, matched, last_modified)
+                response.vary.add('Accept-Encoding')
+                return response
+
+            encoding = None
+            entry = response_cache.get(key)
+            if entry is not None:
+                response, encoding = _entry_response(entry)
+                response.headers['X-Cache'] = 'HIT'
+            else:
+                generations = response_cache.generations(sorted(tags))
+                response = make_response(view(*args, **kwargs))
+                if response.status_code == 200 and not response.direct_passthrough:
+                    entry = response_cache.put(key, response.get_data(), response.status_code, response.mimetype,
+                                               tags, generations, ttl)
+                    if entry is not None:
+                        # 新写入的缓存项已经压缩过，直接使用，避免 after_request 再压缩一次
+                        response, encoding = _entry_response(entry)
+                response.headers['X-Cache'] = 'MISS'
+            if etag is not None and response.status_code == 200:
+                _set_validators(response, etag, last_modified)
+            if encoding is not None:
+                tag_encoding(response, encoding)
+            return response
+        return wrapper
+    return decorator
+
+
+def invalidate_tables(tables):
+    """本进程写入提交后调用：立即淘汰相关缓存项（跨进程失效依赖 bump_data_versions）"""
+    return response_cache.invalidate(tables)
@@ -0,0 +1,73 @@
+"""
+列式响应格式
+列表/时间序列接口支持 format=columnar：
+
+    {"success": true, "format": "columnar", "count": N,
+     "columns": ["Year", "GDP", ...],
+     "types": {"Year": "int64", "GDP": "float64", ...},
+     "data": {"Year": [...], "GDP": [...], ...}}
+
+列名只出现一次；数值列声明类型（int64/float64），前端可以直接构造 Float64Array 等类型化数组，
+空值保留为 null。结果由元组游标的行直接按列转置得到，不构造逐行字典。
+"""
+from operator import itemgetter
+
+from flask import request
+from pymysql.constants import FIELD_TYPE
+
+from backend.db import execute_query_tuples
+
+# 支持的 format 参数值，rows 为原有的逐行字典数组
+RESPONSE_FORMATS = ('rows', 'columnar')
+
+# MySQL 列类型 -> 列式响应中的类型名
+COLUMN_TYPES = {
+    FIELD_TYPE.TINY: 'int64',
+    FIELD_TYPE.SHORT: 'int64',
+    FIELD_TYPE.LONG: 'int64',
+    FIELD_TYPE.LONGLONG: 'int64',
+    FIELD_TYPE.INT24: 'int64',
+    FIELD_TYPE.YEAR: 'int64',
+    FIELD_TYPE.DECIMAL: 'float64',
+    FIELD_TYPE.NEWDECIMAL: 'float64',
+    FIELD_TYPE.FLOAT: 'float64',
+    FIELD_TYPE.DOUBLE: 'float64',
+    FIELD_TYPE.DATE: 'date',
+    FIELD_TYPE.NEWDATE: 'date',
+    FIELD_TYPE.DATETIME: 'datetime',
+    FIELD_TYPE.TIMESTAMP: 'datetime',
+}
+
+
+def response_format():
+    """请求的响应格式；不支持的值返回 None"""
+    value = request.args.get('format', 'rows').lower()
+    return value if value in RESPONSE_FORMATS else None
+
+
+def format_error():
+    return {'success': False, 'error': f'format 可选值: {", ".join(RESPONSE_FORMATS)}'}
+
+
+def to_columnar(description, rows):
+    """元组行 -> 列式结果（columns、types、data、count）"""
+    columns = [desc[0] for desc in description]
+    types = {desc[0]: COLUMN_TYPES.get(desc[1], 'string') for desc in description}
+    values = list(zip(*rows)) if rows else [()] * len(columns)
+    data = {}
+    for column, column_values in zip(columns, values):
+        if types[column] == 'float64':
+            # DECIMAL 列转为浮点数，避免逐个 Decimal 序列化
+            data[column] = [None if v is None else float(v) for v in column_values]
+        else:
+            data[column] = list(column_values)
+    return {'format': 'columnar', 'columns': columns, 'types': types, 'data': data, 'count': len(rows)}
+
+
+def columnar_query(sql, params=None, sort_by=None):
+    """执行查询并返回列式结果；sort_by 为列名序列时在应用层按这些列排序"""
+    description, rows = execute_query_tuples(sql, params)
+    if sort_by:
+        columns = [desc[0] for desc in description]
+        rows = sorted(rows, key=itemgetter(*[columns.index(column) for column in sort_by]))
+    return to_columnar(description, rows)
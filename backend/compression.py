@@ -0,0 +1,125 @@
+"""
+响应压缩
+按 Accept-Encoding 协商 brotli / gzip：
+
+- 普通接口在 after_request 中整体压缩，小于 min_size 的响应不压缩；
+- 接口响应缓存在写入时预先压缩好各编码的响应体，命中时直接返回，不再重复压缩；
+- 导出接口的流式响应用 stream_compress() 逐块压缩，不在内存中缓存整个文件。
+
+实时压缩使用偏低的压缩级别以控制延迟，预压缩的缓存响应体会被多次复用，使用较高的级别。
+"""
+import gzip
+import zlib
+
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # 未安装brotli时只协商gzip
+    brotli = None
+
+# 压缩配置
+COMPRESSION_CONFIG = {
+    'min_size': 1024,              # 小于该字节数的响应不压缩
+    'gzip_level': 5,               # 实时压缩的gzip级别（1-9）
+    'brotli_quality': 4,           # 实时压缩的brotli质量（0-11）
+    'cached_gzip_level': 9,        # 缓存响应体预压缩的gzip级别
+    'cached_brotli_quality': 7,    # 缓存响应体预压缩的brotli质量
+    'mimetypes': {'application/json', 'text/csv', 'text/plain', 'text/html', 'application/javascript'},
+}
+
+# 协商顺序：优先brotli
+ENCODINGS = ['br', 'gzip'] if brotli is not None else ['gzip']
+
+
+def compress(body, encoding, cached=False):
+    """按编码一次性压缩响应体"""
+    if encoding == 'br':
+        quality = COMPRESSION_CONFIG['cached_brotli_quality' if cached else 'brotli_quality']
+        return brotli.compress(body, quality=quality, mode=brotli.MODE_TEXT)
+    level = COMPRESSION_CONFIG['cached_gzip_level' if cached else 'gzip_level']
+    # 固定 mtime，相同内容的压缩结果一致
+    return gzip.compress(body, compresslevel=level, mtime=0)
+
+
+def compressible(mimetype, size=None):
+    return mimetype in COMPRESSION_CONFIG['mimetypes'] and (size is None or size >= COMPRESSION_CONFIG['min_size'])
+
+
+def negotiate_encoding():
+    """当前请求可接受的最优编码（q=0 视为拒绝），都不接受时返回 None"""
+    best, best_quality = None, 0
+    for encoding in ENCODINGS:
+        quality = request.accept_encodings.quality(encoding)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def etag_variants(etag):
+    """同一数据的各编码表示使用不同的强 ETag：原始 ETag 加编码后缀"""
+    return [etag] + [f'{etag}-{encoding}' for encoding in ENCODINGS]
+
+
+def tag_encoding(response, encoding):
+    """标记响应的内容编码，并把 ETag 换成该编码表示的 ETag"""
+    response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    etag, weak = response.get_etag()
+    if etag:
+        response.set_etag(f'{etag}-{encoding}', weak)
+
+
+def stream_compress(chunks, encoding):
+    """
+    逐块压缩文本/字节流；每块压缩后立即 flush，客户端可以边下载边解压。
+    响应结束（含客户端中途断开）时关闭上游生成器，使其释放数据库连接
+    """
+    try:
+        if encoding == 'br':
+            compressor = brotli.Compressor(quality=COMPRESSION_CONFIG['brotli_quality'], mode=brotli.MODE_TEXT)
+            for chunk in chunks:
+                if isinstance(chunk, str):
+                    chunk = chunk.encode('utf-8')
+                data = compressor.process(chunk) + compressor.flush()
+                if data:
+                    yield data
+            yield compressor.finish()
+            return
+
+        compressor = zlib.compressobj(COMPRESSION_CONFIG['gzip_level'], zlib.DEFLATED, 31)  # 31: gzip 格式
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+            if data:
+                yield data
+        yield compressor.flush()
+    finally:
+        if hasattr(chunks, 'close'):
+            chunks.close()
+
+
+def compress_response(response):
+    """after_request：压缩足够大的文本响应（已编码、流式和非200响应保持原样）"""
+    if response.status_code != 200 or response.direct_passthrough or response.is_streamed:
+        return response
+    if 'Content-Encoding' in response.headers or not compressible(response.mimetype):
+        return response
+    response.vary.add('Accept-Encoding')
+    if request.method == 'HEAD' or response.content_length is None:
+        return response
+    if response.content_length < COMPRESSION_CONFIG['min_size']:
+        return response
+
+    encoding = negotiate_encoding()
+    if encoding is None:
+        return response
+    response.set_data(compress(response.get_data(), encoding))
+    tag_encoding(response, encoding)
+    return response
+
+
+def init_app(app):
+    """注册响应压缩钩子"""
+    app.after_request(compress_response)
@@ -1,8 +1,14 @@
 """
 数据库连接模块
 """
+import os
+import queue
+import threading
+import time
+import pandas as pd
 import pymysql
 from functools import wraps
+from flask import g, has_app_context
 
 # 数据库配置
 DB_CONFIG = {
@@ -14,10 +20,250 @@ DB_CONFIG = {
     'cursorclass': pymysql.cursors.DictCursor
 }
 
+# 连接池配置
+POOL_CONFIG = {
+    'max_size': 10,        # 每个进程最多持有的连接数
+    'min_size': 2,         # 进程启动时预热的连接数
+    'timeout': 10,         # 连接池耗尽时等待空闲连接的秒数
+    'recycle': 3600,       # 连接存活超过该秒数后关闭重建（需小于MySQL的wait_timeout）
+    'ping_after': 30,      # 连接空闲超过该秒数，借出前先ping检测
+}
+
+
+class _PoolEntry:
+    """连接池内部持有的物理连接"""
+
+    __slots__ = ('conn', 'created_at', 'last_used')
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+
+
+class PooledConnection:
+    """连接池借出的连接，close() 时归还连接池而不是断开"""
+
+    def __init__(self, pool, entry):
+        self._pool = pool
+        self._entry = entry
+
+    def __getattr__(self, name):
+        entry = self.__dict__.get('_entry')
+        if entry is None:
+            raise pymysql.err.InterfaceError(0, '连接已归还连接池')
+        return getattr(entry.conn, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        """归还连接池（重复调用无副作用）"""
+        entry, self._entry = self._entry, None
+        if entry is not None:
+            self._pool.release(entry)
+
+    def discard(self):
+        """断开物理连接而不归还（如无缓冲游标未读完时），释放连接池名额"""
+        entry, self._entry = self._entry, None
+        if entry is not None:
+            self._pool.discard(entry)
+
+
+class ConnectionPool:
+    """有界连接池：借出前ping检测、超龄连接回收、进程级预热及统计"""
+
+    def __init__(self, db_config, max_size=10, min_size=0, timeout=10, recycle=3600, ping_after=30):
+        self.db_config = db_config
+        self.max_size = max_size
+        self.min_size = min(min_size, max_size)
+        self.timeout = timeout
+        self.recycle = recycle
+        self.ping_after = ping_after
+        self.pid = os.getpid()
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._lock = threading.Lock()
+        self._stats = {
+            'created': 0,
+            'checkouts': 0,
+            'reused': 0,
+            'recycled': 0,
+            'ping_failures': 0,
+            'discarded': 0,
+            'timeouts': 0,
+            'in_use': 0,
+        }
+
+    def _count(self, key, delta=1):
+        with self._lock:
+            self._stats[key] += delta
+
+    def _connect(self):
+        entry = _PoolEntry(pymysql.connect(**self.db_config))
+        self._count('created')
+        return entry
+
+    @staticmethod
+    def _close_quietly(entry):
+        try:
+            entry.conn.close()
+        except Exception:
+            pass
+
+    def _is_usable(self, entry):
+        now = time.monotonic()
+        if self.recycle and now - entry.created_at > self.recycle:
+            self._count('recycled')
+            return False
+        if self.ping_after is not None and now - entry.last_used > self.ping_after:
+            try:
+                entry.conn.ping(reconnect=False)
+            except Exception:
+                self._count('ping_failures')
+                return False
+        return True
+
+    def warm_up(self, size=None):
+        """预先建立连接放入空闲队列，返回成功建立的连接数"""
+        target = self.min_size if size is None else min(size, self.max_size)
+        opened = 0
+        while self._idle.qsize() < target:
+            try:
+                entry = self._connect()
+            except Exception as e:
+                print(f"连接池预热失败: {e}")
+                break
+            self._idle.put(entry)
+            opened += 1
+        return opened
+
+    def acquire(self):
+        """借出一个连接；连接池耗尽时最多等待 timeout 秒"""
+        if not self._slots.acquire(timeout=self.timeout):
+            self._count('timeouts')
+            raise pymysql.err.OperationalError(2013, f'数据库连接池已耗尽（max_size={self.max_size}）')
+        try:
+            while True:
+                try:
+                    entry = self._idle.get_nowait()
+                except queue.Empty:
+                    entry = self._connect()
+                    break
+                if self._is_usable(entry):
+                    self._count('reused')
+                    break
+                self._close_quietly(entry)
+        except Exception:
+            self._slots.release()
+            raise
+        self._count('checkouts')
+        self._count('in_use')
+        return PooledConnection(self, entry)
+
+    def release(self, entry):
+        """归还连接：回滚未提交的事务后放回空闲队列，失效的连接直接丢弃"""
+        try:
+            entry.conn.rollback()
+            entry.last_used = time.monotonic()
+            self._idle.put(entry)
+        except Exception:
+            self._count('discarded')
+            self._close_quietly(entry)
+        finally:
+            self._count('in_use', -1)
+            self._slots.release()
+
+    def discard(self, entry):
+        """丢弃借出的连接"""
+        self._count('discarded')
+        self._close_quietly(entry)
+        self._count('in_use', -1)
+        self._slots.release()
+
+    def stats(self):
+        """连接池统计信息"""
+        with self._lock:
+            result = dict(self._stats)
+        result.update({
+            'pid': self.pid,
+            'idle': self._idle.qsize(),
+            'max_size': self.max_size,
+            'min_size': self.min_size,
+        })
+        return result
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """获取当前进程的连接池；fork 出的子进程（多worker部署）会重建并预热自己的连接池"""
+    global _pool
+    if _pool is None or _pool.pid != os.getpid():
+        with _pool_lock:
+            if _pool is None or _pool.pid != os.getpid():
+                # 父进程的连接套接字不能跨进程复用，直接丢弃引用
+                _pool = ConnectionPool(DB_CONFIG, **POOL_CONFIG)
+                _pool.warm_up()
+    return _pool
+
+
+def warm_up_pool(size=None):
+    """预热当前进程的连接池"""
+    return get_pool().warm_up(size)
+
+
+def get_pool_stats():
+    """获取当前进程的连接池统计"""
+    return get_pool().stats()
+
 
 def get_db_connection():
-    """获取数据库连接"""
-    return pymysql.connect(**DB_CONFIG)
+    """从连接池借出数据库连接，调用 close() 即归还"""
+    return get_pool().acquire()
+
+
+def get_request_connection():
+    """获取当前请求共享的数据库连接（首次调用时从连接池借出），不在Flask应用上下文中时返回None"""
+    if not has_app_context():
+        return None
+    conn = g.get('_db_conn')
+    if conn is None:
+        conn = get_db_connection()
+        g._db_conn = conn
+    return conn
+
+
+def release_request_connection(exception=None):
+    """请求结束时归还请求级连接（归还时回滚，结束只读事务/快照）"""
+    conn = g.pop('_db_conn', None)
+    g.pop('_db_snapshot', None)
+    if conn is not None:
+        conn.close()
+
+
+def use_consistent_snapshot():
+    """让当前请求后续的查询共享同一个一致性读快照（列表与总数等成对结果保持一致）"""
+    conn = get_request_connection()
+    if conn is None or g.get('_db_snapshot'):
+        return
+    conn.rollback()  # 结束之前查询隐式开启的事务
+    cursor = conn.cursor()
+    try:
+        cursor.execute("START TRANSACTION WITH CONSISTENT SNAPSHOT, READ ONLY")
+    finally:
+        cursor.close()
+    g._db_snapshot = True
+
+
+def init_app(app):
+    """注册请求级连接的释放回调"""
+    app.teardown_appcontext(release_request_connection)
 
 
 def db_query(func):
@@ -39,8 +285,74 @@ def db_query(func):
     return wrapper
 
 
+def iter_query(sql, params=None, batch_size=1000, batches=False, as_dict=True):
+    """
+    流式查询：基于无缓冲的服务端游标（SSDictCursor/SSCursor）按 batch_size 分批读取，
+    内存占用与结果集大小无关。batches=True 时逐批产出行列表，否则逐行产出。
+
+    使用独立的连接（不占用请求级连接），结果未读完就关闭生成器时直接断开该连接，
+    避免为排空剩余结果而读完整个结果集。
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor(pymysql.cursors.SSDictCursor if as_dict else pymysql.cursors.SSCursor)
+    exhausted = False
+    try:
+        cursor.execute(sql, params or ())
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            if batches:
+                yield rows
+            else:
+                yield from rows
+        exhausted = True
+    finally:
+        if exhausted:
+            cursor.close()
+            conn.close()
+        else:
+            conn.discard()
+
+
+def execute_query_tuples(sql, params=None):
+    """执行查询，以元组形式返回 (cursor.description, 行列表)，不为每行构造字典；请求内复用同一个连接"""
+    conn = get_request_connection()
+    owned = conn is None
+    if owned:
+        conn = get_db_connection()
+    cursor = conn.cursor(pymysql.cursors.Cursor)
+    try:
+        cursor.execute(sql, params or ())
+        return cursor.description, cursor.fetchall()
+    finally:
+        cursor.close()
+        if owned:
+            conn.close()
+
+
+def fetch_frame(conn, sql, params=None):
+    """在给定连接上执行查询，结果读为 DataFrame（元组游标，不构造逐行字典）"""
+    cursor = conn.cursor(pymysql.cursors.Cursor)
+    try:
+        cursor.execute(sql, params or ())
+        columns = [desc[0] for desc in cursor.description]
+        return pd.DataFrame(list(cursor.fetchall()), columns=columns)
+    finally:
+        cursor.close()
+
+
 def execute_query(sql, params=None):
-    """执行查询并返回结果"""
+    """执行查询并返回结果；请求内复用同一个连接"""
+    conn = get_request_connection()
+    if conn is not None:
+        cursor = conn.cursor()
+        try:
+            cursor.execute(sql, params or ())
+            return cursor.fetchall()
+        finally:
+            cursor.close()
+
     conn = get_db_connection()
     try:
         cursor = conn.cursor()
@@ -50,4 +362,3 @@ def execute_query(sql, params=None):
     finally:
         cursor.close()
         conn.close()
-
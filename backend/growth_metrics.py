@@ -0,0 +1,130 @@
+"""
+县域增长指标表 county_growth_metrics
+导入结束时对经济面板（county_economy）做一次向量化计算：每个贫困县、每个指标一行，
+记录起始/摘帽基准/最新三个时点的数值，以及摘帽前后的增长率和年均复合增长率（CAGR）。
+排名接口按 (Metric, 增长列) 索引顺序读取前N行，不再逐县执行相关子查询。
+"""
+import numpy as np
+import pandas as pd
+
+from backend.db import fetch_frame
+
+# 指标名 -> county_economy 中的列
+GROWTH_METRICS = {
+    'GDP': 'GDP',
+    'Income': 'RuralDisposableIncome',
+    'Fiscal': 'FiscalRevenue',
+}
+
+# 可用于排名的增长列
+GROWTH_MEASURES = ['PostExitGrowth', 'PostExitCAGR', 'PreExitGrowth', 'PreExitCAGR']
+
+COUNTY_GROWTH_METRICS_COLUMNS = [
+    'CountyCode', 'Metric', 'Province', 'Region', 'ExitYear',
+    'StartYear', 'StartValue', 'AnchorYear', 'AnchorValue', 'LatestYear', 'LatestValue',
+] + GROWTH_MEASURES
+
+# 建表语句（与 plan/16_create_summary_tables.sql 一致）
+CREATE_COUNTY_GROWTH_METRICS = """
+    CREATE TABLE IF NOT EXISTS county_growth_metrics (
+        CountyCode CHAR(6) NOT NULL COMMENT '县域代码',
+        Metric VARCHAR(20) NOT NULL COMMENT '指标：GDP/Income/Fiscal',
+        Province VARCHAR(50) COMMENT '所属省份',
+        Region VARCHAR(20) COMMENT '所属地域',
+        ExitYear INT COMMENT '摘帽年份',
+        StartYear INT COMMENT '最早有数据的年份',
+        StartValue DECIMAL(15, 2) COMMENT '最早年份数值',
+        AnchorYear INT COMMENT '摘帽后（含摘帽当年）首个有数据的年份',
+        AnchorValue DECIMAL(15, 2) COMMENT '摘帽基准年份数值',
+        LatestYear INT COMMENT '最新有数据的年份',
+        LatestValue DECIMAL(15, 2) COMMENT '最新年份数值',
+        PostExitGrowth DOUBLE COMMENT '摘帽后增长率(%)：基准年到最新年',
+        PostExitCAGR DOUBLE COMMENT '摘帽后年均复合增长率(%)',
+        PreExitGrowth DOUBLE COMMENT '摘帽前增长率(%)：最早年到基准年',
+        PreExitCAGR DOUBLE COMMENT '摘帽前年均复合增长率(%)',
+        PRIMARY KEY (CountyCode, Metric),
+        INDEX idx_post_growth (Metric, PostExitGrowth),
+        INDEX idx_post_cagr (Metric, PostExitCAGR),
+        INDEX idx_pre_growth (Metric, PreExitGrowth),
+        INDEX idx_pre_cagr (Metric, PreExitCAGR),
+        FOREIGN KEY (CountyCode) REFERENCES county(CountyCode) ON DELETE CASCADE
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='县域增长指标表'
+"""
+
+
+def _growth(start, end):
+    """区间增长率(%)，起点非正时为空"""
+    return ((end - start) / start * 100).where(start > 0)
+
+
+def _cagr(start, end, years):
+    """年均复合增长率(%)，起点或终点非正、或区间不足一年时为空"""
+    valid = (start > 0) & (end > 0) & (years > 0)
+    ratio = (end / start).where(valid)
+    return (np.power(ratio, 1 / years.where(valid)) - 1) * 100
+
+
+def growth_metrics_frame(economy, counties):
+    """
+    economy: CountyCode, Year 及 GROWTH_METRICS 中的列；counties: CountyCode, Province, Region, ExitYear。
+    先转为 (县, 指标, 年份) 长表并去掉空值，再按组取首/末行，全程无逐县循环
+    """
+    long = economy.melt(
+        id_vars=['CountyCode', 'Year'], value_vars=list(GROWTH_METRICS.values()),
+        var_name='Column', value_name='Value'
+    ).dropna(subset=['Value'])
+    long['Metric'] = long['Column'].map({column: metric for metric, column in GROWTH_METRICS.items()})
+    long = long.merge(counties[['CountyCode', 'ExitYear']], on='CountyCode', how='inner')
+    long = long.sort_values(['CountyCode', 'Metric', 'Year'])[['CountyCode', 'Metric', 'Year', 'Value', 'ExitYear']]
+
+    keys = ['CountyCode', 'Metric']
+    grouped = long.groupby(keys, sort=False)
+    start = grouped[['Year', 'Value']].first().rename(columns={'Year': 'StartYear', 'Value': 'StartValue'})
+    latest = grouped[['Year', 'Value']].last().rename(columns={'Year': 'LatestYear', 'Value': 'LatestValue'})
+    anchor = (
+        long[long['Year'] >= long['ExitYear']]
+        .groupby(keys, sort=False)[['Year', 'Value']].first()
+        .rename(columns={'Year': 'AnchorYear', 'Value': 'AnchorValue'})
+    )
+    result = start.join(latest).join(anchor, how='left').reset_index()
+
+    post_years = (result['LatestYear'] - result['AnchorYear']).where(result['LatestYear'] > result['AnchorYear'])
+    pre_years = (result['AnchorYear'] - result['StartYear']).where(result['AnchorYear'] > result['StartYear'])
+    result['PostExitGrowth'] = _growth(result['AnchorValue'], result['LatestValue']).where(post_years.notna())
+    result['PostExitCAGR'] = _cagr(result['AnchorValue'], result['LatestValue'], post_years)
+    result['PreExitGrowth'] = _growth(result['StartValue'], result['AnchorValue']).where(pre_years.notna())
+    result['PreExitCAGR'] = _cagr(result['StartValue'], result['AnchorValue'], pre_years)
+
+    result = result.merge(counties, on='CountyCode', how='left')
+    return result[COUNTY_GROWTH_METRICS_COLUMNS]
+
+
+def refresh_county_growth_metrics(conn):
+    """
+    从 county_economy、poverty_counties 全量重建 county_growth_metrics，返回行数。
+    只执行DML（表由 ensure_summary_tables 创建），在调用方的事务中完成
+    """
+    columns = ', '.join(GROWTH_METRICS.values())
+    economy = fetch_frame(conn, f"SELECT CountyCode, Year, {columns} FROM county_economy")
+    counties = fetch_frame(conn, "SELECT CountyCode, Province, Region, ExitYear FROM poverty_counties")
+    for column in GROWTH_METRICS.values():
+        economy[column] = pd.to_numeric(economy[column])
+    counties['ExitYear'] = pd.to_numeric(counties['ExitYear'])
+
+    frame = growth_metrics_frame(economy, counties)
+    frame = frame.replace([np.inf, -np.inf], np.nan)
+    frame = frame.astype(object).where(frame.notna(), None)
+    rows = [tuple(row) for row in frame.itertuples(index=False, name=None)]
+
+    cursor = conn.cursor()
+    try:
+        cursor.execute("DELETE FROM county_growth_metrics")
+        if rows:
+            placeholders = ', '.join(['%s'] * len(COUNTY_GROWTH_METRICS_COLUMNS))
+            cursor.executemany(
+                f"INSERT INTO county_growth_metrics ({', '.join(COUNTY_GROWTH_METRICS_COLUMNS)}) VALUES ({placeholders})",
+                rows
+            )
+        return len(rows)
+    finally:
+        cursor.close()
@@ -3,14 +3,41 @@
 """
 832工程数据库初始化脚本
 将CSV数据导入MySQL数据库
+
+各表的导入分两步：先用pandas对整列做向量化清洗得到与表结构一致的DataFrame，
+再由 upsert_frame 按批 executemany 多行写入（INSERT ... ON DUPLICATE KEY UPDATE），每批提交一次。
+--incremental 模式下先与上次写入的行指纹比较，只写入新增或变化的行；
+--memory-budget 模式下按块读取CSV，逐块清洗写入，峰值内存与文件大小无关。
 """
 
+import argparse
+import hashlib
+import multiprocessing
+import os
+import queue
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from functools import reduce
 import pandas as pd
 import pymysql
 import numpy as np
 from pathlib import Path
 import sys
 
+# 汇总表的维护逻辑与API共用
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from backend.summaries import ensure_summary_tables, refresh_summaries
+from backend.growth_metrics import refresh_county_growth_metrics
+from backend.region_cube import refresh_region_cube
+from backend.cache import bump_data_versions
+
+try:
+    import pyarrow.feather as feather
+except ImportError:  # 未安装pyarrow时不使用列式暂存缓存，直接解析CSV
+    feather = None
+
 # 数据库配置
 DB_CONFIG = {
     'host': 'localhost',
@@ -23,41 +50,1043 @@ DB_CONFIG = {
 # 数据目录路径（相对于脚本所在位置，向上两级到项目根目录）
 DATA_DIR = Path(__file__).parent.parent / 'data'
 
+# 每批写入的行数（可通过 --batch-size 修改）
+BATCH_SIZE = 1000
+
+# 各表主键列：写入冲突时只更新非主键列
+TABLE_KEYS = {
+    'county': ['CountyCode'],
+    'county_nature': ['CountyCode'],
+    'county_economy': ['CountyCode', 'Year'],
+    'county_agriculture': ['CountyCode', 'Year'],
+    'county_population': ['CountyCode', 'Year'],
+    'county_healthcare': ['CountyCode', 'Year'],
+    'poverty_counties': ['CountyCode'],
+    'agricultural_output': ['CountyCode', 'Year', 'ProductType'],
+    'crop_area': ['CountyCode', 'Year', 'CropType'],
+    'finance_budget': ['CountyCode', 'Year', 'Project'],
+    'transport_post': ['CountyCode', 'Year'],
+    'financial_services': ['CountyCode', 'Year'],
+    'surveyors': ['SurveyorID'],
+    'interviews': ['InterviewID'],
+}
+
+# CSV中表示缺失值的占位符
+MISSING_MARKERS = ['', '—']
+
+# --fast 模式：这些大表先写出暂存TSV，再 LOAD DATA LOCAL INFILE 到暂存表并一次性合并
+FAST_LOAD = False
+FAST_LOAD_TABLES = {
+    'county_economy', 'county_agriculture', 'county_population',
+    'crop_area', 'agricultural_output', 'financial_services',
+}
+
+
+# 各数据文件在导入中用到的列：(按字符串读取的列, 数值列)。
+# 读取时只解析这些列（不存在的候选列名自动忽略），同一文件在一次导入中只解析一次
+SOURCE_COLUMNS = {
+    'county_profile.csv': (
+        ['CountyCode', '地区名称', '所属省份', '所属城市'],
+        ['年份', '经度', '纬度', '行政区域土地面积(平方公里)', '乡及镇个数(个)', '乡个数(个)',
+         '地区生产总值(万元)\n—来源公众号【马克数据网】', '地区生产总值(万元)',
+         '第一产业增加值(万元)', '第二产业增加值(万元)', '第三产业增加值(万元)',
+         '人均地区生产总值(元/人)', '城镇单位在岗职工平均工资(元)',
+         '农村居民人均可支配收入(元)\n—来源公众号【马克数据网】', '农村居民人均可支配收入(元)',
+         '地方财政一般预算收入(万元)', '地方财政一般预算支出(万元)',
+         '城乡居民储蓄存款余额(万元)', '年末金融机构各项贷款余额(万元)',
+         '规模以上工业总产值(万元)', '规模以上工业企业数(个)',
+         '全社会固定资产投资(万元)', '社会消费品零售总额(万元)',
+         '农作物总播种面积(千公顷)', '农用机械总动力(千万瓦)', '粮食总产量(吨)', '棉花产量(吨)',
+         '油料产量(吨)', '肉类总产量(吨)', '农林牧渔业总产值(万元)',
+         '乡村从业人员数(人)', '农林牧渔业从业人员数(人)',
+         '户籍人口数(万人)', '普通小学专任教师数(人)', '普通中学专任教师数(人)',
+         '普通小学在校生数(人)', '普通中学在校学生数(人)',
+         '医院、卫生院床位数(床)', '医院和卫生院卫生人员数_卫生技术人员(人)',
+         '各种社会福利收养性单位数(个)', '各种社会福利收养性单位床位数(床)'],
+    ),
+    'county_relief.csv': (['行政区划代码'], ['地区等级', '地形起伏度', '经度', '纬度']),
+    'poverty_county_list.csv': (['行政区划代码', '县域名称', '所属地域', '所属省份', '所属城市'], ['摘帽时间']),
+    'county_agri_output.csv': (['县域代码', '产品种类或名称', '单位'], ['统计年度', '产量']),
+    'county_crop_area.csv': (['县域代码', '农作物种类或名称'], ['统计年度', '播种面积-公顷']),
+    'county_finance_budget_raw.csv': (['CountyCode', 'Project'], ['SgnYear', 'FinRevenue']),
+    'county_transport_post.csv': (
+        ['CountyCode', 'CountyName', 'PrefLevCity', 'Province'],
+        ['SgnYear', 'year', 'HighwayLength', 'PostTelBusinessVolume', 'FixedPhoneNum', 'MobileUserNum'],
+    ),
+    'county_financial_services.csv': (
+        ['CountyCode', 'CountyName', 'PrefLevCity', 'Province'],
+        ['SgnYear', 'year', 'Loan', 'Deposit', 'SavingsDeposit'],
+    ),
+    'county_gdp.csv': (
+        ['CountyCode', 'CountyName', 'PrefLevCity', 'Province'],
+        ['year', 'SgnYear', 'RegGDP', 'RegGDP_Primary', 'RegGDP_Secondary', 'RegGDP_Tertiary', 'PerRegGDP'],
+    ),
+    'county_income.csv': (
+        ['CountyCode', 'CountyName', 'PrefLevCity', 'Province'],
+        ['SgnYear', 'year', 'UrbPerDisposableInc', 'RurPerNetInc', 'RurPerDisposableInc'],
+    ),
+    'county_population.csv': (
+        ['CountyCode', 'CountyName', 'PrefLevCity', 'Province'],
+        ['SgnYear', 'year', 'PopNum'],
+    ),
+    'surveyors.csv': (
+        ['调研员ID', '姓名', '性别', '所属院系', '学历', '专业方向', '联系电话', '电子邮箱', '所属分队ID',
+         '负责县域ID', '调研角色', '参与调研批次', '调研开始时间', '调研结束时间',
+         '调研专长', '培训完成状态', '设备领用状态', '备注'],
+        ['已完成访谈次数', '待补访次数'],
+    ),
+    'interviews.csv': (
+        ['访谈记录id', '调研人id', '县id', '访谈对象id', '受访人姓名', '受访人信息',
+         '访谈内容', '访谈时间', '访谈地点'],
+        ['访谈质量'],
+    ),
+}
+
+# 县域面板文件（每行一个县一年）：年份列的名称变体
+PANEL_YEAR_COLUMNS = ('SgnYear', 'year', 'Year')
+
+# 各面板文件映射到表列的指标：{表列: (候选源列, 换算系数)}。
+# 多个候选源列逐行取第一个非空值（兼容列名变体，并可指定备用指标）
+ECONOMY_PANELS = {
+    'county_gdp.csv': {
+        'GDP': (('RegGDP',), 1),
+        'GDP_Primary': (('RegGDP_Primary',), 1),
+        'GDP_Secondary': (('RegGDP_Secondary',), 1),
+        'GDP_Tertiary': (('RegGDP_Tertiary',), 1),
+        'PerCapitaGDP': (('PerRegGDP',), 10000),  # 万元/人 -> 元/人
+    },
+    'county_income.csv': {
+        # 2013年后统计口径改为可支配收入，之前年份只有纯收入
+        'RuralDisposableIncome': (('RurPerDisposableInc', 'RurPerNetInc'), 1),
+    },
+    'county_financial_services.csv': {
+        'SavingsDeposit': (('SavingsDeposit',), 10000),  # 亿元 -> 万元
+        'LoanBalance': (('Loan',), 10000),
+    },
+}
+POPULATION_PANELS = {
+    'county_population.csv': {
+        'RegisteredPopulation': (('PopNum',), 1),
+    },
+}
+
+# 提供县名称、省份、地市的面板文件（county_profile.csv 缺失或未覆盖的县用这些信息补全）
+COUNTY_NAME_PANELS = [
+    'county_gdp.csv', 'county_income.csv', 'county_population.csv',
+    'county_financial_services.csv', 'county_transport_post.csv',
+]
+
+# 数据来自多个面板文件的表：面板中缺失的值不覆盖表中已有的值
+COALESCE_TABLES = {'county_economy', 'county_population'}
+
+# 已解析的数据文件，导入期间由各导入函数共享
+_source_cache = {}
+
+# 列式暂存缓存：每个CSV按需要的列解析、定型后存为Feather(Arrow IPC)文件，
+# 以源文件内容哈希为键；源文件或 SOURCE_COLUMNS 不变时直接内存映射读取，不再解析CSV
+STAGING_DIR = DATA_DIR / '.staging'
+STAGING_VERSION = 1
+USE_STAGING = True
+
+# --incremental 模式：按行指纹只写入新增或变化的行；DELETE_MISSING 时同时删除CSV中已不存在的行
+INCREMENTAL = False
+DELETE_MISSING = False
+
+# 流式导入（--memory-budget MB）：按块读取CSV、逐块清洗写入，峰值内存受预算约束。
+# 一块从解析到写入的内存约为其原始列内存的 STREAM_MEMORY_FACTOR 倍（清洗后的列、executemany参数元组），
+# 同时在内存中的块：正在写入的、队列中的 STREAM_PREFETCH 个、正在解析的
+MEMORY_BUDGET = None
+STREAM_MEMORY_FACTOR = 4
+STREAM_PREFETCH = 1
+STREAM_SAMPLE_ROWS = 2000
+
+# --shadow 模式：各县事实表先导入影子表（<表名>__new，导入后再建二级索引），
+# 全部成功后用一条 RENAME TABLE 原子切换，导入期间线上表不受影响。
+# county、surveyors 被外键引用（改名时引用方的外键会跟随到旧表），interviews 带触发器，这三张表仍原地写入
+SHADOW = False
+SHADOW_TABLES = {
+    'county_nature', 'county_economy', 'county_agriculture', 'county_population',
+    'county_healthcare', 'poverty_counties', 'agricultural_output', 'crop_area',
+    'finance_budget', 'transport_post', 'financial_services',
+}
+SHADOW_SUFFIX = '__new'
+RETIRED_SUFFIX = '__old'
+
+# --bulk 模式：导入连接关闭外键与唯一性检查、暂停访谈触发器（@skip_interview_triggers），
+# 原地写入的表导入前去掉二级索引、导入后一次性重建；全部导入后做一次外键校验并按集合重算调研员完成次数
+BULK = False
+BULK_SESSION_SQL = "SET SESSION foreign_key_checks = 0, unique_checks = 0, @skip_interview_triggers = 1"
+
 
 def get_db_connection():
-    """获取数据库连接"""
-    return pymysql.connect(**DB_CONFIG)
+    """获取数据库连接（--fast 模式需要允许 LOCAL INFILE，--bulk 模式设置批量导入会话）"""
+    return pymysql.connect(**DB_CONFIG, local_infile=FAST_LOAD,
+                           init_command=BULK_SESSION_SQL if BULK else None)
 
 
-def clean_value(val):
-    """清洗数据值，处理NaN和空值"""
-    if pd.isna(val) or val == '' or val == '—' or str(val).strip() == '':
-        return None
-    return val
+def target_table(table):
+    """实际写入的表名：--shadow 模式下为影子表"""
+    if SHADOW and table in SHADOW_TABLES:
+        return table + SHADOW_SUFFIX
+    return table
 
 
-def to_float64(val):
-    """转换为float64，处理NaN"""
-    if pd.isna(val) or val == '' or val == '—':
-        return None
+# ---------------------------------------------------------------------------
+# 向量化清洗：对整列操作，缺失值统一为NaN/NA，写入前再转换为None
+# ---------------------------------------------------------------------------
+
+def column(df, *possible_names):
+    """按候选列名取列，都不存在时返回全空列"""
+    for name in possible_names:
+        if name in df.columns:
+            return df[name]
+    return pd.Series(np.nan, index=df.index, dtype=object)
+
+
+def clean_text(series):
+    """清洗文本列：NaN、空串、'—' 及纯空白统一为缺失"""
+    values = series.astype(object)
+    missing = values.isna() | values.astype(str).str.strip().isin(MISSING_MARKERS)
+    return values.where(~missing)
+
+
+def clean_float(series):
+    """转换为float64，无法解析的值为NaN"""
+    return pd.to_numeric(series, errors='coerce').astype('float64')
+
+
+def clean_int(series):
+    """转换为可空整数（向零截断，与 int(float(val)) 一致）"""
+    return np.trunc(clean_float(series)).astype('Int64')
+
+
+def clean_code(series):
+    """规范化县代码为6位字符串（兼容 130631.0 这类被读成浮点的代码）"""
+    text = clean_text(series).astype(str).str.strip()
+    numeric = pd.to_numeric(text, errors='coerce')
+    as_int = numeric.round().astype('Int64').astype(str)
+    fallback = text.str.replace('.0', '', regex=False).str.replace('.', '', regex=False)
+    codes = as_int.where(numeric.notna(), fallback).str.zfill(6).str[:6]
+    return codes.where(clean_text(series).notna())
+
+
+def clean_date(series):
+    """转换为日期，无法解析的值为缺失"""
+    return pd.to_datetime(series, errors='coerce').dt.date
+
+
+def parse_source(filename, **kwargs):
+    """
+    解析CSV：按 SOURCE_COLUMNS 只解析需要的列并指定类型，
+    代码与文本列按字符串读取，数值列直接解析为float64（'—' 视为缺失）。
+    kwargs 透传给 read_csv（如 chunksize、nrows）
+    """
+    text_columns, numeric_columns = SOURCE_COLUMNS[filename]
+    wanted = set(text_columns) | set(numeric_columns)
+    return pd.read_csv(
+        DATA_DIR / filename,
+        usecols=lambda name: name in wanted,
+        dtype={name: str for name in text_columns},
+        na_values=MISSING_MARKERS,
+        low_memory=False,
+        **kwargs,
+    )
+
+
+def staging_path(filename):
+    """数据文件对应的暂存文件路径，由源文件内容、列定义和暂存格式版本的哈希决定"""
+    digest = hashlib.sha256()
+    digest.update(f"{STAGING_VERSION}:{SOURCE_COLUMNS[filename]!r}".encode('utf-8'))
+    with open(DATA_DIR / filename, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return STAGING_DIR / f"{Path(filename).stem}.{digest.hexdigest()[:16]}.feather"
+
+
+def write_staging(filename, df, path):
+    """写入暂存文件，并清理同一数据文件的旧版本"""
+    STAGING_DIR.mkdir(parents=True, exist_ok=True)
+    for old in STAGING_DIR.glob(f"{Path(filename).stem}.*.feather"):
+        if old != path:
+            old.unlink(missing_ok=True)
+    # 并行导入时多个进程可能同时写同一个暂存文件，各自写临时文件后原子替换
+    tmp_path = path.with_suffix(f'.{os.getpid()}.tmp')
+    feather.write_feather(df.reset_index(drop=True), tmp_path, compression='uncompressed')
+    os.replace(tmp_path, path)
+
+
+def load_source(filename):
+    """
+    读取 data/ 下的数据文件。有对应的暂存文件时内存映射读取，否则解析CSV并写入暂存文件。
+    每个文件只读取一次，返回的DataFrame由各导入函数共享，调用方不得原地修改。
+    """
+    if filename in _source_cache:
+        return _source_cache[filename]
+
+    path = staging_path(filename) if (USE_STAGING and feather is not None) else None
+    if path is not None and path.exists():
+        df = feather.read_table(path, memory_map=True).to_pandas()
+    else:
+        df = parse_source(filename)
+        if path is not None:
+            try:
+                write_staging(filename, df, path)
+            except Exception as e:
+                print(f"  写入暂存文件失败 ({filename}): {e}")
+    _source_cache[filename] = df
+    return df
+
+
+def read_code_column(filename, colname):
+    """只读取县代码一列；优先复用已解析的数据或暂存文件。列不存在时返回None"""
+    cached = _source_cache.get(filename)
+    if cached is not None and colname in cached.columns:
+        return cached[colname]
+    if USE_STAGING and feather is not None and filename in SOURCE_COLUMNS:
+        path = staging_path(filename)
+        if path.exists():
+            table = feather.read_table(path, memory_map=True)
+            if colname in table.column_names:
+                return table.select([colname]).to_pandas()[colname]
+    if MEMORY_BUDGET:
+        # 流式模式下按块读取，只保留去重后的代码
+        reader = pd.read_csv(DATA_DIR / filename, usecols=lambda name: name == colname, dtype=str,
+                             chunksize=stream_chunk_rows(filename))
+        chunks = [chunk[colname].drop_duplicates() for chunk in reader if colname in chunk.columns]
+        return pd.concat(chunks, ignore_index=True) if chunks else None
+    df = pd.read_csv(DATA_DIR / filename, usecols=lambda name: name == colname, dtype=str)
+    return df[colname] if colname in df.columns else None
+
+
+def clear_source_cache():
+    """释放已解析的数据文件"""
+    _source_cache.clear()
+
+
+def preload_sources():
+    """
+    并行导入前在主进程中读取全部数据文件（没有暂存文件时解析CSV并写入暂存文件），返回读取的文件列表。
+    worker 以 fork 方式启动时直接继承已解析的 DataFrame；不支持 fork 的平台上 worker 从暂存文件
+    内存映射读取，每个CSV仍只解析一次（未安装 pyarrow 或 --no-staging 时除外）
+    """
+    loaded = [filename for filename in SOURCE_COLUMNS if source_exists(filename)]
+    for filename in loaded:
+        load_source(filename)
+    return loaded
+
+
+def worker_context():
+    """导入worker的进程启动方式：优先 fork，继承主进程已解析的数据文件"""
+    if 'fork' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('fork')
+    return None
+
+
+def stream_chunk_rows(filename):
+    """按内存预算估算每块行数：先解析少量样本行测得每行内存，至少为一批写入的行数"""
+    if filename in SOURCE_COLUMNS:
+        sample = parse_source(filename, nrows=STREAM_SAMPLE_ROWS)
+    else:
+        sample = pd.read_csv(DATA_DIR / filename, dtype=str, nrows=STREAM_SAMPLE_ROWS)
+    row_bytes = sample.memory_usage(deep=True).sum() / max(len(sample), 1)
+    chunks_in_memory = STREAM_PREFETCH + 2
+    rows = int(MEMORY_BUDGET * 1024 * 1024 / (row_bytes * STREAM_MEMORY_FACTOR * chunks_in_memory))
+    return max(rows, BATCH_SIZE)
+
+
+def prefetch(iterable, depth=1):
+    """
+    在后台线程中提前生成后续项（CSV解析、清洗与数据库写入重叠进行），
+    最多预先生成 depth 项。消费方提前结束时后台线程随之停止。
+    """
+    items = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+    done = object()
+
+    def put(item):
+        while not stop.is_set():
+            try:
+                items.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for item in iterable:
+                if not put((item, None)):
+                    return
+            put((done, None))
+        except BaseException as e:
+            put((done, e))
+
+    worker = threading.Thread(target=produce, daemon=True)
+    worker.start()
     try:
-        return float(val)
-    except (ValueError, TypeError):
-        return None
+        while True:
+            item, error = items.get()
+            if item is done:
+                if error is not None:
+                    raise error
+                return
+            yield item
+    finally:
+        stop.set()
+        worker.join()
 
 
-def to_int(val):
-    """转换为int，处理NaN"""
-    if pd.isna(val) or val == '' or val == '—':
-        return None
+def to_records(frame):
+    """DataFrame 转为 executemany 参数：Python 原生类型的元组，缺失值为 None"""
+    columns = []
+    for name in frame.columns:
+        values = frame[name]
+        columns.append(values.astype(object).where(values.notna(), None).tolist())
+    return list(zip(*columns))
+
+
+# ---------------------------------------------------------------------------
+# 批量写入
+# ---------------------------------------------------------------------------
+
+def update_clause(table, columns):
+    """ON DUPLICATE KEY UPDATE 子句：COALESCE_TABLES 中的表只用非空值更新"""
+    keys = TABLE_KEYS[table]
+    if table in COALESCE_TABLES:
+        return ', '.join(f"{col}=COALESCE(VALUES({col}), {col})" for col in columns if col not in keys)
+    return ', '.join(f"{col}=VALUES({col})" for col in columns if col not in keys)
+
+
+def build_upsert_sql(table, columns, ignore=False):
+    """生成单行占位的 INSERT 语句，executemany 会将其改写为多行 VALUES"""
+    column_list = ', '.join(columns)
+    placeholders = ', '.join(['%s'] * len(columns))
+    target = target_table(table)
+    if ignore:
+        return f"INSERT IGNORE INTO {target} ({column_list}) VALUES ({placeholders})"
+    updates = update_clause(table, columns)
+    return f"INSERT INTO {target} ({column_list}) VALUES ({placeholders}) ON DUPLICATE KEY UPDATE {updates}"
+
+
+def upsert_frame(conn, table, frame, batch_size=None, ignore=False):
+    """
+    将清洗好的DataFrame（列名即表列名）分批写入，每批一次 executemany、一次提交。
+    某批写入失败时回滚该批并逐行重试，以定位并跳过问题行。
+    返回 (写入行数, 失败行数)。
+    """
+    batch_size = batch_size or BATCH_SIZE
+    columns = list(frame.columns)
+    sql = build_upsert_sql(table, columns, ignore=ignore)
+    key_positions = [columns.index(key) for key in TABLE_KEYS[table] if key in columns]
+    records = to_records(frame)
+
+    cursor = conn.cursor()
+    written = 0
+    failed = 0
+    try:
+        for start in range(0, len(records), batch_size):
+            batch = records[start:start + batch_size]
+            try:
+                cursor.executemany(sql, batch)
+                conn.commit()
+                written += len(batch)
+                continue
+            except Exception:
+                conn.rollback()
+
+            for record in batch:
+                try:
+                    cursor.execute(sql, record)
+                    written += 1
+                except Exception as e:
+                    failed += 1
+                    if failed <= 5:
+                        key = ', '.join(str(record[i]) for i in key_positions)
+                        print(f"导入{table}表错误 ({key}): {e}")
+            conn.commit()
+    finally:
+        cursor.close()
+    return written, failed
+
+
+def write_staging_tsv(frame, path):
+    """
+    将清洗好的DataFrame写为 LOAD DATA 默认格式的TSV：
+    制表符分隔、换行结尾、缺失值为 \\N，文本中的反斜杠/制表符/换行按MySQL规则转义。
+    """
+    columns = []
+    for name in frame.columns:
+        values = frame[name]
+        text = values.astype(object).where(values.notna(), '').astype(str)
+        if not pd.api.types.is_numeric_dtype(values):
+            text = (text.str.replace('\\', '\\\\', regex=False)
+                        .str.replace('\t', '\\t', regex=False)
+                        .str.replace('\n', '\\n', regex=False)
+                        .str.replace('\r', '\\r', regex=False))
+        columns.append(text.where(values.notna(), '\\N'))
+    lines = columns[0].str.cat(columns[1:], sep='\t') if len(columns) > 1 else columns[0]
+    with open(path, 'w', encoding='utf-8', newline='\n') as f:
+        if len(lines):
+            f.write('\n'.join(lines))
+            f.write('\n')
+
+
+def load_frame_fast(conn, table, frame):
+    """
+    LOAD DATA LOCAL INFILE 快速路径：暂存TSV -> 临时暂存表 -> 一条
+    INSERT ... SELECT ... ON DUPLICATE KEY UPDATE 合并到目标表，整表一个事务。
+    返回 (写入行数, 失败行数)。
+    """
+    columns = list(frame.columns)
+    column_list = ', '.join(columns)
+    updates = update_clause(table, columns)
+    staging = f"staging_{table}"
+
+    fd, path = tempfile.mkstemp(prefix=f'{table}_', suffix='.tsv')
+    os.close(fd)
+    cursor = conn.cursor()
     try:
-        return int(float(val))
-    except (ValueError, TypeError):
+        write_staging_tsv(frame, path)
+        cursor.execute(f"DROP TEMPORARY TABLE IF EXISTS {staging}")
+        # 不带索引的暂存表，装载时无需维护任何索引
+        cursor.execute(f"CREATE TEMPORARY TABLE {staging} AS SELECT {column_list} FROM {table} WHERE 1=0")
+        cursor.execute(
+            f"LOAD DATA LOCAL INFILE %s INTO TABLE {staging} CHARACTER SET utf8mb4 "
+            f"FIELDS TERMINATED BY '\\t' LINES TERMINATED BY '\\n' ({column_list})",
+            (path,)
+        )
+        loaded = cursor.rowcount
+        cursor.execute(
+            f"INSERT INTO {target_table(table)} ({column_list}) SELECT {column_list} FROM {staging} "
+            f"ON DUPLICATE KEY UPDATE {updates}"
+        )
+        conn.commit()
+        return loaded, len(frame) - loaded
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        try:
+            cursor.execute(f"DROP TEMPORARY TABLE IF EXISTS {staging}")
+        except Exception:
+            pass
+        cursor.close()
+        os.remove(path)
+
+
+def write_frame_full(conn, table, frame):
+    """全量写入：--fast 模式下大表走 LOAD DATA，失败时回退到批量 upsert"""
+    if FAST_LOAD and table in FAST_LOAD_TABLES:
+        try:
+            return load_frame_fast(conn, table, frame)
+        except Exception as e:
+            print(f"  LOAD DATA 快速导入{table}失败，改用批量写入（需服务器开启 local_infile）: {e}")
+    return upsert_frame(conn, table, frame)
+
+
+def write_frame(conn, table, frame):
+    """写入清洗好的DataFrame：--incremental 模式下只写入新增/变化的行，否则全量写入"""
+    if INCREMENTAL:
+        return write_frame_incremental(conn, table, frame)
+    return write_frame_full(conn, table, frame)
+
+
+# ---------------------------------------------------------------------------
+# 增量导入：import_fingerprints 表记录每个 (表, 主键) 上次写入时的内容哈希，
+# 再次导入时只写入哈希不同或新出现的行
+# ---------------------------------------------------------------------------
+
+def ensure_fingerprint_table(conn):
+    """创建行指纹表（不存在时）"""
+    cursor = conn.cursor()
+    try:
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS import_fingerprints (
+                TableName VARCHAR(64) NOT NULL COMMENT '表名',
+                RowKey VARCHAR(255) NOT NULL COMMENT '主键值，多列以|连接',
+                RowHash CHAR(16) NOT NULL COMMENT '行内容哈希',
+                PRIMARY KEY (TableName, RowKey)
+            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='增量导入行指纹'
+        """)
+        conn.commit()
+    finally:
+        cursor.close()
+
+
+def row_keys(frame, keys):
+    """主键列拼接为字符串（多列以|连接）"""
+    parts = [frame[key].astype(str) for key in keys]
+    return parts[0].str.cat(parts[1:], sep='|') if len(parts) > 1 else parts[0]
+
+
+def row_hashes(frame):
+    """整行内容的64位哈希（向量化计算），以16位十六进制字符串表示"""
+    hashes = pd.util.hash_pandas_object(frame, index=False).to_numpy()
+    return pd.Series([format(h, '016x') for h in hashes], index=frame.index, dtype=object)
+
+
+def fetch_fingerprints(conn, table):
+    """该表已记录的行指纹，RowKey 为索引的Series"""
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT RowKey, RowHash FROM import_fingerprints WHERE TableName = %s", (table,))
+        rows = cursor.fetchall()
+    finally:
+        cursor.close()
+    return pd.Series([row[1] for row in rows], index=[row[0] for row in rows], dtype=object)
+
+
+def diff_frame(table, frame, stored):
+    """
+    比较待写入的DataFrame与已记录的指纹（stored），返回
+    (需写入的行, 需写入行的指纹, {'inserted','changed','unchanged'} 行数, 本次出现的主键)。
+    同一主键出现多次时以最后一行为准（与 upsert 的结果一致）。
+    """
+    keys = TABLE_KEYS[table]
+    frame = frame.drop_duplicates(subset=keys, keep='last')
+    incoming = pd.DataFrame({'RowKey': row_keys(frame, keys), 'RowHash': row_hashes(frame)})
+
+    previous = incoming['RowKey'].map(stored)
+    is_new = previous.isna()
+    is_changed = ~is_new & (previous != incoming['RowHash'])
+    to_write = is_new | is_changed
+    counts = {
+        'inserted': int(is_new.sum()),
+        'changed': int(is_changed.sum()),
+        'unchanged': int((~to_write).sum()),
+    }
+    return frame[to_write], incoming[to_write], counts, incoming['RowKey']
+
+
+def delete_rows(conn, table, row_keys_list, batch_size=None):
+    """按主键删除行及其指纹，返回删除的行数"""
+    batch_size = batch_size or BATCH_SIZE
+    keys = TABLE_KEYS[table]
+    key_tuple = f"({', '.join(keys)})"
+    row_placeholder = f"({', '.join(['%s'] * len(keys))})"
+    cursor = conn.cursor()
+    deleted = 0
+    try:
+        for start in range(0, len(row_keys_list), batch_size):
+            batch = row_keys_list[start:start + batch_size]
+            params = [value for row_key in batch for value in row_key.split('|', len(keys) - 1)]
+            cursor.execute(
+                f"DELETE FROM {table} WHERE {key_tuple} IN ({', '.join([row_placeholder] * len(batch))})",
+                params
+            )
+            deleted += cursor.rowcount
+            cursor.execute(
+                f"DELETE FROM import_fingerprints WHERE TableName = %s "
+                f"AND RowKey IN ({', '.join(['%s'] * len(batch))})",
+                [table] + batch
+            )
+            conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+    return deleted
+
+
+def save_fingerprints(conn, table, fingerprints, batch_size=None):
+    """记录写入成功的行指纹"""
+    batch_size = batch_size or BATCH_SIZE
+    sql = ("INSERT INTO import_fingerprints (TableName, RowKey, RowHash) VALUES (%s, %s, %s) "
+           "ON DUPLICATE KEY UPDATE RowHash=VALUES(RowHash)")
+    records = [(table, key, digest) for key, digest in
+               zip(fingerprints['RowKey'].tolist(), fingerprints['RowHash'].tolist())]
+    cursor = conn.cursor()
+    try:
+        for start in range(0, len(records), batch_size):
+            cursor.executemany(sql, records[start:start + batch_size])
+            conn.commit()
+    finally:
+        cursor.close()
+
+
+class DeltaTracker:
+    """一张表的增量写入状态：已记录的指纹、累计的变化行数及CSV中未再出现的主键"""
+
+    def __init__(self, conn, table):
+        ensure_fingerprint_table(conn)
+        self.table = table
+        self.stored = fetch_fingerprints(conn, table)
+        self.missing = set(self.stored.index)
+        self.counts = {'inserted': 0, 'changed': 0, 'unchanged': 0}
+
+    def write(self, conn, frame):
+        """
+        只写入新增或内容变化的行，返回 (写入行数, 失败行数)。
+        有写入失败的行时不更新指纹，下次增量导入会重新尝试这些行。
+        """
+        changed, fingerprints, counts, seen = diff_frame(self.table, frame, self.stored)
+        for key, value in counts.items():
+            self.counts[key] += value
+        self.missing.difference_update(seen)
+
+        written, failed = write_frame_full(conn, self.table, changed) if len(changed) else (0, 0)
+        if failed == 0:
+            save_fingerprints(conn, self.table, fingerprints)
+        return written, failed
+
+    def finish(self, conn):
+        """打印变化汇总；--delete-missing 时删除CSV中已不存在的行"""
+        counts = self.counts
+        print(f"  {self.table} 增量: 新增 {counts['inserted']}，变化 {counts['changed']}，"
+              f"未变 {counts['unchanged']}，CSV中已不存在 {len(self.missing)}")
+        if self.missing and DELETE_MISSING:
+            if self.table == 'county':
+                # 删除县会级联删除其全部事实数据，不在增量删除范围内
+                print("  county表不执行删除")
+            else:
+                deleted = delete_rows(conn, self.table, sorted(self.missing))
+                print(f"  {self.table} 删除 {deleted} 条")
+
+
+def write_frame_incremental(conn, table, frame):
+    """增量写入整张表的DataFrame，返回 (写入行数, 失败行数)"""
+    tracker = DeltaTracker(conn, table)
+    written, failed = tracker.write(conn, frame)
+    tracker.finish(conn)
+    return written, failed
+
+
+# ---------------------------------------------------------------------------
+# 影子表：导入到 <表名>__new，建好索引和外键后与线上表一次性原子切换
+# ---------------------------------------------------------------------------
+
+def fetch_secondary_indexes(conn, table):
+    """线上表的二级索引定义：[(索引名, 是否唯一, 列定义列表)]"""
+    cursor = conn.cursor()
+    try:
+        cursor.execute("""
+            SELECT INDEX_NAME, NON_UNIQUE, COLUMN_NAME, SUB_PART
+            FROM information_schema.STATISTICS
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND INDEX_NAME <> 'PRIMARY'
+            ORDER BY INDEX_NAME, SEQ_IN_INDEX
+        """, (table,))
+        rows = cursor.fetchall()
+    finally:
+        cursor.close()
+    indexes = {}
+    for name, non_unique, column_name, sub_part in rows:
+        definition = f"{column_name}({sub_part})" if sub_part else column_name
+        indexes.setdefault(name, (not non_unique, []))[1].append(definition)
+    return [(name, unique, cols) for name, (unique, cols) in indexes.items()]
+
+
+def fetch_foreign_keys(conn, table):
+    """线上表的外键定义：[(列列表, 引用表, 引用列列表, ON DELETE, ON UPDATE)]"""
+    cursor = conn.cursor()
+    try:
+        cursor.execute("""
+            SELECT k.CONSTRAINT_NAME, k.COLUMN_NAME, k.REFERENCED_TABLE_NAME, k.REFERENCED_COLUMN_NAME,
+                   r.DELETE_RULE, r.UPDATE_RULE
+            FROM information_schema.KEY_COLUMN_USAGE k
+            JOIN information_schema.REFERENTIAL_CONSTRAINTS r
+              ON r.CONSTRAINT_SCHEMA = k.CONSTRAINT_SCHEMA AND r.CONSTRAINT_NAME = k.CONSTRAINT_NAME
+            WHERE k.TABLE_SCHEMA = DATABASE() AND k.TABLE_NAME = %s AND k.REFERENCED_TABLE_NAME IS NOT NULL
+            ORDER BY k.CONSTRAINT_NAME, k.ORDINAL_POSITION
+        """, (table,))
+        rows = cursor.fetchall()
+    finally:
+        cursor.close()
+    foreign_keys = {}
+    for name, column_name, ref_table, ref_column, on_delete, on_update in rows:
+        fk = foreign_keys.setdefault(name, ([], ref_table, [], on_delete, on_update))
+        fk[0].append(column_name)
+        fk[2].append(ref_column)
+    return list(foreign_keys.values())
+
+
+def add_index_clause(name, unique, cols):
+    """ALTER TABLE 中添加索引的子句"""
+    return f"ADD {'UNIQUE ' if unique else ''}INDEX {name} ({', '.join(cols)})"
+
+
+def prepare_shadow_table(conn, table):
+    """建空影子表（CREATE TABLE ... LIKE 不复制外键），并去掉二级索引，导入时只维护主键"""
+    shadow = table + SHADOW_SUFFIX
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f"DROP TABLE IF EXISTS {shadow}")
+        cursor.execute(f"CREATE TABLE {shadow} LIKE {table}")
+        indexes = fetch_secondary_indexes(conn, table)
+        if indexes:
+            drops = ', '.join(f"DROP INDEX {name}" for name, _, _ in indexes)
+            cursor.execute(f"ALTER TABLE {shadow} {drops}")
+        conn.commit()
+    finally:
+        cursor.close()
+
+
+def finalize_shadow_table(conn, table):
+    """导入完成后一次性补建影子表的二级索引和外键（外键不命名，改名时由MySQL随表名更新）"""
+    shadow = table + SHADOW_SUFFIX
+    clauses = []
+    for name, unique, cols in fetch_secondary_indexes(conn, table):
+        clauses.append(add_index_clause(name, unique, cols))
+    for cols, ref_table, ref_cols, on_delete, on_update in fetch_foreign_keys(conn, table):
+        clauses.append(
+            f"ADD FOREIGN KEY ({', '.join(cols)}) REFERENCES {ref_table} ({', '.join(ref_cols)}) "
+            f"ON DELETE {on_delete} ON UPDATE {on_update}"
+        )
+    if not clauses:
+        return
+    cursor = conn.cursor()
+    try:
+        # 县代码已在导入county表时补全（--bulk/--shadow 导入结束后还会统一校验一次），关闭外键检查使添加外键可以原地完成而不重建表
+        cursor.execute("SET SESSION foreign_key_checks = 0")
+        cursor.execute(f"ALTER TABLE {shadow} {', '.join(clauses)}")
+        cursor.execute("SET SESSION foreign_key_checks = 1")
+        conn.commit()
+    finally:
+        cursor.close()
+
+
+def swap_shadow_tables(conn, tables):
+    """一条 RENAME TABLE 同时切换所有影子表（原子操作），再删除旧表"""
+    tables = sorted(tables)
+    renames = []
+    for table in tables:
+        renames.append(f"{table} TO {table}{RETIRED_SUFFIX}")
+        renames.append(f"{table}{SHADOW_SUFFIX} TO {table}")
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f"DROP TABLE IF EXISTS {', '.join(t + RETIRED_SUFFIX for t in tables)}")
+        cursor.execute(f"RENAME TABLE {', '.join(renames)}")
+        cursor.execute(f"DROP TABLE IF EXISTS {', '.join(t + RETIRED_SUFFIX for t in tables)}")
+        conn.commit()
+    finally:
+        cursor.close()
+
+
+def drop_shadow_tables(conn, tables):
+    """放弃本次导入的影子表"""
+    if not tables:
+        return
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f"DROP TABLE IF EXISTS {', '.join(t + SHADOW_SUFFIX for t in sorted(tables))}")
+        conn.commit()
+    finally:
+        cursor.close()
+
+
+# ---------------------------------------------------------------------------
+# 批量导入模式：延迟维护二级索引、外键校验和触发器
+# ---------------------------------------------------------------------------
+
+def ensure_deferred_index_table(conn):
+    """记录导入期间被去掉的二级索引，导入中断时下次运行据此恢复"""
+    cursor = conn.cursor()
+    try:
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS import_deferred_indexes (
+                TableName VARCHAR(64) NOT NULL COMMENT '表名',
+                IndexName VARCHAR(64) NOT NULL COMMENT '索引名',
+                AddClause VARCHAR(500) NOT NULL COMMENT '重建索引的ALTER子句',
+                PRIMARY KEY (TableName, IndexName)
+            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='批量导入延迟重建的索引'
+        """)
+        conn.commit()
+    finally:
+        cursor.close()
+
+
+def defer_secondary_indexes(conn, table):
+    """
+    去掉表的二级索引（先记录定义），导入时只维护主键。
+    外键依赖的索引（首列为外键列）不能删除，保留。
+    """
+    fk_columns = {cols[0] for cols, *_ in fetch_foreign_keys(conn, table)}
+    indexes = [(name, unique, cols) for name, unique, cols in fetch_secondary_indexes(conn, table)
+               if cols[0] not in fk_columns]
+    if not indexes:
+        return
+    cursor = conn.cursor()
+    try:
+        cursor.executemany(
+            "INSERT INTO import_deferred_indexes (TableName, IndexName, AddClause) VALUES (%s, %s, %s) "
+            "ON DUPLICATE KEY UPDATE AddClause=VALUES(AddClause)",
+            [(table, name, add_index_clause(name, unique, cols)) for name, unique, cols in indexes]
+        )
+        conn.commit()
+        cursor.execute(f"ALTER TABLE {table} {', '.join(f'DROP INDEX {name}' for name, _, _ in indexes)}")
+    finally:
+        cursor.close()
+
+
+def restore_secondary_indexes(conn, table=None):
+    """一条 ALTER 重建被延迟的二级索引（table 为空时恢复所有表），返回重建的索引数"""
+    cursor = conn.cursor()
+    try:
+        if table is None:
+            cursor.execute("SELECT TableName, IndexName, AddClause FROM import_deferred_indexes ORDER BY TableName")
+        else:
+            cursor.execute("SELECT TableName, IndexName, AddClause FROM import_deferred_indexes "
+                           "WHERE TableName = %s", (table,))
+        pending = {}
+        for table_name, index_name, clause in cursor.fetchall():
+            pending.setdefault(table_name, []).append((index_name, clause))
+        for table_name, indexes in pending.items():
+            existing = {name for name, _, _ in fetch_secondary_indexes(conn, table_name)}
+            clauses = [clause for name, clause in indexes if name not in existing]
+            if clauses:
+                cursor.execute(f"ALTER TABLE {table_name} {', '.join(clauses)}")
+            cursor.execute("DELETE FROM import_deferred_indexes WHERE TableName = %s", (table_name,))
+            conn.commit()
+        return sum(len(indexes) for indexes in pending.values())
+    finally:
+        cursor.close()
+
+
+def validate_foreign_keys(conn, tables):
+    """
+    外键检查关闭期间写入的数据做一次集中校验：删除引用不存在的行（开启外键检查时这些行会写入失败），
+    返回 {表名: 删除行数}
+    """
+    removed = {}
+    cursor = conn.cursor()
+    try:
+        for table in tables:
+            target = target_table(table)
+            for cols, ref_table, ref_cols, _, _ in fetch_foreign_keys(conn, table):
+                join = ' AND '.join(f"r.{ref} = t.{col}" for col, ref in zip(cols, ref_cols))
+                not_null = ' AND '.join(f"t.{col} IS NOT NULL" for col in cols)
+                cursor.execute(
+                    f"DELETE t FROM {target} t LEFT JOIN {ref_table} r ON {join} "
+                    f"WHERE {not_null} AND r.{ref_cols[0]} IS NULL"
+                )
+                if cursor.rowcount:
+                    removed[table] = removed.get(table, 0) + cursor.rowcount
+            conn.commit()
+    finally:
+        cursor.close()
+    return removed
+
+
+def snapshot_interview_ids(conn):
+    """记录导入前已有的访谈ID（会话临时表），用于导入后计算新增的访谈"""
+    cursor = conn.cursor()
+    try:
+        cursor.execute("DROP TEMPORARY TABLE IF EXISTS pre_import_interviews")
+        cursor.execute("CREATE TEMPORARY TABLE pre_import_interviews (PRIMARY KEY (InterviewID)) "
+                       "SELECT InterviewID FROM interviews")
+        conn.commit()
+    finally:
+        cursor.close()
+
+
+def recount_completed_interviews(conn):
+    """
+    触发器暂停期间新增的访谈，按调研员一次性累加到 CompletedInterviews
+    （与逐行触发器的效果相同：只对新插入的访谈计数），返回更新的调研员数
+    """
+    cursor = conn.cursor()
+    try:
+        cursor.execute("""
+            UPDATE surveyors s
+            JOIN (
+                SELECT i.SurveyorID, COUNT(*) AS added
+                FROM interviews i
+                LEFT JOIN pre_import_interviews p ON p.InterviewID = i.InterviewID
+                WHERE p.InterviewID IS NULL
+                GROUP BY i.SurveyorID
+            ) d ON d.SurveyorID = s.SurveyorID
+            SET s.CompletedInterviews = COALESCE(s.CompletedInterviews, 0) + d.added
+        """)
+        updated = cursor.rowcount
+        cursor.execute("DROP TEMPORARY TABLE IF EXISTS pre_import_interviews")
+        conn.commit()
+        return updated
+    finally:
+        cursor.close()
+
+
+def report(table, written, failed=0, skipped=0):
+    """打印导入结果，返回写入行数"""
+    message = f"{table}表导入完成，共 {written} 条记录"
+    if skipped > 0:
+        message += f"，跳过 {skipped} 条"
+    if failed > 0:
+        message += f"，失败 {failed} 条"
+    print(message)
+    return written
+
+
+def fetch_valid_codes(conn):
+    """数据库中已存在的县代码"""
+    cursor = conn.cursor()
+    cursor.execute("SELECT CountyCode FROM county")
+    codes = {row[0] for row in cursor.fetchall()}
+    cursor.close()
+    return codes
+
+
+def drop_missing_keys(frame, *columns):
+    """丢弃主键列缺失（或年份为0）的行"""
+    mask = pd.Series(True, index=frame.index)
+    for col in columns:
+        mask &= frame[col].notna()
+        if col == 'Year':
+            mask &= frame[col].fillna(0) != 0
+    return frame[mask]
+
+
+def source_exists(filename):
+    """数据文件是否存在"""
+    return (DATA_DIR / filename).exists()
+
+
+def coalesce_columns(df, names):
+    """按候选列名逐行取第一个非空的数值"""
+    result = pd.Series(np.nan, index=df.index, dtype='float64')
+    for name in names:
+        if name in df.columns:
+            result = result.fillna(clean_float(df[name]))
+    return result
+
+
+def panel_frame(filename, metrics):
+    """
+    读取一个县域面板文件，返回 CountyCode、Year 及 metrics（{表列: (候选源列, 换算系数)}）中的各列。
+    同一县同一年有多行时取最后一行。文件不存在时返回None
+    """
+    if not source_exists(filename):
+        return None
+    df = load_source(filename)
+    frame = pd.DataFrame({
+        'CountyCode': clean_code(df['CountyCode']),
+        'Year': clean_int(column(df, *PANEL_YEAR_COLUMNS)),
+    })
+    for target, (names, scale) in metrics.items():
+        frame[target] = coalesce_columns(df, names) * scale
+    frame = drop_missing_keys(frame, 'CountyCode', 'Year')
+    return frame.drop_duplicates(subset=['CountyCode', 'Year'], keep='last')
+
+
+def merge_panels(panels):
+    """按 (CountyCode, Year) 外连接合并多个面板文件，返回合并后的DataFrame（都不存在时为None）"""
+    frames = [panel_frame(filename, metrics) for filename, metrics in panels.items()]
+    frames = [frame for frame in frames if frame is not None]
+    if not frames:
         return None
+    return reduce(lambda left, right: left.merge(right, on=['CountyCode', 'Year'], how='outer'), frames)
+
+
+def combine_sources(primary, fallback):
+    """按 (CountyCode, Year) 对齐两份数据，primary 中缺失的值由 fallback 补全"""
+    if primary is None or fallback is None:
+        return fallback if primary is None else primary
+    keys = ['CountyCode', 'Year']
+    fallback = fallback.drop_duplicates(subset=keys, keep='last')
+    return primary.set_index(keys).combine_first(fallback.set_index(keys)).reset_index()
 
 
 def collect_all_county_codes():
-    """从所有CSV文件中收集县代码"""
+    """从所有CSV文件中收集县代码（只读取代码列）"""
     county_codes = set()
     
     csv_files = [
@@ -78,646 +1107,705 @@ def collect_all_county_codes():
     
     for filename, colname in csv_files:
         try:
-            filepath = DATA_DIR / filename
-            if not filepath.exists():
+            if not (DATA_DIR / filename).exists():
                 continue
-            
-            try:
-                test_df = pd.read_csv(filepath, nrows=0)
-                if colname not in test_df.columns:
-                    continue
-            except:
+            codes = read_code_column(filename, colname)
+            if codes is None:
                 continue
-            
-            df = pd.read_csv(filepath, dtype={colname: str}, low_memory=False)
-            if colname in df.columns:
-                codes = df[colname].dropna()
-                codes_clean = []
-                for code in codes:
-                    try:
-                        code_int = int(float(code))
-                        codes_clean.append(str(code_int).zfill(6)[:6])
-                    except (ValueError, TypeError):
-                        code_str = str(code).replace('.0', '').replace('.', '')
-                        codes_clean.append(code_str.zfill(6)[:6])
-                codes_unique = list(set(codes_clean))
-                county_codes.update(codes_unique)
-                print(f"  从 {filename} 收集到 {len(codes_unique)} 个县代码")
+            codes_unique = set(clean_code(codes).dropna().unique())
+            county_codes.update(codes_unique)
+            print(f"  从 {filename} 收集到 {len(codes_unique)} 个县代码")
         except Exception as e:
             print(f"  读取 {filename} 时出错: {e}")
     
     return county_codes
 
 
+def county_profile_frame(df):
+    """county表：county_profile.csv 中的县基本信息"""
+    return pd.DataFrame({
+        'CountyCode': clean_code(df['CountyCode']),
+        'CountyName': clean_text(column(df, '地区名称')),
+        'Province': clean_text(column(df, '所属省份')),
+        'City': clean_text(column(df, '所属城市')),
+        'Longitude': clean_float(column(df, '经度')),
+        'Latitude': clean_float(column(df, '纬度')),
+        'LandArea': clean_float(column(df, '行政区域土地面积(平方公里)')),
+        'TownshipCount': clean_int(column(df, '乡及镇个数(个)')),
+        'VillageCount': clean_int(column(df, '乡个数(个)')),
+    })
+
+
+def county_frame():
+    """
+    county表：优先取 county_profile.csv 的记录，其余县的名称、省份、地市依次用
+    贫困县名录和各面板文件（最近年份）补全，经纬度缺失时取自 county_relief.csv
+    """
+    parts = []
+    if source_exists('county_profile.csv'):
+        parts.append(county_profile_frame(load_source('county_profile.csv')))
+    if source_exists('poverty_county_list.csv'):
+        df = load_source('poverty_county_list.csv')
+        parts.append(pd.DataFrame({
+            'CountyCode': clean_code(df['行政区划代码']),
+            'CountyName': clean_text(column(df, '县域名称')),
+            'Province': clean_text(column(df, '所属省份')),
+            'City': clean_text(column(df, '所属城市')),
+        }))
+    for filename in COUNTY_NAME_PANELS:
+        if not source_exists(filename):
+            continue
+        df = load_source(filename)
+        part = pd.DataFrame({
+            'CountyCode': clean_code(df['CountyCode']),
+            'Year': clean_float(column(df, *PANEL_YEAR_COLUMNS)),
+            'CountyName': clean_text(column(df, 'CountyName')),
+            'Province': clean_text(column(df, 'Province')),
+            'City': clean_text(column(df, 'PrefLevCity')),
+        })
+        parts.append(part.sort_values('Year', ascending=False, kind='stable').drop(columns='Year'))
+
+    columns = ['CountyCode', 'CountyName', 'Province', 'City', 'Longitude', 'Latitude',
+               'LandArea', 'TownshipCount', 'VillageCount']
+    if not parts:
+        return pd.DataFrame(columns=columns)
+    # 每列取优先级最高的非空值
+    frame = (pd.concat(parts, ignore_index=True).dropna(subset=['CountyCode'])
+             .groupby('CountyCode', sort=False).first().reset_index())
+    frame = frame.reindex(columns=[col for col in columns if col in frame.columns])
+
+    if source_exists('county_relief.csv'):
+        df = load_source('county_relief.csv')
+        relief = pd.DataFrame({
+            'CountyCode': clean_code(df['行政区划代码']),
+            'Longitude': clean_float(column(df, '经度')),
+            'Latitude': clean_float(column(df, '纬度')),
+        }).dropna(subset=['CountyCode']).drop_duplicates('CountyCode').set_index('CountyCode')
+        for col in ('Longitude', 'Latitude'):
+            located = frame['CountyCode'].map(relief[col])
+            frame[col] = frame[col].fillna(located) if col in frame.columns else located
+    return frame
+
+
 def import_county_table(conn):
     """导入county表"""
     print("导入county表...")
+    frame = county_frame()
     print("收集所有CSV文件中的县代码...")
     all_county_codes = collect_all_county_codes()
     print(f"共收集到 {len(all_county_codes)} 个唯一的县代码")
     
-    df = pd.read_csv(DATA_DIR / 'county_profile.csv', dtype={'CountyCode': str}, low_memory=False)
-    df_county = df.groupby('CountyCode').first().reset_index()
+    inserted, failed = write_frame(conn, 'county', frame)
     
-    cursor = conn.cursor()
-    inserted = 0
+    missing_codes = sorted(all_county_codes - fetch_valid_codes(conn))
     inserted_minimal = 0
-    
-    for _, row in df_county.iterrows():
-        try:
-            county_code = str(row['CountyCode']).zfill(6)
-            sql = """
-                INSERT INTO county (CountyCode, CountyName, Province, City, Longitude, Latitude, 
-                                   LandArea, TownshipCount, VillageCount)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-                ON DUPLICATE KEY UPDATE
-                    CountyName=VALUES(CountyName), Province=VALUES(Province), City=VALUES(City),
-                    Longitude=VALUES(Longitude), Latitude=VALUES(Latitude),
-                    LandArea=VALUES(LandArea), TownshipCount=VALUES(TownshipCount),
-                    VillageCount=VALUES(VillageCount)
-            """
-            cursor.execute(sql, (
-                county_code, clean_value(row.get('地区名称')), clean_value(row.get('所属省份')),
-                clean_value(row.get('所属城市')), to_float64(row.get('经度')),
-                to_float64(row.get('纬度')), to_float64(row.get('行政区域土地面积(平方公里)')),
-                to_int(row.get('乡及镇个数(个)')), to_int(row.get('乡个数(个)'))
-            ))
-            inserted += 1
-        except Exception as e:
-            print(f"导入county表错误 (CountyCode={row.get('CountyCode')}): {e}")
-    
-    cursor.execute("SELECT CountyCode FROM county")
-    existing_codes = {row[0] for row in cursor.fetchall()}
-    missing_codes = all_county_codes - existing_codes
-    
     if missing_codes:
         print(f"发现 {len(missing_codes)} 个缺失的县代码，正在补充...")
-        for county_code in missing_codes:
-            try:
-                county_code_clean = str(county_code)[:6].zfill(6)
-                sql = "INSERT IGNORE INTO county (CountyCode, CountyName, Province, City) VALUES (%s, %s, %s, %s)"
-                cursor.execute(sql, (county_code_clean, f'县代码{county_code_clean}', '未知', '未知'))
-                inserted_minimal += 1
-            except Exception as e:
-                print(f"补充县代码失败 (CountyCode={county_code}): {e}")
+        codes = pd.Series(missing_codes, dtype=object).str[:6].str.zfill(6)
+        minimal = pd.DataFrame({
+            'CountyCode': codes,
+            'CountyName': '县代码' + codes,
+            'Province': '未知',
+            'City': '未知',
+        })
+        inserted_minimal, _ = upsert_frame(conn, 'county', minimal, ignore=True)
     
-    conn.commit()
     print(f"county表导入完成，共 {inserted} 条完整记录，{inserted_minimal} 条最小记录")
-    cursor.close()
+    return inserted + inserted_minimal
+
+
+def county_nature_frame(df):
+    """county_nature表：county_relief.csv"""
+    frame = pd.DataFrame({
+        'CountyCode': clean_code(df['行政区划代码']),
+        'RegionLevel': clean_int(column(df, '地区等级')),
+        'TerrainRelief': clean_float(column(df, '地形起伏度')),
+        'Longitude': clean_float(column(df, '经度')),
+        'Latitude': clean_float(column(df, '纬度')),
+    })
+    return drop_missing_keys(frame, 'CountyCode')
 
 
 def import_county_nature(conn):
     """导入county_nature表"""
-    print("导入county_nature表...")
-    df = pd.read_csv(DATA_DIR / 'county_relief.csv', dtype={'行政区划代码': str}, low_memory=False)
-    cursor = conn.cursor()
-    inserted = 0
-    
-    for _, row in df.iterrows():
-        try:
-            county_code_raw = row['行政区划代码']
-            if pd.notna(county_code_raw):
-                try:
-                    county_code = str(int(float(county_code_raw))).zfill(6)[:6]
-                except (ValueError, TypeError):
-                    county_code = str(county_code_raw).replace('.0', '').replace('.', '').zfill(6)[:6]
-            else:
-                continue
-            sql = """
-                INSERT INTO county_nature (CountyCode, RegionLevel, TerrainRelief, Longitude, Latitude)
-                VALUES (%s, %s, %s, %s, %s)
-                ON DUPLICATE KEY UPDATE
-                    RegionLevel=VALUES(RegionLevel), TerrainRelief=VALUES(TerrainRelief),
-                    Longitude=VALUES(Longitude), Latitude=VALUES(Latitude)
-            """
-            cursor.execute(sql, (
-                county_code, to_int(row.get('地区等级')), to_float64(row.get('地形起伏度')),
-                to_float64(row.get('经度')), to_float64(row.get('纬度'))
-            ))
-            inserted += 1
-        except Exception as e:
-            print(f"导入county_nature表错误: {e}")
-    
-    conn.commit()
-    print(f"county_nature表导入完成，共 {inserted} 条记录")
-    cursor.close()
+    return import_table(conn, 'county_nature')
+
+
+def county_economy_frame():
+    """
+    county_economy表：GDP、收入、金融面板按 (县, 年) 合并，county_profile.csv 存在时补全其余指标。
+    金融面板中个别异常值超出DECIMAL(15,2)范围，截断到边界
+    """
+    panels = merge_panels(ECONOMY_PANELS)
+    if panels is not None:
+        max_val = 9999999999999.99
+        for col in ('SavingsDeposit', 'LoanBalance'):
+            if col in panels.columns:
+                panels[col] = panels[col].clip(-max_val, max_val)
+    profile = None
+    if source_exists('county_profile.csv'):
+        profile = county_economy_profile_frame(load_source('county_profile.csv'))
+    return combine_sources(panels, profile)
+
+
+def county_economy_profile_frame(df):
+    """county_economy表：county_profile.csv 的经济指标"""
+    frame = pd.DataFrame({
+        'CountyCode': clean_code(df['CountyCode']),
+        'Year': clean_int(column(df, '年份')),
+        'GDP': clean_float(column(df, '地区生产总值(万元)\n—来源公众号【马克数据网】', '地区生产总值(万元)')),
+        'GDP_Primary': clean_float(column(df, '第一产业增加值(万元)')),
+        'GDP_Secondary': clean_float(column(df, '第二产业增加值(万元)')),
+        'GDP_Tertiary': clean_float(column(df, '第三产业增加值(万元)')),
+        'PerCapitaGDP': clean_float(column(df, '人均地区生产总值(元/人)')),
+        'UrbanAvgWage': clean_float(column(df, '城镇单位在岗职工平均工资(元)')),
+        'RuralDisposableIncome': clean_float(column(df, '农村居民人均可支配收入(元)\n—来源公众号【马克数据网】', '农村居民人均可支配收入(元)')),
+        'FiscalRevenue': clean_float(column(df, '地方财政一般预算收入(万元)')),
+        'FiscalExpenditure': clean_float(column(df, '地方财政一般预算支出(万元)')),
+        'SavingsDeposit': clean_float(column(df, '城乡居民储蓄存款余额(万元)')),
+        'LoanBalance': clean_float(column(df, '年末金融机构各项贷款余额(万元)')),
+        'IndustrialOutput': clean_float(column(df, '规模以上工业总产值(万元)')),
+        'IndustrialEnterpriseCount': clean_int(column(df, '规模以上工业企业数(个)')),
+        'FixedAssetInvestment': clean_float(column(df, '全社会固定资产投资(万元)')),
+        'RetailSales': clean_float(column(df, '社会消费品零售总额(万元)')),
+    })
+    return drop_missing_keys(frame, 'CountyCode', 'Year')
 
 
 def import_county_economy(conn):
     """导入county_economy表"""
-    print("导入county_economy表...")
-    df = pd.read_csv(DATA_DIR / 'county_profile.csv', dtype={'CountyCode': str}, low_memory=False)
-    cursor = conn.cursor()
-    inserted = 0
-    
-    def get_col_value(*possible_names):
-        for name in possible_names:
-            if name in row:
-                return row[name]
-        return None
-    
-    for _, row in df.iterrows():
-        try:
-            county_code = str(row['CountyCode']).zfill(6)
-            year = to_int(row.get('年份'))
-            if not year:
-                continue
-            
-            sql = """
-                INSERT INTO county_economy (
-                    CountyCode, Year, GDP, GDP_Primary, GDP_Secondary, GDP_Tertiary,
-                    PerCapitaGDP, UrbanAvgWage, RuralDisposableIncome,
-                    FiscalRevenue, FiscalExpenditure, SavingsDeposit, LoanBalance,
-                    IndustrialOutput, IndustrialEnterpriseCount, FixedAssetInvestment, RetailSales
-                )
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                ON DUPLICATE KEY UPDATE
-                    GDP=VALUES(GDP), GDP_Primary=VALUES(GDP_Primary), GDP_Secondary=VALUES(GDP_Secondary),
-                    GDP_Tertiary=VALUES(GDP_Tertiary), PerCapitaGDP=VALUES(PerCapitaGDP),
-                    UrbanAvgWage=VALUES(UrbanAvgWage), RuralDisposableIncome=VALUES(RuralDisposableIncome),
-                    FiscalRevenue=VALUES(FiscalRevenue), FiscalExpenditure=VALUES(FiscalExpenditure),
-                    SavingsDeposit=VALUES(SavingsDeposit), LoanBalance=VALUES(LoanBalance),
-                    IndustrialOutput=VALUES(IndustrialOutput), IndustrialEnterpriseCount=VALUES(IndustrialEnterpriseCount),
-                    FixedAssetInvestment=VALUES(FixedAssetInvestment), RetailSales=VALUES(RetailSales)
-            """
-            cursor.execute(sql, (
-                county_code, year,
-                to_float64(get_col_value('地区生产总值(万元)\n—来源公众号【马克数据网】', '地区生产总值(万元)')),
-                to_float64(row.get('第一产业增加值(万元)')), to_float64(row.get('第二产业增加值(万元)')),
-                to_float64(row.get('第三产业增加值(万元)')), to_float64(row.get('人均地区生产总值(元/人)')),
-                to_float64(row.get('城镇单位在岗职工平均工资(元)')),
-                to_float64(get_col_value('农村居民人均可支配收入(元)\n—来源公众号【马克数据网】', '农村居民人均可支配收入(元)')),
-                to_float64(row.get('地方财政一般预算收入(万元)')), to_float64(row.get('地方财政一般预算支出(万元)')),
-                to_float64(row.get('城乡居民储蓄存款余额(万元)')), to_float64(row.get('年末金融机构各项贷款余额(万元)')),
-                to_float64(row.get('规模以上工业总产值(万元)')), to_int(row.get('规模以上工业企业数(个)')),
-                to_float64(row.get('全社会固定资产投资(万元)')), to_float64(row.get('社会消费品零售总额(万元)'))
-            ))
-            inserted += 1
-        except Exception as e:
-            print(f"导入county_economy表错误: {e}")
-    
-    conn.commit()
-    print(f"county_economy表导入完成，共 {inserted} 条记录")
-    cursor.close()
+    return import_table(conn, 'county_economy')
+
+
+def county_agriculture_frame(df):
+    """county_agriculture表：county_profile.csv 的农业指标"""
+    frame = pd.DataFrame({
+        'CountyCode': clean_code(df['CountyCode']),
+        'Year': clean_int(column(df, '年份')),
+        'CropArea': clean_float(column(df, '农作物总播种面积(千公顷)')),
+        'MachineryPower': clean_float(column(df, '农用机械总动力(千万瓦)')),
+        'GrainOutput': clean_float(column(df, '粮食总产量(吨)')),
+        'CottonOutput': clean_float(column(df, '棉花产量(吨)')),
+        'OilOutput': clean_float(column(df, '油料产量(吨)')),
+        'MeatOutput': clean_float(column(df, '肉类总产量(吨)')),
+        'AgriOutputValue': clean_float(column(df, '农林牧渔业总产值(万元)')),
+        'RuralLaborForce': clean_int(column(df, '乡村从业人员数(人)')),
+        'AgriLaborForce': clean_int(column(df, '农林牧渔业从业人员数(人)')),
+    })
+    return drop_missing_keys(frame, 'CountyCode', 'Year')
 
 
 def import_county_agriculture(conn):
     """导入county_agriculture表"""
-    print("导入county_agriculture表...")
-    df = pd.read_csv(DATA_DIR / 'county_profile.csv', dtype={'CountyCode': str}, low_memory=False)
-    cursor = conn.cursor()
-    inserted = 0
-    
-    for _, row in df.iterrows():
-        try:
-            county_code = str(row['CountyCode']).zfill(6)
-            year = to_int(row.get('年份'))
-            if not year:
-                continue
-            sql = """
-                INSERT INTO county_agriculture (
-                    CountyCode, Year, CropArea, MachineryPower, GrainOutput,
-                    CottonOutput, OilOutput, MeatOutput, AgriOutputValue,
-                    RuralLaborForce, AgriLaborForce
-                )
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                ON DUPLICATE KEY UPDATE
-                    CropArea=VALUES(CropArea), MachineryPower=VALUES(MachineryPower),
-                    GrainOutput=VALUES(GrainOutput), CottonOutput=VALUES(CottonOutput),
-                    OilOutput=VALUES(OilOutput), MeatOutput=VALUES(MeatOutput),
-                    AgriOutputValue=VALUES(AgriOutputValue), RuralLaborForce=VALUES(RuralLaborForce),
-                    AgriLaborForce=VALUES(AgriLaborForce)
-            """
-            cursor.execute(sql, (
-                county_code, year, to_float64(row.get('农作物总播种面积(千公顷)')),
-                to_float64(row.get('农用机械总动力(千万瓦)')), to_float64(row.get('粮食总产量(吨)')),
-                to_float64(row.get('棉花产量(吨)')), to_float64(row.get('油料产量(吨)')),
-                to_float64(row.get('肉类总产量(吨)')), to_float64(row.get('农林牧渔业总产值(万元)')),
-                to_int(row.get('乡村从业人员数(人)')), to_int(row.get('农林牧渔业从业人员数(人)'))
-            ))
-            inserted += 1
-        except Exception as e:
-            print(f"导入county_agriculture表错误: {e}")
-    
-    conn.commit()
-    print(f"county_agriculture表导入完成，共 {inserted} 条记录")
-    cursor.close()
+    return import_table(conn, 'county_agriculture')
+
+
+def county_population_frame():
+    """county_population表：人口面板，county_profile.csv 存在时补全教育指标"""
+    profile = None
+    if source_exists('county_profile.csv'):
+        profile = county_population_profile_frame(load_source('county_profile.csv'))
+    return combine_sources(merge_panels(POPULATION_PANELS), profile)
+
+
+def county_population_profile_frame(df):
+    """county_population表：county_profile.csv 的人口与教育指标"""
+    frame = pd.DataFrame({
+        'CountyCode': clean_code(df['CountyCode']),
+        'Year': clean_int(column(df, '年份')),
+        'RegisteredPopulation': clean_float(column(df, '户籍人口数(万人)')),
+        'PrimarySchoolTeachers': clean_int(column(df, '普通小学专任教师数(人)')),
+        'MiddleSchoolTeachers': clean_int(column(df, '普通中学专任教师数(人)')),
+        'PrimarySchoolStudents': clean_int(column(df, '普通小学在校生数(人)')),
+        'MiddleSchoolStudents': clean_int(column(df, '普通中学在校学生数(人)')),
+    })
+    return drop_missing_keys(frame, 'CountyCode', 'Year')
 
 
 def import_county_population(conn):
     """导入county_population表"""
-    print("导入county_population表...")
-    df = pd.read_csv(DATA_DIR / 'county_profile.csv', dtype={'CountyCode': str}, low_memory=False)
-    cursor = conn.cursor()
-    inserted = 0
-    
-    for _, row in df.iterrows():
-        try:
-            county_code = str(row['CountyCode']).zfill(6)
-            year = to_int(row.get('年份'))
-            if not year:
-                continue
-            sql = """
-                INSERT INTO county_population (
-                    CountyCode, Year, RegisteredPopulation,
-                    PrimarySchoolTeachers, MiddleSchoolTeachers,
-                    PrimarySchoolStudents, MiddleSchoolStudents
-                )
-                VALUES (%s, %s, %s, %s, %s, %s, %s)
-                ON DUPLICATE KEY UPDATE
-                    RegisteredPopulation=VALUES(RegisteredPopulation),
-                    PrimarySchoolTeachers=VALUES(PrimarySchoolTeachers),
-                    MiddleSchoolTeachers=VALUES(MiddleSchoolTeachers),
-                    PrimarySchoolStudents=VALUES(PrimarySchoolStudents),
-                    MiddleSchoolStudents=VALUES(MiddleSchoolStudents)
-            """
-            cursor.execute(sql, (
-                county_code, year, to_float64(row.get('户籍人口数(万人)')),
-                to_int(row.get('普通小学专任教师数(人)')), to_int(row.get('普通中学专任教师数(人)')),
-                to_int(row.get('普通小学在校生数(人)')), to_int(row.get('普通中学在校学生数(人)'))
-            ))
-            inserted += 1
-        except Exception as e:
-            print(f"导入county_population表错误: {e}")
-    
-    conn.commit()
-    print(f"county_population表导入完成，共 {inserted} 条记录")
-    cursor.close()
+    return import_table(conn, 'county_population')
+
+
+def county_healthcare_frame(df):
+    """county_healthcare表：county_profile.csv 的医疗与福利指标"""
+    frame = pd.DataFrame({
+        'CountyCode': clean_code(df['CountyCode']),
+        'Year': clean_int(column(df, '年份')),
+        'HospitalBeds': clean_int(column(df, '医院、卫生院床位数(床)')),
+        'MedicalPersonnel': clean_int(column(df, '医院和卫生院卫生人员数_卫生技术人员(人)')),
+        'WelfareInstitutions': clean_int(column(df, '各种社会福利收养性单位数(个)')),
+        'WelfareBeds': clean_int(column(df, '各种社会福利收养性单位床位数(床)')),
+    })
+    return drop_missing_keys(frame, 'CountyCode', 'Year')
 
 
 def import_county_healthcare(conn):
     """导入county_healthcare表"""
-    print("导入county_healthcare表...")
-    df = pd.read_csv(DATA_DIR / 'county_profile.csv', dtype={'CountyCode': str}, low_memory=False)
-    cursor = conn.cursor()
-    inserted = 0
-    
-    for _, row in df.iterrows():
-        try:
-            county_code = str(row['CountyCode']).zfill(6)
-            year = to_int(row.get('年份'))
-            if not year:
-                continue
-            sql = """
-                INSERT INTO county_healthcare (
-                    CountyCode, Year, HospitalBeds, MedicalPersonnel,
-                    WelfareInstitutions, WelfareBeds
-                )
-                VALUES (%s, %s, %s, %s, %s, %s)
-                ON DUPLICATE KEY UPDATE
-                    HospitalBeds=VALUES(HospitalBeds), MedicalPersonnel=VALUES(MedicalPersonnel),
-                    WelfareInstitutions=VALUES(WelfareInstitutions), WelfareBeds=VALUES(WelfareBeds)
-            """
-            cursor.execute(sql, (
-                county_code, year, to_int(row.get('医院、卫生院床位数(床)')),
-                to_int(row.get('医院和卫生院卫生人员数_卫生技术人员(人)')),
-                to_int(row.get('各种社会福利收养性单位数(个)')), to_int(row.get('各种社会福利收养性单位床位数(床)'))
-            ))
-            inserted += 1
-        except Exception as e:
-            print(f"导入county_healthcare表错误: {e}")
-    
-    conn.commit()
-    print(f"county_healthcare表导入完成，共 {inserted} 条记录")
-    cursor.close()
+    return import_table(conn, 'county_healthcare')
+
+
+def poverty_counties_frame(df):
+    """poverty_counties表：poverty_county_list.csv"""
+    frame = pd.DataFrame({
+        'CountyCode': clean_code(df['行政区划代码']),
+        'CountyName': clean_text(column(df, '县域名称')),
+        'Region': clean_text(column(df, '所属地域')),
+        'Province': clean_text(column(df, '所属省份')),
+        'City': clean_text(column(df, '所属城市')),
+        'ExitYear': clean_int(column(df, '摘帽时间')),
+    })
+    return drop_missing_keys(frame, 'CountyCode')
 
 
 def import_poverty_counties(conn):
     """导入poverty_counties表"""
-    print("导入poverty_counties表...")
-    df = pd.read_csv(DATA_DIR / 'poverty_county_list.csv', dtype={'行政区划代码': str})
-    cursor = conn.cursor()
-    inserted = 0
-    
-    for _, row in df.iterrows():
-        try:
-            county_code_raw = row['行政区划代码']
-            if pd.notna(county_code_raw):
-                try:
-                    county_code = str(int(float(county_code_raw))).zfill(6)
-                except (ValueError, TypeError):
-                    county_code = str(county_code_raw).replace('.0', '').zfill(6)
-            else:
-                continue
-            if len(county_code) > 6:
-                county_code = county_code[:6]
-            
-            sql = """
-                INSERT INTO poverty_counties (
-                    CountyCode, CountyName, Region, Province, City, ExitYear
-                )
-                VALUES (%s, %s, %s, %s, %s, %s)
-                ON DUPLICATE KEY UPDATE
-                    CountyName=VALUES(CountyName), Region=VALUES(Region),
-                    Province=VALUES(Province), City=VALUES(City), ExitYear=VALUES(ExitYear)
-            """
-            cursor.execute(sql, (
-                county_code, clean_value(row.get('县域名称')), clean_value(row.get('所属地域')),
-                clean_value(row.get('所属省份')), clean_value(row.get('所属城市')), to_int(row.get('摘帽时间'))
-            ))
-            inserted += 1
-        except Exception as e:
-            print(f"导入poverty_counties表错误: {e}")
-    
-    conn.commit()
-    print(f"poverty_counties表导入完成，共 {inserted} 条记录")
-    cursor.close()
+    return import_table(conn, 'poverty_counties')
+
+
+def keep_known_counties(conn, frame, valid_codes=None):
+    """过滤掉county表中不存在的县代码，返回 (过滤后的frame, 跳过行数)"""
+    if valid_codes is None:
+        valid_codes = fetch_valid_codes(conn)
+    known = frame['CountyCode'].isin(valid_codes)
+    skipped = int((~known).sum())
+    for county_code in frame.loc[~known, 'CountyCode'].drop_duplicates().head(5):
+        print(f"  跳过: 县代码 {county_code} 在county表中不存在")
+    return frame[known], skipped
+
+
+def agricultural_output_frame(df):
+    """agricultural_output表：county_agri_output.csv"""
+    frame = pd.DataFrame({
+        'CountyCode': clean_code(df['县域代码']),
+        'Year': clean_int(column(df, '统计年度')),
+        'ProductType': clean_text(column(df, '产品种类或名称')),
+        'Unit': clean_text(column(df, '单位')),
+        'Output': clean_float(column(df, '产量')),
+    })
+    return drop_missing_keys(frame, 'CountyCode', 'Year', 'ProductType')
 
 
 def import_agricultural_output(conn):
     """导入agricultural_output表"""
-    print("导入agricultural_output表...")
-    df = pd.read_csv(DATA_DIR / 'county_agri_output.csv', dtype={'县域代码': str}, low_memory=False)
-    cursor = conn.cursor()
-    inserted = 0
-    skipped = 0
-    
-    cursor.execute("SELECT CountyCode FROM county")
-    valid_codes = {row[0] for row in cursor.fetchall()}
-    
-    for _, row in df.iterrows():
-        try:
-            county_code = str(row['县域代码']).zfill(6)
-            if county_code not in valid_codes:
-                skipped += 1
-                if skipped <= 5:
-                    print(f"  跳过: 县代码 {county_code} 在county表中不存在")
-                continue
-            
-            year = to_int(row.get('统计年度'))
-            product_type = clean_value(row.get('产品种类或名称'))
-            if not year or not product_type:
-                continue
-            
-            sql = """
-                INSERT INTO agricultural_output (CountyCode, Year, ProductType, Unit, Output)
-                VALUES (%s, %s, %s, %s, %s)
-                ON DUPLICATE KEY UPDATE Unit=VALUES(Unit), Output=VALUES(Output)
-            """
-            cursor.execute(sql, (
-                county_code, year, product_type, clean_value(row.get('单位')), to_float64(row.get('产量'))
-            ))
-            inserted += 1
-        except Exception as e:
-            print(f"导入agricultural_output表错误: {e}")
-    
-    conn.commit()
-    print(f"agricultural_output表导入完成，共 {inserted} 条记录" + (f"，跳过 {skipped} 条" if skipped > 0 else ""))
-    cursor.close()
+    return import_table(conn, 'agricultural_output')
+
+
+def crop_area_frame(df):
+    """crop_area表：county_crop_area.csv"""
+    frame = pd.DataFrame({
+        'CountyCode': clean_code(df['县域代码']),
+        'Year': clean_int(column(df, '统计年度')),
+        'CropType': clean_text(column(df, '农作物种类或名称')),
+        'SownArea': clean_float(column(df, '播种面积-公顷')),
+    })
+    return drop_missing_keys(frame, 'CountyCode', 'Year', 'CropType')
 
 
 def import_crop_area(conn):
     """导入crop_area表"""
-    print("导入crop_area表...")
-    df = pd.read_csv(DATA_DIR / 'county_crop_area.csv', dtype={'县域代码': str}, low_memory=False)
-    cursor = conn.cursor()
-    inserted = 0
-    skipped = 0
-    
-    cursor.execute("SELECT CountyCode FROM county")
-    valid_codes = {row[0] for row in cursor.fetchall()}
-    
-    for _, row in df.iterrows():
-        try:
-            county_code = str(row['县域代码']).zfill(6)
-            if county_code not in valid_codes:
-                skipped += 1
-                continue
-            
-            year = to_int(row.get('统计年度'))
-            crop_type = clean_value(row.get('农作物种类或名称'))
-            if not year or not crop_type:
-                continue
-            
-            sql = """
-                INSERT INTO crop_area (CountyCode, Year, CropType, SownArea)
-                VALUES (%s, %s, %s, %s)
-                ON DUPLICATE KEY UPDATE SownArea=VALUES(SownArea)
-            """
-            cursor.execute(sql, (
-                county_code, year, crop_type, to_float64(row.get('播种面积-公顷'))
-            ))
-            inserted += 1
-        except Exception as e:
-            print(f"导入crop_area表错误: {e}")
-    
-    conn.commit()
-    print(f"crop_area表导入完成，共 {inserted} 条记录" + (f"，跳过 {skipped} 条" if skipped > 0 else ""))
-    cursor.close()
+    return import_table(conn, 'crop_area')
+
+
+def finance_budget_frame(df):
+    """finance_budget表：county_finance_budget_raw.csv"""
+    frame = pd.DataFrame({
+        'CountyCode': clean_code(df['CountyCode']),
+        'Year': clean_int(column(df, *PANEL_YEAR_COLUMNS)),
+        'Project': clean_text(column(df, 'Project')),
+        'FinRevenue': clean_float(column(df, 'FinRevenue')),
+    })
+    return drop_missing_keys(frame, 'CountyCode', 'Year', 'Project')
 
 
 def import_finance_budget(conn):
     """导入finance_budget表"""
-    print("导入finance_budget表...")
-    df = pd.read_csv(DATA_DIR / 'county_finance_budget_raw.csv', dtype={'CountyCode': str}, low_memory=False)
-    cursor = conn.cursor()
-    inserted = 0
-    
-    for _, row in df.iterrows():
-        try:
-            county_code = str(row['CountyCode']).zfill(6)
-            year = to_int(row.get('SgnYear'))
-            project = clean_value(row.get('Project'))
-            if not year or not project:
-                continue
-            
-            sql = """
-                INSERT INTO finance_budget (CountyCode, Year, Project, FinRevenue)
-                VALUES (%s, %s, %s, %s)
-                ON DUPLICATE KEY UPDATE FinRevenue=VALUES(FinRevenue)
-            """
-            cursor.execute(sql, (county_code, year, project, to_float64(row.get('FinRevenue'))))
-            inserted += 1
-        except Exception as e:
-            print(f"导入finance_budget表错误: {e}")
-    
-    conn.commit()
-    print(f"finance_budget表导入完成，共 {inserted} 条记录")
-    cursor.close()
+    return import_table(conn, 'finance_budget')
+
+
+def transport_post_frame(df):
+    """transport_post表：county_transport_post.csv"""
+    frame = pd.DataFrame({
+        'CountyCode': clean_code(df['CountyCode']),
+        'Year': clean_int(column(df, *PANEL_YEAR_COLUMNS)),
+        'HighwayLength': clean_float(column(df, 'HighwayLength')),
+        'PostBusinessVolume': clean_float(column(df, 'PostTelBusinessVolume')),
+        'FixedPhoneNum': clean_float(column(df, 'FixedPhoneNum')),
+        'MobileUserNum': clean_float(column(df, 'MobileUserNum')),
+    })
+    return drop_missing_keys(frame, 'CountyCode', 'Year')
 
 
 def import_transport_post(conn):
     """导入transport_post表"""
-    print("导入transport_post表...")
-    df = pd.read_csv(DATA_DIR / 'county_transport_post.csv', dtype={'CountyCode': str}, low_memory=False)
-    cursor = conn.cursor()
-    inserted = 0
-    
-    for _, row in df.iterrows():
-        try:
-            county_code = str(row['CountyCode']).zfill(6)
-            year = to_int(row.get('SgnYear'))
-            if not year:
-                continue
-            
-            sql = """
-                INSERT INTO transport_post (
-                    CountyCode, Year, HighwayLength, PostBusinessVolume,
-                    FixedPhoneNum, MobileUserNum
-                )
-                VALUES (%s, %s, %s, %s, %s, %s)
-                ON DUPLICATE KEY UPDATE
-                    HighwayLength=VALUES(HighwayLength), PostBusinessVolume=VALUES(PostBusinessVolume),
-                    FixedPhoneNum=VALUES(FixedPhoneNum), MobileUserNum=VALUES(MobileUserNum)
-            """
-            cursor.execute(sql, (
-                county_code, year, to_float64(row.get('HighwayLength')),
-                to_float64(row.get('PostTelBusinessVolume')), to_float64(row.get('FixedPhoneNum')),
-                to_float64(row.get('MobileUserNum'))
-            ))
-            inserted += 1
-        except Exception as e:
-            print(f"导入transport_post表错误: {e}")
-    
-    conn.commit()
-    print(f"transport_post表导入完成，共 {inserted} 条记录")
-    cursor.close()
+    return import_table(conn, 'transport_post')
+
+
+def financial_services_frame(df):
+    """financial_services表：county_financial_services.csv，超出DECIMAL(12,2)范围的值截断到边界"""
+    max_val = 9999999999.99
+    frame = pd.DataFrame({
+        'CountyCode': clean_code(df['CountyCode']),
+        'Year': clean_int(column(df, *PANEL_YEAR_COLUMNS)),
+        'Loan': clean_float(column(df, 'Loan')).clip(-max_val, max_val),
+        'Deposit': clean_float(column(df, 'Deposit')).clip(-max_val, max_val),
+        'SavingsDeposit': clean_float(column(df, 'SavingsDeposit')).clip(-max_val, max_val),
+    })
+    return drop_missing_keys(frame, 'CountyCode', 'Year')
 
 
 def import_financial_services(conn):
     """导入financial_services表"""
-    print("导入financial_services表...")
-    df = pd.read_csv(DATA_DIR / 'county_financial_services.csv', dtype={'CountyCode': str}, low_memory=False)
-    cursor = conn.cursor()
-    inserted = 0
-    skipped = 0
-    
-    for _, row in df.iterrows():
-        try:
-            county_code = str(row['CountyCode']).zfill(6)
-            year = to_int(row.get('SgnYear'))
-            if not year:
-                continue
-            
-            max_val = 9999999999.99
-            loan_val = to_float64(row.get('Loan'))
-            if loan_val is not None and abs(loan_val) > max_val:
-                loan_val = max_val if loan_val > 0 else -max_val
-            
-            deposit_val = to_float64(row.get('Deposit'))
-            if deposit_val is not None and abs(deposit_val) > max_val:
-                deposit_val = max_val if deposit_val > 0 else -max_val
-            
-            savings_val = to_float64(row.get('SavingsDeposit'))
-            if savings_val is not None and abs(savings_val) > max_val:
-                savings_val = max_val if savings_val > 0 else -max_val
-            
-            sql = """
-                INSERT INTO financial_services (CountyCode, Year, Loan, Deposit, SavingsDeposit)
-                VALUES (%s, %s, %s, %s, %s)
-                ON DUPLICATE KEY UPDATE
-                    Loan=VALUES(Loan), Deposit=VALUES(Deposit), SavingsDeposit=VALUES(SavingsDeposit)
-            """
-            cursor.execute(sql, (county_code, year, loan_val, deposit_val, savings_val))
-            inserted += 1
-        except Exception as e:
-            skipped += 1
-            if skipped <= 5:
-                print(f"导入financial_services表错误: {e}")
-    
-    conn.commit()
-    print(f"financial_services表导入完成，共 {inserted} 条记录" + (f"，跳过 {skipped} 条" if skipped > 0 else ""))
-    cursor.close()
+    return import_table(conn, 'financial_services')
+
+
+def surveyors_frame(df):
+    """surveyors表：surveyors.csv"""
+    frame = pd.DataFrame({
+        'SurveyorID': clean_text(column(df, '调研员ID')),
+        'Name': clean_text(column(df, '姓名')),
+        'Gender': clean_text(column(df, '性别')),
+        'Department': clean_text(column(df, '所属院系')),
+        'Education': clean_text(column(df, '学历')),
+        'Major': clean_text(column(df, '专业方向')),
+        'Phone': clean_text(column(df, '联系电话')),
+        'Email': clean_text(column(df, '电子邮箱')),
+        'TeamID': clean_text(column(df, '所属分队ID')),
+        'CountyCode': clean_text(column(df, '负责县域ID')).str.zfill(6),
+        'Role': clean_text(column(df, '调研角色')),
+        'Batch': clean_text(column(df, '参与调研批次')),
+        'StartDate': clean_date(column(df, '调研开始时间')),
+        'EndDate': clean_date(column(df, '调研结束时间')),
+        'CompletedInterviews': clean_int(column(df, '已完成访谈次数')),
+        'PendingInterviews': clean_int(column(df, '待补访次数')),
+        'Expertise': clean_text(column(df, '调研专长')),
+        'TrainingStatus': clean_text(column(df, '培训完成状态')),
+        'EquipmentStatus': clean_text(column(df, '设备领用状态')),
+        'Notes': clean_text(column(df, '备注')),
+    })
+    return drop_missing_keys(frame, 'SurveyorID')
 
 
 def import_surveyors(conn):
     """导入surveyors表"""
-    print("导入surveyors表...")
-    df = pd.read_csv(DATA_DIR / 'surveyors.csv', dtype={'调研员ID': str, '负责县域ID': str})
-    cursor = conn.cursor()
-    inserted = 0
-    
-    for _, row in df.iterrows():
-        try:
-            surveyor_id = clean_value(row.get('调研员ID'))
-            county_code = clean_value(row.get('负责县域ID'))
-            if county_code:
-                county_code = str(county_code).zfill(6)
-            else:
-                county_code = None
-            
-            sql = """
-                INSERT INTO surveyors (
-                    SurveyorID, Name, Gender, Department, Education, Major,
-                    Phone, Email, TeamID, CountyCode, Role, Batch,
-                    StartDate, EndDate, CompletedInterviews, PendingInterviews,
-                    Expertise, TrainingStatus, EquipmentStatus, Notes
-                )
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                ON DUPLICATE KEY UPDATE
-                    Name=VALUES(Name), Gender=VALUES(Gender), Department=VALUES(Department),
-                    Education=VALUES(Education), Major=VALUES(Major), Phone=VALUES(Phone),
-                    Email=VALUES(Email), TeamID=VALUES(TeamID), CountyCode=VALUES(CountyCode),
-                    Role=VALUES(Role), Batch=VALUES(Batch), StartDate=VALUES(StartDate),
-                    EndDate=VALUES(EndDate), CompletedInterviews=VALUES(CompletedInterviews),
-                    PendingInterviews=VALUES(PendingInterviews), Expertise=VALUES(Expertise),
-                    TrainingStatus=VALUES(TrainingStatus), EquipmentStatus=VALUES(EquipmentStatus),
-                    Notes=VALUES(Notes)
-            """
-            cursor.execute(sql, (
-                surveyor_id, clean_value(row.get('姓名')), clean_value(row.get('性别')),
-                clean_value(row.get('所属院系')), clean_value(row.get('学历')), clean_value(row.get('专业方向')),
-                clean_value(row.get('联系电话')), clean_value(row.get('电子邮箱')), clean_value(row.get('所属分队ID')),
-                county_code, clean_value(row.get('调研角色')), clean_value(row.get('参与调研批次')),
-                pd.to_datetime(row.get('调研开始时间'), errors='coerce'),
-                pd.to_datetime(row.get('调研结束时间'), errors='coerce'),
-                to_int(row.get('已完成访谈次数')), to_int(row.get('待补访次数')),
-                clean_value(row.get('调研专长')), clean_value(row.get('培训完成状态')),
-                clean_value(row.get('设备领用状态')), clean_value(row.get('备注'))
-            ))
-            inserted += 1
-        except Exception as e:
-            print(f"导入surveyors表错误: {e}")
-    
-    conn.commit()
-    print(f"surveyors表导入完成，共 {inserted} 条记录")
-    cursor.close()
+    return import_table(conn, 'surveyors')
+
+
+def interviews_frame(df):
+    """interviews表：interviews.csv"""
+    frame = pd.DataFrame({
+        'InterviewID': clean_text(column(df, '访谈记录id')),
+        'SurveyorID': clean_text(column(df, '调研人id')),
+        'CountyCode': clean_code(column(df, '县id')),
+        'IntervieweeID': clean_text(column(df, '访谈对象id')),
+        'IntervieweeName': clean_text(column(df, '受访人姓名')),
+        'IntervieweeInfo': clean_text(column(df, '受访人信息')),
+        'Content': clean_text(column(df, '访谈内容')),
+        'InterviewDate': clean_date(column(df, '访谈时间')),
+        'InterviewLocation': clean_text(column(df, '访谈地点')),
+        'Quality': clean_float(column(df, '访谈质量')),
+    })
+    return drop_missing_keys(frame, 'InterviewID')
 
 
 def import_interviews(conn):
-    """导入interviews表"""
-    print("导入interviews表...")
-    df = pd.read_csv(DATA_DIR / 'interviews.csv', dtype={'访谈记录id': str, '调研人id': str, '县id': str})
-    cursor = conn.cursor()
-    inserted = 0
-    
-    for _, row in df.iterrows():
+    """导入interviews表（--bulk 模式下触发器暂停，导入后按集合重算调研员完成次数）"""
+    if not BULK:
+        return import_table(conn, 'interviews')
+    snapshot_interview_ids(conn)
+    rows = import_table(conn, 'interviews')
+    print(f"  已重算 {recount_completed_interviews(conn)} 名调研员的完成访谈次数")
+    return rows
+
+
+# 各表的数据文件与清洗函数。清洗函数逐行处理（不依赖其他行），流式导入时可逐块调用；
+# 数据文件为None的表由多个文件合并而成，清洗函数自行读取，流式模式下也整表处理
+TABLE_SOURCES = {
+    'county_nature': ('county_relief.csv', county_nature_frame),
+    'county_economy': (None, county_economy_frame),
+    'county_agriculture': ('county_profile.csv', county_agriculture_frame),
+    'county_population': (None, county_population_frame),
+    'county_healthcare': ('county_profile.csv', county_healthcare_frame),
+    'poverty_counties': ('poverty_county_list.csv', poverty_counties_frame),
+    'agricultural_output': ('county_agri_output.csv', agricultural_output_frame),
+    'crop_area': ('county_crop_area.csv', crop_area_frame),
+    'finance_budget': ('county_finance_budget_raw.csv', finance_budget_frame),
+    'transport_post': ('county_transport_post.csv', transport_post_frame),
+    'financial_services': ('county_financial_services.csv', financial_services_frame),
+    'surveyors': ('surveyors.csv', surveyors_frame),
+    'interviews': ('interviews.csv', interviews_frame),
+}
+
+# 写入前需过滤掉county表中不存在的县代码的表
+KNOWN_COUNTY_TABLES = {'agricultural_output', 'crop_area'}
+
+
+def iter_table_frames(table):
+    """流式读取：逐块解析数据文件并清洗，后台线程预先处理下一块"""
+    filename, build = TABLE_SOURCES[table]
+    chunk_rows = stream_chunk_rows(filename)
+    print(f"  按块读取 {filename}，每块 {chunk_rows} 行")
+    chunks = parse_source(filename, chunksize=chunk_rows)
+    return prefetch((build(chunk) for chunk in chunks), depth=STREAM_PREFETCH)
+
+
+def import_table(conn, table):
+    """
+    导入由 TABLE_SOURCES 描述的表。默认整文件读取后一次写入；
+    设置了内存预算时逐块读取、清洗和写入，下一块的解析与当前块的写入同时进行。
+    """
+    print(f"导入{table}表...")
+    filename, build = TABLE_SOURCES[table]
+    if filename is None:
+        frame = build()
+        if frame is None:
+            print("  数据文件不存在，跳过")
+            return 0
+        frames = [frame]
+    elif not source_exists(filename):
+        print(f"  数据文件 {filename} 不存在，跳过")
+        return 0
+    elif MEMORY_BUDGET:
+        frames = iter_table_frames(table)
+    else:
+        frames = [build(load_source(filename))]
+
+    valid_codes = fetch_valid_codes(conn) if table in KNOWN_COUNTY_TABLES else None
+    tracker = DeltaTracker(conn, table) if INCREMENTAL else None
+    written = failed = skipped = 0
+    for frame in frames:
+        if valid_codes is not None:
+            frame, dropped = keep_known_counties(conn, frame, valid_codes)
+            skipped += dropped
+        if tracker is not None:
+            chunk_written, chunk_failed = tracker.write(conn, frame)
+        else:
+            chunk_written, chunk_failed = write_frame_full(conn, table, frame)
+        written += chunk_written
+        failed += chunk_failed
+    if tracker is not None:
+        tracker.finish(conn)
+    return report(table, written, failed, skipped=skipped)
+
+
+# 导入任务及其依赖：只有外键顺序是必需的——county 最先，interviews 依赖 surveyors，
+# 其余各县事实表互不依赖，可并行导入。字典顺序即串行导入时的顺序
+IMPORT_TASKS = {
+    'county': (import_county_table, []),
+    'county_nature': (import_county_nature, ['county']),
+    'poverty_counties': (import_poverty_counties, ['county']),
+    'county_economy': (import_county_economy, ['county']),
+    'county_agriculture': (import_county_agriculture, ['county']),
+    'county_population': (import_county_population, ['county']),
+    'county_healthcare': (import_county_healthcare, ['county']),
+    'agricultural_output': (import_agricultural_output, ['county']),
+    'crop_area': (import_crop_area, ['county']),
+    'finance_budget': (import_finance_budget, ['county']),
+    'transport_post': (import_transport_post, ['county']),
+    'financial_services': (import_financial_services, ['county']),
+    'surveyors': (import_surveyors, ['county']),
+    'interviews': (import_interviews, ['surveyors']),
+}
+
+
+def apply_settings(settings):
+    """应用命令行设置（并行导入时在每个worker进程中调用）"""
+    global BATCH_SIZE, FAST_LOAD, USE_STAGING, INCREMENTAL, DELETE_MISSING, MEMORY_BUDGET, SHADOW, BULK
+    BATCH_SIZE = settings['batch_size']
+    FAST_LOAD = settings['fast']
+    USE_STAGING = settings['staging']
+    INCREMENTAL = settings['incremental']
+    DELETE_MISSING = settings['delete_missing']
+    MEMORY_BUDGET = settings['memory_budget']
+    SHADOW = settings['shadow']
+    BULK = settings['bulk']
+
+
+def run_import_task(name, settings=None):
+    """用独立的数据库连接执行一个导入任务，返回 (表名, 写入行数, 耗时秒)"""
+    if settings is not None:
+        apply_settings(settings)
+    conn = get_db_connection()
+    shadow = SHADOW and name in SHADOW_TABLES
+    deferred = BULK and not shadow
+    try:
+        start = time.perf_counter()
+        if shadow:
+            prepare_shadow_table(conn, name)
+        elif deferred:
+            defer_secondary_indexes(conn, name)
         try:
-            interview_id = clean_value(row.get('访谈记录id'))
-            surveyor_id = clean_value(row.get('调研人id'))
-            county_code = str(row.get('县id')).zfill(6)
-            
-            sql = """
-                INSERT INTO interviews (
-                    InterviewID, SurveyorID, CountyCode, IntervieweeID,
-                    IntervieweeName, IntervieweeInfo, Content, InterviewDate,
-                    InterviewLocation, Quality
-                )
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                ON DUPLICATE KEY UPDATE
-                    SurveyorID=VALUES(SurveyorID), CountyCode=VALUES(CountyCode),
-                    IntervieweeID=VALUES(IntervieweeID), IntervieweeName=VALUES(IntervieweeName),
-                    IntervieweeInfo=VALUES(IntervieweeInfo), Content=VALUES(Content),
-                    InterviewDate=VALUES(InterviewDate), InterviewLocation=VALUES(InterviewLocation),
-                    Quality=VALUES(Quality)
-            """
-            cursor.execute(sql, (
-                interview_id, surveyor_id, county_code, clean_value(row.get('访谈对象id')),
-                clean_value(row.get('受访人姓名')), clean_value(row.get('受访人信息')),
-                clean_value(row.get('访谈内容')), pd.to_datetime(row.get('访谈时间'), errors='coerce'),
-                clean_value(row.get('访谈地点')), to_float64(row.get('访谈质量'))
-            ))
-            inserted += 1
-        except Exception as e:
-            print(f"导入interviews表错误: {e}")
-    
-    conn.commit()
-    print(f"interviews表导入完成，共 {inserted} 条记录")
-    cursor.close()
+            rows = IMPORT_TASKS[name][0](conn) or 0
+        finally:
+            if deferred:
+                restore_secondary_indexes(conn, name)
+        if shadow:
+            finalize_shadow_table(conn, name)
+        return name, rows, time.perf_counter() - start
+    finally:
+        conn.close()
+
+
+def run_import_plan(settings, jobs=1):
+    """
+    按依赖关系执行全部导入任务。jobs>1 时先在主进程中读取全部数据文件，再把就绪的任务
+    提交到进程池并行执行，每个worker使用自己的连接；某个任务失败时跳过依赖它的任务。
+    返回 (各表结果列表, 失败或跳过的表集合)
+    """
+    results = {}
+    failed = set()
+    pending = list(IMPORT_TASKS)
+
+    def blocked(name):
+        return any(dep in failed for dep in IMPORT_TASKS[name][1])
+
+    def ready(name):
+        return all(dep in results for dep in IMPORT_TASKS[name][1])
+
+    if jobs <= 1:
+        for name in pending:
+            if blocked(name):
+                print(f"跳过{name}表：依赖的表导入失败")
+                failed.add(name)
+                continue
+            try:
+                results[name] = run_import_task(name)
+            except Exception as e:
+                print(f"导入{name}表失败: {e}")
+                failed.add(name)
+        return [results[name] for name in IMPORT_TASKS if name in results], failed
+
+    if not MEMORY_BUDGET:
+        # 流式导入按块读取，不整文件预读
+        loaded = preload_sources()
+        print(f"已预读 {len(loaded)} 个数据文件，worker 共享解析结果\n")
+    with ProcessPoolExecutor(max_workers=jobs, mp_context=worker_context()) as pool:
+        running = {}
+        while pending or running:
+            for name in list(pending):
+                if blocked(name):
+                    print(f"跳过{name}表：依赖的表导入失败")
+                    failed.add(name)
+                    pending.remove(name)
+                elif ready(name):
+                    running[pool.submit(run_import_task, name, settings)] = name
+                    pending.remove(name)
+            if not running:
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                try:
+                    results[name] = future.result()
+                except Exception as e:
+                    print(f"导入{name}表失败: {e}")
+                    failed.add(name)
+    return [results[name] for name in IMPORT_TASKS if name in results], failed
+
+
+def finish_validation():
+    """外键检查关闭时写入的数据统一校验一次"""
+    conn = get_db_connection()
+    try:
+        removed = validate_foreign_keys(conn, IMPORT_TASKS)
+    finally:
+        conn.close()
+    for table, count in removed.items():
+        print(f"校验: {table}表删除 {count} 条引用不存在的记录")
+    if not removed:
+        print("校验: 外键引用全部有效")
+
+
+def finish_shadow_import(failed):
+    """所有表都导入成功时原子切换影子表，否则丢弃影子表、保留线上数据"""
+    tables = [name for name in IMPORT_TASKS if name in SHADOW_TABLES]
+    conn = get_db_connection()
+    try:
+        if failed:
+            drop_shadow_tables(conn, tables)
+            print("有表导入失败，已丢弃影子表，线上表保持不变")
+        else:
+            swap_shadow_tables(conn, tables)
+            print(f"已原子切换 {len(tables)} 张影子表")
+    finally:
+        conn.close()
+
+
+def rebuild_summaries(imported_tables=()):
+    """导入结束后全量重建汇总表，并递增导入表与汇总表的数据版本，使各worker的接口缓存失效"""
+    conn = get_db_connection()
+    try:
+        ensure_summary_tables(conn)
+        counts = refresh_summaries(conn)
+        counts['county_growth_metrics'] = refresh_county_growth_metrics(conn)
+        counts['region_statistics_cube'] = refresh_region_cube(conn)
+        bump_data_versions(conn, list(imported_tables) + list(counts))
+        conn.commit()
+        for table, rows in counts.items():
+            print(f"已重建汇总表 {table}，共 {rows} 条记录")
+    except Exception as e:
+        conn.rollback()
+        print(f"重建汇总表失败: {e}")
+    finally:
+        conn.close()
+
+
+def print_import_summary(results, total_seconds):
+    """打印各表导入耗时与吞吐"""
+    print("\n" + "-" * 60)
+    print(f"{'表名':<24}{'行数':>10}{'耗时(秒)':>12}{'行/秒':>12}")
+    for name, rows, seconds in results:
+        rate = rows / seconds if seconds > 0 else 0
+        print(f"{name:<24}{rows:>10}{seconds:>12.2f}{rate:>12.0f}")
+    print(f"总耗时 {total_seconds:.2f} 秒")
+    print("-" * 60)
+
+
+def parse_args():
+    """命令行参数"""
+    parser = argparse.ArgumentParser(description='832工程数据导入脚本')
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE,
+                        help=f'每批 executemany 写入并提交的行数（默认 {BATCH_SIZE}）')
+    parser.add_argument('--fast', action='store_true',
+                        help='大表使用 LOAD DATA LOCAL INFILE 暂存表合并（需服务器开启 local_infile）')
+    parser.add_argument('--no-staging', action='store_true',
+                        help='不使用列式暂存缓存（data/.staging），每次都重新解析CSV')
+    parser.add_argument('--jobs', type=int, default=1,
+                        help='并行导入的进程数，互不依赖的表同时导入（默认 1，串行）')
+    parser.add_argument('--incremental', action='store_true',
+                        help='增量导入：按行指纹（import_fingerprints表）只写入新增或变化的行')
+    parser.add_argument('--delete-missing', action='store_true',
+                        help='与 --incremental 一起使用：删除CSV中已不存在的行（county表除外）')
+    parser.add_argument('--memory-budget', type=int, default=None, metavar='MB',
+                        help='流式导入：按块读取CSV并逐块写入，每张表的峰值内存约不超过该值（MB）')
+    parser.add_argument('--shadow', action='store_true',
+                        help='各县事实表导入影子表，全部成功后原子切换（导入期间线上查询不受影响）')
+    parser.add_argument('--bulk', action='store_true',
+                        help='批量导入模式：关闭外键/唯一性检查、暂停触发器、延迟重建二级索引（适合全量导入）')
+    return parser.parse_args()
 
 
 def main():
     """主函数"""
+    args = parse_args()
+    if args.delete_missing and not args.incremental:
+        print("错误: --delete-missing 需要与 --incremental 一起使用")
+        sys.exit(1)
+    if args.shadow and args.incremental:
+        print("错误: --shadow 每次都重建完整的影子表，不能与 --incremental 一起使用")
+        sys.exit(1)
+    settings = {
+        'batch_size': args.batch_size,
+        'fast': args.fast,
+        'staging': not args.no_staging,
+        'incremental': args.incremental,
+        'delete_missing': args.delete_missing,
+        'memory_budget': args.memory_budget,
+        'shadow': args.shadow,
+        'bulk': args.bulk,
+    }
+    apply_settings(settings)
+    
     print("=" * 60)
     print("832工程数据导入脚本")
     print("=" * 60)
@@ -728,6 +1816,11 @@ def main():
     
     try:
         conn = get_db_connection()
+        ensure_deferred_index_table(conn)
+        restored = restore_secondary_indexes(conn)
+        if restored:
+            print(f"已恢复上次批量导入中断时未重建的 {restored} 个索引")
+        conn.close()
         print("数据库连接成功\n")
     except Exception as e:
         print(f"数据库连接失败: {e}")
@@ -735,33 +1828,28 @@ def main():
         sys.exit(1)
     
     try:
-        import_county_table(conn)
-        import_county_nature(conn)
-        import_poverty_counties(conn)
-        import_county_economy(conn)
-        import_county_agriculture(conn)
-        import_county_population(conn)
-        import_county_healthcare(conn)
-        import_agricultural_output(conn)
-        import_crop_area(conn)
-        import_finance_budget(conn)
-        import_transport_post(conn)
-        import_financial_services(conn)
-        import_surveyors(conn)
-        import_interviews(conn)
+        start = time.perf_counter()
+        results, failed = run_import_plan(settings, jobs=args.jobs)
+        if BULK or SHADOW:
+            finish_validation()
+        if SHADOW:
+            finish_shadow_import(failed)
+        rebuild_summaries(IMPORT_TASKS)
+        print_import_summary(results, time.perf_counter() - start)
         
         print("\n" + "=" * 60)
-        print("所有数据导入完成！")
+        if failed:
+            print(f"导入结束，以下表未完成: {', '.join(sorted(failed))}")
+        else:
+            print("所有数据导入完成！")
         print("=" * 60)
     except Exception as e:
         print(f"\n导入过程中发生错误: {e}")
         import traceback
         traceback.print_exc()
     finally:
-        conn.close()
-        print("数据库连接已关闭")
+        clear_source_cache()
 
 
 if __name__ == '__main__':
     main()
-
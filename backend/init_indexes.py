@@ -0,0 +1,218 @@
+"""
+索引迁移与执行计划检查
+按版本号顺序应用 INDEX_MIGRATIONS 中尚未执行的迁移（已执行的版本记录在 schema_migrations 表），
+每个迁移都可重复执行：先查 information_schema，索引已存在/已删除时跳过。
+--check 对 CHECKED_QUERIES 中登记的接口查询执行 EXPLAIN，出现全表扫描或 filesort 时以非零状态退出。
+"""
+import argparse
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.db import get_db_connection
+from backend.api import compare, counties, interviews, stats
+
+# (版本, 说明, 操作列表)；操作为 ('add', 表, 索引名, 列)、('drop', 表, 索引名)
+# 或 ('add_column', 表, 列名, 列定义, 回填SQL)
+# 与 plan/17_index_migrations.sql 一致，只能在末尾追加新版本，已发布的版本不要修改
+INDEX_MIGRATIONS = [
+    ('001', '访谈列表按县/调研员过滤并按访谈日期倒序：复合索引取代单列外键索引', [
+        ('add', 'interviews', 'idx_county_date', ['CountyCode', 'InterviewDate']),
+        ('add', 'interviews', 'idx_surveyor_date', ['SurveyorID', 'InterviewDate']),
+        # 复合索引的前缀已能支撑外键，原单列索引成为冗余
+        ('drop', 'interviews', 'idx_county'),
+        ('drop', 'interviews', 'idx_surveyor'),
+    ]),
+    ('002', '地图接口：按省份、县名有序读取并在索引内过滤经纬度（覆盖索引）', [
+        ('add', 'county', 'idx_province_name_geo', ['Province', 'CountyName', 'Longitude', 'Latitude']),
+    ]),
+    ('003', '县列表：数据完整性评分存为汇总表列，按 (评分降序, 摘帽年份, 省份, 县名) 索引顺序读取', [
+        ('add_column', 'county_complete_info', 'DataCompleteness',
+         "TINYINT NOT NULL DEFAULT 0 COMMENT '数据完整性评分（GDP、农业产值、访谈各计1分）' AFTER AvgInterviewQuality",
+         """UPDATE county_complete_info SET DataCompleteness =
+                CASE WHEN GDP IS NOT NULL THEN 1 ELSE 0 END +
+                CASE WHEN AgriOutputValue IS NOT NULL THEN 1 ELSE 0 END +
+                CASE WHEN InterviewCount > 0 THEN 1 ELSE 0 END"""),
+        ('add', 'county_complete_info', 'idx_completeness_order',
+         ['DataCompleteness DESC', 'ExitYear', 'Province', 'CountyName']),
+    ]),
+    ('004', '访谈数高于平均值的调研员：从统计表出发按访谈数倒序读取（覆盖索引）', [
+        ('add', 'surveyor_interview_stats', 'idx_interview_count', ['InterviewCount', 'QualitySum', 'QualityCount']),
+    ]),
+]
+
+CREATE_SCHEMA_MIGRATIONS = """
+    CREATE TABLE IF NOT EXISTS schema_migrations (
+        Version VARCHAR(20) PRIMARY KEY COMMENT '迁移版本号',
+        Description VARCHAR(200) COMMENT '迁移说明',
+        AppliedAt TIMESTAMP DEFAULT CURRENT_TIMESTAMP COMMENT '执行时间'
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='索引迁移记录'
+"""
+
+# 样例参数：从当前数据集中取真实存在的值，保证 EXPLAIN 走到正常的访问路径
+SAMPLE_QUERIES = {
+    'county_code': "SELECT CountyCode FROM interviews GROUP BY CountyCode ORDER BY COUNT(*) DESC LIMIT 1",
+    'surveyor_id': "SELECT SurveyorID FROM interviews GROUP BY SurveyorID ORDER BY COUNT(*) DESC LIMIT 1",
+    'economy_county': "SELECT CountyCode FROM county_economy LIMIT 1",
+    'year': "SELECT MAX(Year) FROM county_economy",
+}
+
+# 登记的接口查询：(名称, 生成 (SQL, 参数) 的函数)。SQL 由接口使用的同一常量/构造函数生成，
+# 接口修改查询后检查的就是修改后的SQL
+CHECKED_QUERIES = [
+    ('interviews.get_interviews (county_code)',
+     lambda s: interviews.interview_list_sql(list(interviews.INTERVIEW_FIELDS), county_code=s['county_code'])),
+    ('interviews.get_interviews (surveyor_id)',
+     lambda s: interviews.interview_list_sql(list(interviews.INTERVIEW_FIELDS), surveyor_id=s['surveyor_id'])),
+    ('interviews.get_interviews (total, county_code)',
+     lambda s: interviews.interview_count_sql(county_code=s['county_code'])),
+    ('counties.get_counties',
+     lambda s: counties.county_list_sql(list(counties.COUNTY_FIELDS))),
+    ('counties.get_county_economy',
+     lambda s: counties.yearly_series_sql('county_economy', list(counties.ECONOMY_FIELDS),
+                                          counties.ECONOMY_FIELDS, s['economy_county'])),
+    ('counties.get_counties_map (latest)', lambda s: counties.county_map_sql()),
+    ('counties.get_counties_map (year)', lambda s: counties.county_map_sql(s['year'])),
+    ('compare.compare_trend',
+     lambda s: compare.trend_sql(list(compare.trend_fields('GDP')), 'GDP', [s['economy_county']], 2000, 2020)),
+    ('stats.get_overview (cube slices)', lambda s: (stats.OVERVIEW_SLICES_SQL, [])),
+    ('stats.get_region_cube', lambda s: stats.region_cube_sql('Region,Province')),
+    ('stats.get_top_gdp_growth', lambda s: stats.top_growth_sql('GDP', 'PostExitGrowth')),
+    ('stats.get_above_average_surveyors', lambda s: (stats.ABOVE_AVERAGE_SURVEYORS_SQL, [])),
+]
+
+
+def index_exists(cursor, table, index_name):
+    cursor.execute("""
+        SELECT 1 FROM information_schema.STATISTICS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND INDEX_NAME = %s
+        LIMIT 1
+    """, (table, index_name))
+    return cursor.fetchone() is not None
+
+
+def column_exists(cursor, table, column):
+    cursor.execute("""
+        SELECT 1 FROM information_schema.COLUMNS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND COLUMN_NAME = %s
+        LIMIT 1
+    """, (table, column))
+    return cursor.fetchone() is not None
+
+
+def apply_operation(cursor, operation):
+    """执行一个索引/列操作，返回是否实际改动了表结构"""
+    action, table, index_name = operation[:3]
+    if action == 'add_column':
+        if column_exists(cursor, table, index_name):
+            return False
+        cursor.execute(f"ALTER TABLE {table} ADD COLUMN {index_name} {operation[3]}")
+        cursor.execute(operation[4])
+        return True
+    exists = index_exists(cursor, table, index_name)
+    if action == 'add' and not exists:
+        cursor.execute(f"ALTER TABLE {table} ADD INDEX {index_name} ({', '.join(operation[3])})")
+        return True
+    if action == 'drop' and exists:
+        cursor.execute(f"ALTER TABLE {table} DROP INDEX {index_name}")
+        return True
+    return False
+
+
+def applied_versions(cursor):
+    cursor.execute(CREATE_SCHEMA_MIGRATIONS)
+    cursor.execute("SELECT Version FROM schema_migrations")
+    return {row['Version'] for row in cursor.fetchall()}
+
+
+def migrate(conn):
+    """按顺序执行未应用的迁移，返回本次执行的版本列表"""
+    cursor = conn.cursor()
+    try:
+        done = applied_versions(cursor)
+        executed = []
+        for version, description, operations in INDEX_MIGRATIONS:
+            if version in done:
+                continue
+            print(f"Applying migration {version}: {description}")
+            for operation in operations:
+                changed = apply_operation(cursor, operation)
+                print(f"  {'✓' if changed else '-'} {operation[0]} {operation[1]}.{operation[2]}")
+            cursor.execute(
+                "INSERT INTO schema_migrations (Version, Description) VALUES (%s, %s)",
+                (version, description)
+            )
+            # DDL 会隐式提交，这里提交的是迁移记录
+            conn.commit()
+            executed.append(version)
+        return executed
+    finally:
+        cursor.close()
+
+
+def load_samples(cursor):
+    samples = {}
+    for key, sql in SAMPLE_QUERIES.items():
+        cursor.execute(sql)
+        row = cursor.fetchone()
+        samples[key] = list(row.values())[0] if row else None
+    return samples
+
+
+def explain_problems(rows):
+    """从 EXPLAIN 结果中找出全表扫描和 filesort"""
+    problems = []
+    for row in rows:
+        extra = row.get('Extra') or ''
+        if row.get('type') == 'ALL':
+            problems.append(f"full table scan on {row.get('table')}")
+        if 'Using filesort' in extra:
+            problems.append(f"filesort on {row.get('table')}")
+    return problems
+
+
+def check(conn):
+    """对登记的接口查询执行 EXPLAIN，返回存在问题的查询数"""
+    cursor = conn.cursor()
+    try:
+        samples = load_samples(cursor)
+        failures = 0
+        for name, build in CHECKED_QUERIES:
+            sql, params = build(samples)
+            cursor.execute(f"EXPLAIN {sql}", params)
+            problems = explain_problems(cursor.fetchall())
+            if problems:
+                failures += 1
+                print(f"✗ {name}: {'; '.join(problems)}")
+            else:
+                print(f"✓ {name}")
+        return failures
+    finally:
+        cursor.close()
+
+
+def init_indexes(check_only=False):
+    conn = get_db_connection()
+    try:
+        if not check_only:
+            print("Applying Index Migrations...")
+            executed = migrate(conn)
+            print(f"Applied {len(executed)} migration(s)" + (f": {', '.join(executed)}" if executed else ''))
+            return 0
+
+        print("Checking Query Plans...")
+        failures = check(conn)
+        print(f"\n{len(CHECKED_QUERIES) - failures}/{len(CHECKED_QUERIES)} queries use index access without filesort")
+        return 1 if failures else 0
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='应用索引迁移 / 检查接口查询的执行计划')
+    parser.add_argument('--check', action='store_true',
+                        help='只检查：对登记的接口查询执行EXPLAIN，出现全表扫描或filesort时返回非零状态')
+    args = parser.parse_args()
+    sys.exit(init_indexes(check_only=args.check))
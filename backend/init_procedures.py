@@ -10,6 +10,7 @@ import re
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from backend.db import get_db_connection
+from backend.summaries import ensure_summary_tables
 
 def init_procedures():
     print("Creating Database Stored Procedures...")
@@ -17,6 +18,9 @@ def init_procedures():
     cursor = conn.cursor()
 
     try:
+        # county_latest_year must exist before referencing it
+        ensure_summary_tables(conn)
+
         # Read SQL file
         with open('plan/14_create_procedures.sql', 'r', encoding='utf-8') as f:
             sql_content = f.read()
@@ -6,6 +6,154 @@ import pymysql
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from backend.db import get_db_connection
+from backend.summaries import ensure_summary_tables, rebuild_interview_stats
+
+# 与 plan/08_create_triggers.sql 一致（pymysql 不支持 DELIMITER，逐条执行）
+TRIGGER_INTERVIEW_COUNT = """
+CREATE TRIGGER trg_update_interview_count
+AFTER INSERT ON interviews
+FOR EACH ROW
+BEGIN
+    -- 批量导入会话设置 @skip_interview_triggers = 1 暂停触发器，导入后统一重算
+    IF @skip_interview_triggers IS NULL THEN
+        UPDATE surveyors 
+        SET CompletedInterviews = COALESCE(CompletedInterviews, 0) + 1
+        WHERE SurveyorID = NEW.SurveyorID;
+    END IF;
+END
+"""
+
+# 访谈聚合表（backend/summaries.py）的逐行维护：插入计入、删除扣除、更新先扣后计
+PROC_ADD = """
+CREATE PROCEDURE sp_interview_stats_add(
+    IN p_surveyor VARCHAR(20), IN p_county CHAR(6), IN p_date DATE, IN p_quality DECIMAL(3, 1)
+)
+BEGIN
+    DECLARE v_new_county INT DEFAULT 0;
+
+    INSERT INTO surveyor_county_interviews (SurveyorID, CountyCode, InterviewCount)
+    VALUES (p_surveyor, p_county, 1)
+    ON DUPLICATE KEY UPDATE InterviewCount = InterviewCount + 1;
+    -- ROW_COUNT() = 1 表示新插入：该调研员第一次访谈这个县
+    SET v_new_county = IF(ROW_COUNT() = 1, 1, 0);
+
+    INSERT INTO surveyor_interview_stats (
+        SurveyorID, InterviewCount, QualitySum, QualityCount,
+        FirstInterviewDate, LatestInterviewDate, CoveredCounties
+    )
+    VALUES (p_surveyor, 1, COALESCE(p_quality, 0), p_quality IS NOT NULL, p_date, p_date, 1)
+    ON DUPLICATE KEY UPDATE
+        InterviewCount = InterviewCount + 1,
+        QualitySum = QualitySum + COALESCE(p_quality, 0),
+        QualityCount = QualityCount + (p_quality IS NOT NULL),
+        FirstInterviewDate = COALESCE(LEAST(FirstInterviewDate, p_date), FirstInterviewDate, p_date),
+        LatestInterviewDate = COALESCE(GREATEST(LatestInterviewDate, p_date), LatestInterviewDate, p_date),
+        CoveredCounties = CoveredCounties + v_new_county;
+
+    INSERT INTO county_interview_stats (CountyCode, InterviewCount, QualitySum, QualityCount, LatestInterviewDate)
+    VALUES (p_county, 1, COALESCE(p_quality, 0), p_quality IS NOT NULL, p_date)
+    ON DUPLICATE KEY UPDATE
+        InterviewCount = InterviewCount + 1,
+        QualitySum = QualitySum + COALESCE(p_quality, 0),
+        QualityCount = QualityCount + (p_quality IS NOT NULL),
+        LatestInterviewDate = COALESCE(GREATEST(LatestInterviewDate, p_date), LatestInterviewDate, p_date);
+END
+"""
+
+PROC_REMOVE = """
+CREATE PROCEDURE sp_interview_stats_remove(
+    IN p_surveyor VARCHAR(20), IN p_county CHAR(6), IN p_date DATE, IN p_quality DECIMAL(3, 1)
+)
+BEGIN
+    DECLARE v_left INT DEFAULT 0;
+
+    UPDATE surveyor_county_interviews
+    SET InterviewCount = InterviewCount - 1
+    WHERE SurveyorID = p_surveyor AND CountyCode = p_county;
+    SET v_left = COALESCE((
+        SELECT InterviewCount FROM surveyor_county_interviews
+        WHERE SurveyorID = p_surveyor AND CountyCode = p_county
+    ), 0);
+    DELETE FROM surveyor_county_interviews
+    WHERE SurveyorID = p_surveyor AND CountyCode = p_county AND InterviewCount <= 0;
+
+    UPDATE surveyor_interview_stats
+    SET InterviewCount = InterviewCount - 1,
+        QualitySum = QualitySum - COALESCE(p_quality, 0),
+        QualityCount = QualityCount - (p_quality IS NOT NULL),
+        CoveredCounties = CoveredCounties - IF(v_left <= 0, 1, 0)
+    WHERE SurveyorID = p_surveyor;
+
+    UPDATE county_interview_stats
+    SET InterviewCount = InterviewCount - 1,
+        QualitySum = QualitySum - COALESCE(p_quality, 0),
+        QualityCount = QualityCount - (p_quality IS NOT NULL)
+    WHERE CountyCode = p_county;
+
+    -- 删掉的恰好是最早/最新一次访谈时重取日期边界：MIN/MAX(InterviewDate) 由复合索引
+    -- idx_surveyor_date (SurveyorID, InterviewDate) / idx_county_date (CountyCode, InterviewDate) 直接取端点（索引迁移 001）
+    IF p_date IS NOT NULL THEN
+        UPDATE surveyor_interview_stats
+        SET FirstInterviewDate = (SELECT MIN(InterviewDate) FROM interviews WHERE SurveyorID = p_surveyor),
+            LatestInterviewDate = (SELECT MAX(InterviewDate) FROM interviews WHERE SurveyorID = p_surveyor)
+        WHERE SurveyorID = p_surveyor
+          AND (p_date <= FirstInterviewDate OR p_date >= LatestInterviewDate);
+
+        UPDATE county_interview_stats
+        SET LatestInterviewDate = (SELECT MAX(InterviewDate) FROM interviews WHERE CountyCode = p_county)
+        WHERE CountyCode = p_county AND p_date >= LatestInterviewDate;
+    END IF;
+END
+"""
+
+TRIGGER_INSERT = """
+CREATE TRIGGER trg_interview_stats_insert
+AFTER INSERT ON interviews
+FOR EACH ROW
+BEGIN
+    IF @skip_interview_triggers IS NULL THEN
+        CALL sp_interview_stats_add(NEW.SurveyorID, NEW.CountyCode, NEW.InterviewDate, NEW.Quality);
+    END IF;
+END
+"""
+
+TRIGGER_UPDATE = """
+CREATE TRIGGER trg_interview_stats_update
+AFTER UPDATE ON interviews
+FOR EACH ROW
+BEGIN
+    -- 只有影响聚合的列变化时才调整：先扣除旧行再计入新行
+    IF @skip_interview_triggers IS NULL AND NOT (
+        OLD.SurveyorID <=> NEW.SurveyorID AND OLD.CountyCode <=> NEW.CountyCode
+        AND OLD.InterviewDate <=> NEW.InterviewDate AND OLD.Quality <=> NEW.Quality
+    ) THEN
+        CALL sp_interview_stats_remove(OLD.SurveyorID, OLD.CountyCode, OLD.InterviewDate, OLD.Quality);
+        CALL sp_interview_stats_add(NEW.SurveyorID, NEW.CountyCode, NEW.InterviewDate, NEW.Quality);
+    END IF;
+END
+"""
+
+TRIGGER_DELETE = """
+CREATE TRIGGER trg_interview_stats_delete
+AFTER DELETE ON interviews
+FOR EACH ROW
+BEGIN
+    IF @skip_interview_triggers IS NULL THEN
+        CALL sp_interview_stats_remove(OLD.SurveyorID, OLD.CountyCode, OLD.InterviewDate, OLD.Quality);
+    END IF;
+END
+"""
+
+# (类型, 名称, 建立语句)，按依赖顺序排列：触发器调用的存储过程先建
+TRIGGER_OBJECTS = [
+    ('TRIGGER', 'trg_update_interview_count', TRIGGER_INTERVIEW_COUNT),
+    ('PROCEDURE', 'sp_interview_stats_add', PROC_ADD),
+    ('PROCEDURE', 'sp_interview_stats_remove', PROC_REMOVE),
+    ('TRIGGER', 'trg_interview_stats_insert', TRIGGER_INSERT),
+    ('TRIGGER', 'trg_interview_stats_update', TRIGGER_UPDATE),
+    ('TRIGGER', 'trg_interview_stats_delete', TRIGGER_DELETE),
+]
+
 
 def init_triggers():
     print("Initializing Database Triggers...")
@@ -13,35 +161,22 @@ def init_triggers():
     cursor = conn.cursor()
 
     try:
-        # Read SQL file
-        with open('plan/08_create_triggers.sql', 'r', encoding='utf-8') as f:
-            sql_content = f.read()
-        
-        # Split by 'DELIMITER' to handle trigger syntax properly
-        # This is a simple parser for the specific file format
-        statements = []
-        current_statement = []
-        
-        # Manual parsing because pymysql doesn't support DELIMITER syntax directly
-        # We just need to extract the CREATE TRIGGER part
-        
-        # Strategy: Execute the DROP first
-        cursor.execute("DROP TRIGGER IF EXISTS trg_update_interview_count")
-        print("Dropped existing trigger.")
-        
-        # Execute the CREATE TRIGGER
-        create_sql = """
-        CREATE TRIGGER trg_update_interview_count
-        AFTER INSERT ON interviews
-        FOR EACH ROW
-        BEGIN
-            UPDATE surveyors 
-            SET CompletedInterviews = COALESCE(CompletedInterviews, 0) + 1
-            WHERE SurveyorID = NEW.SurveyorID;
-        END;
-        """
-        cursor.execute(create_sql)
-        print("Created trigger: trg_update_interview_count")
+        # Triggers write to the interview aggregate tables
+        ensure_summary_tables(conn)
+
+        # Drop triggers before the procedures they call, then recreate in order
+        for kind, name, _ in reversed(TRIGGER_OBJECTS):
+            cursor.execute(f"DROP {kind} IF EXISTS {name}")
+        print("Dropped existing triggers.")
+
+        for kind, name, create_sql in TRIGGER_OBJECTS:
+            cursor.execute(create_sql)
+            print(f"Created {kind.lower()}: {name}")
+
+        # Bring the aggregates in line with the current interviews
+        counts = rebuild_interview_stats(conn)
+        for table, rows in counts.items():
+            print(f"Rebuilt {table}: {rows} rows")
         
         conn.commit()
         print("Triggers initialized successfully!")
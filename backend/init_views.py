@@ -6,6 +6,7 @@ import pymysql
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from backend.db import get_db_connection
+from backend.summaries import ensure_summary_tables
 
 def init_views():
     print("Creating Database Views...")
@@ -13,6 +14,9 @@ def init_views():
     cursor = conn.cursor()
 
     try:
+        # county_latest_year must exist before referencing it
+        ensure_summary_tables(conn)
+
         # Read SQL file
         with open('plan/13_create_views.sql', 'r', encoding='utf-8') as f:
             sql_content = f.read()
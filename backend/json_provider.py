@@ -0,0 +1,74 @@
+"""
+JSON 序列化
+DictCursor 返回的行里有 Decimal 和 date/datetime。Flask 默认的 JSON provider 逐个对象回调 default()
+并按键排序，列表接口的序列化开销明显。这里的 provider 优先使用 orjson（C 实现，原生支持
+date/datetime 转 ISO 8601，直接输出 bytes），未安装时退回标准库 json，输出格式保持一致：
+
+- Decimal 按 JSON_CONFIG['decimal'] 输出为数字（float）或字符串（str，保留精度）；
+- date/datetime 输出 ISO 8601（2020-01-01 / 2020-01-01T08:00:00）。
+"""
+import datetime
+import decimal
+import json
+
+from flask.json.provider import JSONProvider
+
+try:
+    import orjson
+except ImportError:  # 未安装orjson时使用标准库json
+    orjson = None
+
+# JSON 配置
+JSON_CONFIG = {
+    'decimal': 'float',   # Decimal 输出方式：float 输出数字，str 输出字符串
+    'sort_keys': False,   # 保持查询的列顺序，不按键排序
+}
+
+
+def _default(o):
+    """两种编码器都不支持的类型"""
+    if isinstance(o, decimal.Decimal):
+        return float(o) if JSON_CONFIG['decimal'] == 'float' else str(o)
+    if isinstance(o, (datetime.date, datetime.datetime)):
+        return o.isoformat()
+    if isinstance(o, datetime.timedelta):  # MySQL TIME 列
+        return str(o)
+    if isinstance(o, (set, frozenset)):
+        return list(o)
+    raise TypeError(f'Object of type {type(o).__name__} is not JSON serializable')
+
+
+def dumps_bytes(obj):
+    """序列化为 UTF-8 bytes"""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if JSON_CONFIG['sort_keys']:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=_default, option=option)
+    return json.dumps(
+        obj, default=_default, ensure_ascii=False, separators=(',', ':'), sort_keys=JSON_CONFIG['sort_keys']
+    ).encode('utf-8')
+
+
+class FastJSONProvider(JSONProvider):
+    """应用的 JSON provider：jsonify 和 request.get_json 都经过这里"""
+
+    mimetype = 'application/json'
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            # 调用方指定了 indent 等参数时交给标准库
+            kwargs.setdefault('default', _default)
+            kwargs.setdefault('ensure_ascii', False)
+            return json.dumps(obj, **kwargs)
+        return dumps_bytes(obj).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        if orjson is not None and not kwargs:
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        # 直接用序列化得到的 bytes 构造响应，不经过 str 中转
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps_bytes(obj), mimetype=self.mimetype)
@@ -0,0 +1,55 @@
+"""
+字段投影
+列表接口支持 fields=A,B,C 只返回需要的字段。每个接口用白名单描述可选字段：
+
+    字段名 -> (SQL 表达式, 依赖的连接名或 None)
+
+投影下推到生成的 SQL：只 SELECT 请求的字段，只拼接这些字段依赖的 JOIN，
+未请求的 TEXT 列（如访谈 Content）和连接表完全不会被读取。SQL 表达式为 None 的字段
+不在主查询中读取，由接口自行补充（如调研员联系方式）。未传 fields 时返回全部字段。
+"""
+from flask import request
+
+
+def requested_fields(spec, required=()):
+    """
+    解析 fields 参数，按白名单顺序返回字段列表；required 中的字段总会返回。
+    含白名单以外的字段时返回 None
+    """
+    value = request.args.get('fields')
+    if not value:
+        return list(spec)
+    names = {name.strip() for name in value.split(',') if name.strip()}
+    if not names or names - set(spec):
+        return None
+    names |= set(required)
+    return [name for name in spec if name in names]
+
+
+def fields_error(spec):
+    return {'success': False, 'error': f'fields 可选值: {", ".join(spec)}'}
+
+
+def select_list(fields, spec):
+    """SELECT 列表：表达式与字段名相同时不加别名"""
+    columns = []
+    for name in fields:
+        expression = spec[name][0]
+        if expression is None:
+            continue
+        if expression == name or expression.endswith(f'.{name}'):
+            columns.append(expression)
+        else:
+            columns.append(f'{expression} AS {name}')
+    return ', '.join(columns)
+
+
+def join_list(fields, spec, joins):
+    """请求的字段依赖的 JOIN 子句（按 joins 中的顺序）"""
+    needed = {spec[name][1] for name in fields if spec[name][1]}
+    return '\n        '.join(clause for join, clause in joins.items() if join in needed)
+
+
+def plain_fields(*names, table=None):
+    """单表接口的白名单：字段即列名（table 为表别名）"""
+    return {name: (f'{table}.{name}' if table else name, None) for name in names}
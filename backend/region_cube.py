@@ -0,0 +1,268 @@
+"""
+地区统计立方体 region_statistics_cube
+对贫困县按 地区 × 省份 × 摘帽年份 的全部 8 种维度组合（含全国合计）预先计算县数、
+最新年份经济/农业指标的计数/合计/均值/中位数以及访谈统计。县域明细一次读出后在 pandas 中
+向量化分组，地区统计和概览接口直接读取对应切片，不再逐地区调用存储过程。
+
+导入结束时全量重建；新增访谈时只更新包含该县的 8 行的访谈列。两者都只执行DML，
+表由 summaries.ensure_summary_tables 创建。
+"""
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+import pymysql
+
+from backend.db import fetch_frame
+
+# 立方体维度（GroupBy 列按此顺序拼接，空串表示全国合计）
+CUBE_DIMENSIONS = ['Region', 'Province', 'ExitYear']
+
+# 列名前缀 -> 县域明细中的指标列
+CUBE_METRICS = {
+    'GDP': 'GDP',
+    'PerCapitaGDP': 'PerCapitaGDP',
+    'RuralIncome': 'RuralDisposableIncome',
+    'AgriOutput': 'AgriOutputValue',
+}
+
+CUBE_STATISTICS = ['Count', 'Sum', 'Mean', 'Median']
+
+# 访谈列（新增访谈时增量更新）
+CUBE_INTERVIEW_COLUMNS = ['InterviewCount', 'AvgInterviewQuality', 'CoveredCounties', 'ActiveSurveyors']
+
+REGION_CUBE_COLUMNS = (
+    ['GroupBy'] + CUBE_DIMENSIONS + ['CountyCount', 'ExitedCount']
+    + [f'{prefix}{stat}' for prefix in CUBE_METRICS for stat in CUBE_STATISTICS]
+    + CUBE_INTERVIEW_COLUMNS
+)
+
+
+def _metric_columns_ddl():
+    lines = []
+    for prefix in CUBE_METRICS:
+        lines.append(f"{prefix}Count INT NOT NULL DEFAULT 0 COMMENT '{prefix} 非空县数',")
+        lines.append(f"{prefix}Sum DECIMAL(20, 2) COMMENT '{prefix} 合计',")
+        lines.append(f"{prefix}Mean DECIMAL(17, 2) COMMENT '{prefix} 均值',")
+        lines.append(f"{prefix}Median DECIMAL(17, 2) COMMENT '{prefix} 中位数',")
+    return '\n        '.join(lines)
+
+
+# 建表语句（与 plan/16_create_summary_tables.sql 一致）
+CREATE_REGION_CUBE = f"""
+    CREATE TABLE IF NOT EXISTS region_statistics_cube (
+        CubeID INT AUTO_INCREMENT PRIMARY KEY,
+        GroupBy VARCHAR(40) NOT NULL COMMENT '分组维度（逗号分隔），空串为全国合计',
+        Region VARCHAR(20) COMMENT '所属地域',
+        Province VARCHAR(50) COMMENT '所属省份',
+        ExitYear INT COMMENT '摘帽年份（分组含该维度时 NULL 表示未摘帽）',
+        CountyCount INT NOT NULL DEFAULT 0 COMMENT '贫困县数',
+        ExitedCount INT NOT NULL DEFAULT 0 COMMENT '已摘帽县数',
+        {_metric_columns_ddl()}
+        InterviewCount INT NOT NULL DEFAULT 0 COMMENT '访谈数',
+        AvgInterviewQuality DECIMAL(7, 5) COMMENT '平均访谈质量',
+        CoveredCounties INT NOT NULL DEFAULT 0 COMMENT '有访谈的县数',
+        ActiveSurveyors INT NOT NULL DEFAULT 0 COMMENT '在该范围内访谈过的调研员数',
+        INDEX idx_slice (GroupBy, Region, Province, ExitYear)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='地区统计立方体'
+"""
+
+# 县域明细：最新年份指标取自 county_latest_year，访谈统计取自 county_interview_stats
+COUNTY_DETAIL_SQL = """
+    SELECT pc.CountyCode, pc.Region, pc.Province, pc.ExitYear,
+           ce.GDP, ce.PerCapitaGDP, ce.RuralDisposableIncome, ca.AgriOutputValue,
+           COALESCE(iv.InterviewCount, 0) AS InterviewCount,
+           COALESCE(iv.QualitySum, 0) AS QualitySum,
+           COALESCE(iv.QualityCount, 0) AS QualityCount
+    FROM poverty_counties pc
+    LEFT JOIN county_latest_year ey ON ey.CountyCode = pc.CountyCode AND ey.SourceTable = 'county_economy'
+    LEFT JOIN county_economy ce ON ce.CountyCode = ey.CountyCode AND ce.Year = ey.LatestYear
+    LEFT JOIN county_latest_year ay ON ay.CountyCode = pc.CountyCode AND ay.SourceTable = 'county_agriculture'
+    LEFT JOIN county_agriculture ca ON ca.CountyCode = ay.CountyCode AND ca.Year = ay.LatestYear
+    LEFT JOIN county_interview_stats iv ON iv.CountyCode = pc.CountyCode
+"""
+
+SURVEYOR_COUNTY_SQL = "SELECT SurveyorID, CountyCode FROM surveyor_county_interviews"
+
+# 一个切片的访谈列：{condition} 为限定该切片范围的 poverty_counties 条件
+CUBE_INTERVIEW_UPDATE_SQL = """
+    UPDATE region_statistics_cube cube
+    JOIN (
+        SELECT COALESCE(SUM(iv.InterviewCount), 0) AS InterviewCount,
+               SUM(iv.QualitySum) / NULLIF(SUM(iv.QualityCount), 0) AS AvgInterviewQuality,
+               COALESCE(SUM(iv.InterviewCount > 0), 0) AS CoveredCounties
+        FROM poverty_counties pc
+        LEFT JOIN county_interview_stats iv ON iv.CountyCode = pc.CountyCode
+        WHERE {condition}
+    ) ia
+    JOIN (
+        SELECT COUNT(DISTINCT sc.SurveyorID) AS ActiveSurveyors
+        FROM surveyor_county_interviews sc
+        JOIN poverty_counties pc ON pc.CountyCode = sc.CountyCode
+        WHERE {condition}
+    ) sa
+    SET cube.InterviewCount = ia.InterviewCount,
+        cube.AvgInterviewQuality = ia.AvgInterviewQuality,
+        cube.CoveredCounties = ia.CoveredCounties,
+        cube.ActiveSurveyors = sa.ActiveSurveyors
+    WHERE cube.GroupBy = %s AND cube.Region <=> %s AND cube.Province <=> %s AND cube.ExitYear <=> %s
+"""
+
+
+def normalize_group_by(dimensions):
+    """维度列表 -> 立方体中的 GroupBy 值（按 CUBE_DIMENSIONS 顺序拼接）"""
+    return ','.join(dim for dim in CUBE_DIMENSIONS if dim in dimensions)
+
+
+def region_cube_frame(counties, surveyor_counties):
+    """
+    counties: 县域明细（COUNTY_DETAIL_SQL 的结果）；surveyor_counties: SurveyorID, CountyCode。
+    对每种维度组合做一次 groupby，返回 REGION_CUBE_COLUMNS 列
+    """
+    counties = counties.copy()
+    counties['_all'] = 0
+    counties['Exited'] = counties['ExitYear'].notna()
+    counties['Covered'] = counties['InterviewCount'] > 0
+    pairs = surveyor_counties.merge(counties[['CountyCode', '_all'] + CUBE_DIMENSIONS], on='CountyCode')
+
+    aggregations = {
+        'CountyCount': ('CountyCode', 'size'),
+        'ExitedCount': ('Exited', 'sum'),
+        'InterviewCount': ('InterviewCount', 'sum'),
+        'QualitySum': ('QualitySum', 'sum'),
+        'QualityCount': ('QualityCount', 'sum'),
+        'CoveredCounties': ('Covered', 'sum'),
+    }
+    for prefix, column in CUBE_METRICS.items():
+        aggregations.update({
+            f'{prefix}Count': (column, 'count'),
+            f'{prefix}Sum': (column, 'sum'),
+            f'{prefix}Mean': (column, 'mean'),
+            f'{prefix}Median': (column, 'median'),
+        })
+
+    frames = []
+    for size in range(len(CUBE_DIMENSIONS) + 1):
+        for dims in combinations(CUBE_DIMENSIONS, size):
+            keys = list(dims) or ['_all']
+            grouped = counties.groupby(keys, dropna=False).agg(**aggregations)
+            grouped['ActiveSurveyors'] = pairs.groupby(keys, dropna=False)['SurveyorID'].nunique()
+            grouped = grouped.reset_index()
+            grouped['GroupBy'] = normalize_group_by(dims)
+            frames.append(grouped)
+
+    cube = pd.concat(frames, ignore_index=True)
+    for prefix in CUBE_METRICS:
+        # 全为空的组合计为 NULL 而不是 0
+        cube.loc[cube[f'{prefix}Count'] == 0, f'{prefix}Sum'] = np.nan
+    cube['AvgInterviewQuality'] = cube['QualitySum'] / cube['QualityCount'].where(cube['QualityCount'] > 0)
+    cube['ActiveSurveyors'] = cube['ActiveSurveyors'].fillna(0)
+    for column in CUBE_DIMENSIONS:
+        if column not in cube:
+            cube[column] = np.nan
+        # 不在分组维度中的列置空
+        cube.loc[~cube['GroupBy'].str.split(',').apply(lambda dims, c=column: c in dims), column] = np.nan
+    return cube[REGION_CUBE_COLUMNS]
+
+
+def refresh_region_cube(conn):
+    """全量重建 region_statistics_cube（只执行DML，由调用方提交），返回行数"""
+    counties = fetch_frame(conn, COUNTY_DETAIL_SQL)
+    for column in list(CUBE_METRICS.values()) + ['ExitYear', 'InterviewCount', 'QualitySum', 'QualityCount']:
+        counties[column] = pd.to_numeric(counties[column])
+    surveyor_counties = fetch_frame(conn, SURVEYOR_COUNTY_SQL)
+
+    cube = region_cube_frame(counties, surveyor_counties)
+    cube = cube.astype(object).where(cube.notna(), None)
+    rows = [tuple(row) for row in cube.itertuples(index=False, name=None)]
+
+    cursor = conn.cursor()
+    try:
+        cursor.execute("DELETE FROM region_statistics_cube")
+        if rows:
+            placeholders = ', '.join(['%s'] * len(REGION_CUBE_COLUMNS))
+            cursor.executemany(
+                f"INSERT INTO region_statistics_cube ({', '.join(REGION_CUBE_COLUMNS)}) VALUES ({placeholders})",
+                rows
+            )
+        return len(rows)
+    finally:
+        cursor.close()
+
+
+def _cube_slices(counties):
+    """县 (Region, Province, ExitYear) -> 包含这些县的立方体行键 (GroupBy, Region, Province, ExitYear)，按固定顺序排列"""
+    keys = set()
+    for county in counties:
+        for size in range(len(CUBE_DIMENSIONS) + 1):
+            for dims in combinations(CUBE_DIMENSIONS, size):
+                keys.add((normalize_group_by(dims),) + tuple(
+                    county[dim] if dim in dims else None for dim in CUBE_DIMENSIONS
+                ))
+    # 并发写入按相同顺序加行锁，避免死锁
+    return sorted(keys, key=lambda key: [(value is None, value) for value in key])
+
+
+def refresh_region_cube_interviews(conn, county_codes):
+    """
+    只更新包含这些县的立方体行的访谈列（访谈写入后在同一事务中调用，由调用方提交），返回更新的切片数。
+    按 idx_slice 逐行更新，不删除、不重建整张表
+    """
+    county_codes = sorted(set(county_codes))
+    if not county_codes:
+        return 0
+    # 元组游标：连接的默认游标类是 DictCursor（DB_CONFIG），按位置取维度值
+    cursor = conn.cursor(pymysql.cursors.Cursor)
+    try:
+        placeholders = ', '.join(['%s'] * len(county_codes))
+        cursor.execute(
+            f"SELECT Region, Province, ExitYear FROM poverty_counties WHERE CountyCode IN ({placeholders})",
+            county_codes
+        )
+        counties = [dict(zip(CUBE_DIMENSIONS, row)) for row in cursor.fetchall()]
+        slices = _cube_slices(counties)
+        for key in slices:
+            group_by, values = key[0], dict(zip(CUBE_DIMENSIONS, key[1:]))
+            dims = group_by.split(',') if group_by else []
+            condition = ' AND '.join([f'pc.{dim} <=> %s' for dim in dims] or ['1 = 1'])
+            condition_params = [values[dim] for dim in dims]
+            cursor.execute(
+                CUBE_INTERVIEW_UPDATE_SQL.format(condition=condition),
+                condition_params + condition_params + list(key)
+            )
+        return len(slices)
+    finally:
+        cursor.close()
+
+
+def check_region_cube_interviews(conn):
+    """
+    校验访谈列的增量更新与全量重建一致，返回不一致的行数。在一个事务中全量重建立方体，
+    清零访谈列后对全部贫困县调用 refresh_region_cube_interviews，与重建结果逐行比较，最后回滚
+    """
+    select = f"SELECT CubeID, {', '.join(CUBE_INTERVIEW_COLUMNS)} FROM region_statistics_cube ORDER BY CubeID"
+    try:
+        refresh_region_cube(conn)
+        expected = fetch_frame(conn, select)
+        cursor = conn.cursor()
+        try:
+            cursor.execute(
+                "UPDATE region_statistics_cube "
+                "SET InterviewCount = 0, AvgInterviewQuality = NULL, CoveredCounties = 0, ActiveSurveyors = 0"
+            )
+        finally:
+            cursor.close()
+        county_codes = fetch_frame(conn, "SELECT CountyCode FROM poverty_counties")['CountyCode']
+        refresh_region_cube_interviews(conn, list(county_codes))
+        actual = fetch_frame(conn, select)
+    finally:
+        conn.rollback()
+
+    mismatched = pd.Series(False, index=expected.index)
+    for column in CUBE_INTERVIEW_COLUMNS:
+        left = pd.to_numeric(expected[column])
+        right = pd.to_numeric(actual[column])
+        # AvgInterviewQuality 为 DECIMAL(7, 5)，两种算法的舍入可能差最后一位
+        same = (left - right).abs().le(1e-4) | (left.isna() & right.isna())
+        mismatched |= ~same
+    return int(mismatched.sum())
@@ -0,0 +1,277 @@
+"""
+汇总表维护
+county_latest_year 记录每个县在各年度事实表中有数据的最新/最早年份，需要"最新年份"的查询改为主键连接；
+surveyor_interview_stats / county_interview_stats / surveyor_county_interviews 是访谈的增量聚合，
+由 interviews 上的触发器逐行维护（plan/08_create_triggers.sql），这里只负责批量重建（对账）；
+county_complete_info 是视图 v_county_complete_info 的物化结果。
+导入结束时全量重建，某个县的数据变化时只刷新该县。各函数只执行SQL，由调用方提交事务。
+
+建表语句（含 county_growth_metrics 等由其他模块维护的表）只在 ensure_summary_tables 中执行：
+MySQL 执行 CREATE TABLE 前会隐式提交当前事务，刷新函数中只能有 DML。
+"""
+from backend.cache import CREATE_DATA_VERSIONS
+from backend.growth_metrics import CREATE_COUNTY_GROWTH_METRICS
+from backend.region_cube import CREATE_REGION_CUBE
+
+# 各年度事实表的关键指标：任一指标非空的年份才计入该县的最新/最早年份
+LATEST_YEAR_METRICS = {
+    'county_economy': ['GDP'],
+    'county_agriculture': ['AgriOutputValue', 'GrainOutput'],
+    'county_population': ['RegisteredPopulation'],
+    'financial_services': ['Loan', 'Deposit', 'SavingsDeposit'],
+    'transport_post': ['HighwayLength', 'PostBusinessVolume', 'FixedPhoneNum', 'MobileUserNum'],
+}
+
+# 建表语句（与 plan/16_create_summary_tables.sql 一致）
+CREATE_COUNTY_LATEST_YEAR = """
+    CREATE TABLE IF NOT EXISTS county_latest_year (
+        CountyCode CHAR(6) NOT NULL COMMENT '县域代码',
+        SourceTable VARCHAR(32) NOT NULL COMMENT '年度事实表名',
+        LatestYear INT NOT NULL COMMENT '关键指标非空的最新年份',
+        EarliestYear INT NOT NULL COMMENT '关键指标非空的最早年份',
+        PRIMARY KEY (CountyCode, SourceTable),
+        INDEX idx_source_latest (SourceTable, LatestYear)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='各县各年度表的最新年份'
+"""
+
+CREATE_SURVEYOR_INTERVIEW_STATS = """
+    CREATE TABLE IF NOT EXISTS surveyor_interview_stats (
+        SurveyorID VARCHAR(20) PRIMARY KEY COMMENT '调研员ID',
+        InterviewCount INT NOT NULL DEFAULT 0 COMMENT '访谈数',
+        QualitySum DECIMAL(12, 1) NOT NULL DEFAULT 0 COMMENT '质量评分之和',
+        QualityCount INT NOT NULL DEFAULT 0 COMMENT '有质量评分的访谈数',
+        FirstInterviewDate DATE COMMENT '最早访谈日期',
+        LatestInterviewDate DATE COMMENT '最新访谈日期',
+        CoveredCounties INT NOT NULL DEFAULT 0 COMMENT '访谈覆盖的县域数',
+        INDEX idx_interview_count (InterviewCount, QualitySum, QualityCount),
+        FOREIGN KEY (SurveyorID) REFERENCES surveyors(SurveyorID) ON DELETE CASCADE
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='调研员访谈聚合'
+"""
+
+CREATE_COUNTY_INTERVIEW_STATS = """
+    CREATE TABLE IF NOT EXISTS county_interview_stats (
+        CountyCode CHAR(6) PRIMARY KEY COMMENT '县域代码',
+        InterviewCount INT NOT NULL DEFAULT 0 COMMENT '访谈数',
+        QualitySum DECIMAL(12, 1) NOT NULL DEFAULT 0 COMMENT '质量评分之和',
+        QualityCount INT NOT NULL DEFAULT 0 COMMENT '有质量评分的访谈数',
+        LatestInterviewDate DATE COMMENT '最新访谈日期',
+        FOREIGN KEY (CountyCode) REFERENCES county(CountyCode) ON DELETE CASCADE
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='县域访谈聚合'
+"""
+
+CREATE_SURVEYOR_COUNTY_INTERVIEWS = """
+    CREATE TABLE IF NOT EXISTS surveyor_county_interviews (
+        SurveyorID VARCHAR(20) NOT NULL COMMENT '调研员ID',
+        CountyCode CHAR(6) NOT NULL COMMENT '县域代码',
+        InterviewCount INT NOT NULL DEFAULT 0 COMMENT '该调研员在该县的访谈数',
+        PRIMARY KEY (SurveyorID, CountyCode),
+        FOREIGN KEY (SurveyorID) REFERENCES surveyors(SurveyorID) ON DELETE CASCADE,
+        FOREIGN KEY (CountyCode) REFERENCES county(CountyCode) ON DELETE CASCADE
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='调研员访谈覆盖的县域集合'
+"""
+
+CREATE_COUNTY_COMPLETE_INFO = """
+    CREATE TABLE IF NOT EXISTS county_complete_info (
+        CountyCode CHAR(6) PRIMARY KEY COMMENT '县域代码',
+        CountyName VARCHAR(100) COMMENT '县域名称',
+        Province VARCHAR(50) COMMENT '所属省份',
+        City VARCHAR(50) COMMENT '所属城市',
+        Longitude DECIMAL(10, 6) COMMENT '经度',
+        Latitude DECIMAL(10, 6) COMMENT '纬度',
+        LandArea DECIMAL(12, 2) COMMENT '行政区域土地面积(平方公里)',
+        Region VARCHAR(20) COMMENT '所属地域',
+        ExitYear INT COMMENT '摘帽年份',
+        LatestEconYear INT COMMENT '最新经济数据年份',
+        GDP DECIMAL(15, 2) COMMENT '地区生产总值(万元)',
+        PerCapitaGDP DECIMAL(10, 2) COMMENT '人均地区生产总值(元/人)',
+        RuralDisposableIncome DECIMAL(10, 2) COMMENT '农村居民人均可支配收入(元)',
+        FiscalRevenue DECIMAL(15, 2) COMMENT '地方财政一般预算收入(万元)',
+        FiscalExpenditure DECIMAL(15, 2) COMMENT '地方财政一般预算支出(万元)',
+        LatestAgriYear INT COMMENT '最新农业数据年份',
+        AgriOutputValue DECIMAL(15, 2) COMMENT '农林牧渔业总产值(万元)',
+        GrainOutput DECIMAL(12, 2) COMMENT '粮食总产量(吨)',
+        InterviewCount INT NOT NULL DEFAULT 0 COMMENT '访谈数',
+        AvgInterviewQuality DECIMAL(7, 5) NOT NULL DEFAULT 0 COMMENT '平均访谈质量',
+        DataCompleteness TINYINT NOT NULL DEFAULT 0 COMMENT '数据完整性评分（GDP、农业产值、访谈各计1分）',
+        RefreshedAt TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT '刷新时间',
+        INDEX idx_region (Region),
+        INDEX idx_exit_year (ExitYear),
+        INDEX idx_province (Province),
+        INDEX idx_gdp (GDP),
+        INDEX idx_completeness_order (DataCompleteness DESC, ExitYear, Province, CountyName)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='县域完整信息汇总表'
+"""
+
+COUNTY_COMPLETE_INFO_COLUMNS = [
+    'CountyCode', 'CountyName', 'Province', 'City', 'Longitude', 'Latitude', 'LandArea',
+    'Region', 'ExitYear',
+    'LatestEconYear', 'GDP', 'PerCapitaGDP', 'RuralDisposableIncome', 'FiscalRevenue', 'FiscalExpenditure',
+    'LatestAgriYear', 'AgriOutputValue', 'GrainOutput',
+    'InterviewCount', 'AvgInterviewQuality', 'DataCompleteness',
+]
+
+
+def _in_condition(column, county_codes):
+    """county_codes 为None时不过滤，否则生成 column IN (...) 条件及参数"""
+    if county_codes is None:
+        return '1=1', []
+    return f"{column} IN ({', '.join(['%s'] * len(county_codes))})", list(county_codes)
+
+
+def _normalize_codes(county_codes):
+    return None if county_codes is None else sorted(set(county_codes))
+
+
+def _county_complete_info_select(county_codes=None):
+    """
+    与 v_county_complete_info 结果相同的查询：最新年份取自 county_latest_year、访谈统计取自
+    county_interview_stats（均为主键连接），而不是对每个县执行相关子查询或分组聚合。
+    county_codes 不为空时只计算这些县
+    """
+    county_where, county_params = _in_condition('c.CountyCode', county_codes)
+    sql = f"""
+        SELECT
+            c.CountyCode, c.CountyName, c.Province, c.City, c.Longitude, c.Latitude, c.LandArea,
+            pc.Region, pc.ExitYear,
+            ce.Year, ce.GDP, ce.PerCapitaGDP, ce.RuralDisposableIncome, ce.FiscalRevenue, ce.FiscalExpenditure,
+            ca.Year, ca.AgriOutputValue, ca.GrainOutput,
+            COALESCE(iv.InterviewCount, 0), COALESCE(iv.QualitySum / NULLIF(iv.QualityCount, 0), 0),
+            CASE WHEN ce.GDP IS NOT NULL THEN 1 ELSE 0 END +
+            CASE WHEN ca.AgriOutputValue IS NOT NULL THEN 1 ELSE 0 END +
+            CASE WHEN COALESCE(iv.InterviewCount, 0) > 0 THEN 1 ELSE 0 END
+        FROM county c
+        LEFT JOIN poverty_counties pc ON c.CountyCode = pc.CountyCode
+        LEFT JOIN county_latest_year ey ON ey.CountyCode = c.CountyCode AND ey.SourceTable = 'county_economy'
+        LEFT JOIN county_economy ce ON ce.CountyCode = ey.CountyCode AND ce.Year = ey.LatestYear
+        LEFT JOIN county_latest_year ay ON ay.CountyCode = c.CountyCode AND ay.SourceTable = 'county_agriculture'
+        LEFT JOIN county_agriculture ca ON ca.CountyCode = ay.CountyCode AND ca.Year = ay.LatestYear
+        LEFT JOIN county_interview_stats iv ON iv.CountyCode = c.CountyCode
+        WHERE {county_where}
+    """
+    return sql, county_params
+
+
+def ensure_summary_tables(conn):
+    """创建汇总表（不存在时）"""
+    cursor = conn.cursor()
+    try:
+        cursor.execute(CREATE_COUNTY_LATEST_YEAR)
+        cursor.execute(CREATE_SURVEYOR_INTERVIEW_STATS)
+        cursor.execute(CREATE_COUNTY_INTERVIEW_STATS)
+        cursor.execute(CREATE_SURVEYOR_COUNTY_INTERVIEWS)
+        cursor.execute(CREATE_COUNTY_COMPLETE_INFO)
+        cursor.execute(CREATE_COUNTY_GROWTH_METRICS)
+        cursor.execute(CREATE_REGION_CUBE)
+        cursor.execute(CREATE_DATA_VERSIONS)
+    finally:
+        cursor.close()
+
+
+def refresh_county_latest_year(conn, county_codes=None, tables=None):
+    """
+    刷新 county_latest_year：county_codes 为None时全量重建，否则只刷新这些县；
+    tables 为None时刷新所有年度事实表。返回写入行数
+    """
+    county_codes = _normalize_codes(county_codes)
+    if county_codes == []:
+        return 0
+    code_condition, code_params = _in_condition('CountyCode', county_codes)
+    written = 0
+    cursor = conn.cursor()
+    try:
+        for table in tables or LATEST_YEAR_METRICS:
+            has_data = ' OR '.join(f"{metric} IS NOT NULL" for metric in LATEST_YEAR_METRICS[table])
+            cursor.execute(
+                f"DELETE FROM county_latest_year WHERE SourceTable = %s AND {code_condition}",
+                [table] + code_params
+            )
+            cursor.execute(f"""
+                INSERT INTO county_latest_year (CountyCode, SourceTable, LatestYear, EarliestYear)
+                SELECT CountyCode, %s, MAX(Year), MIN(Year)
+                FROM {table}
+                WHERE ({has_data}) AND {code_condition}
+                GROUP BY CountyCode
+            """, [table] + code_params)
+            written += cursor.rowcount
+        return written
+    finally:
+        cursor.close()
+
+
+# 访谈聚合的批量重建语句：与触发器逐行维护的结果一致
+INTERVIEW_STATS_REBUILD = {
+    'surveyor_county_interviews': """
+        INSERT INTO surveyor_county_interviews (SurveyorID, CountyCode, InterviewCount)
+        SELECT SurveyorID, CountyCode, COUNT(*)
+        FROM interviews
+        GROUP BY SurveyorID, CountyCode
+    """,
+    'surveyor_interview_stats': """
+        INSERT INTO surveyor_interview_stats (
+            SurveyorID, InterviewCount, QualitySum, QualityCount,
+            FirstInterviewDate, LatestInterviewDate, CoveredCounties
+        )
+        SELECT SurveyorID, COUNT(*), COALESCE(SUM(Quality), 0), COUNT(Quality),
+               MIN(InterviewDate), MAX(InterviewDate), COUNT(DISTINCT CountyCode)
+        FROM interviews
+        GROUP BY SurveyorID
+    """,
+    'county_interview_stats': """
+        INSERT INTO county_interview_stats (CountyCode, InterviewCount, QualitySum, QualityCount, LatestInterviewDate)
+        SELECT CountyCode, COUNT(*), COALESCE(SUM(Quality), 0), COUNT(Quality), MAX(InterviewDate)
+        FROM interviews
+        GROUP BY CountyCode
+    """,
+}
+
+
+def rebuild_interview_stats(conn):
+    """
+    对账：按 interviews 全量重建访谈聚合表，返回 {表名: 行数}。
+    批量导入（触发器被 @skip_interview_triggers 暂停）之后、以及级联删除
+    （InnoDB 外键级联不触发触发器）之后都需要运行
+    """
+    counts = {}
+    cursor = conn.cursor()
+    try:
+        for table, insert_sql in INTERVIEW_STATS_REBUILD.items():
+            cursor.execute(f"DELETE FROM {table}")
+            cursor.execute(insert_sql)
+            counts[table] = cursor.rowcount
+        return counts
+    finally:
+        cursor.close()
+
+
+def refresh_summaries(conn, county_codes=None):
+    """
+    按依赖顺序刷新全部汇总表（county_complete_info 依赖 county_latest_year 和 county_interview_stats）。
+    访谈聚合由触发器维护，只在全量刷新时重建
+    """
+    counts = {'county_latest_year': refresh_county_latest_year(conn, county_codes)}
+    if county_codes is None:
+        counts.update(rebuild_interview_stats(conn))
+    counts['county_complete_info'] = refresh_county_complete_info(conn, county_codes)
+    return counts
+
+
+def refresh_county_complete_info(conn, county_codes=None):
+    """
+    刷新 county_complete_info：county_codes 为None时全量重建，否则只刷新这些县
+    （县已被删除时同时删除其汇总行）。先删后插，在调用方的事务中完成，返回写入行数
+    """
+    county_codes = _normalize_codes(county_codes)
+    if county_codes == []:
+        return 0
+    delete_where, delete_params = _in_condition('CountyCode', county_codes)
+    select_sql, select_params = _county_complete_info_select(county_codes)
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f"DELETE FROM county_complete_info WHERE {delete_where}", delete_params)
+        cursor.execute(
+            f"INSERT INTO county_complete_info ({', '.join(COUNTY_COMPLETE_INFO_COLUMNS)}) {select_sql}",
+            select_params
+        )
+        return cursor.rowcount
+    finally:
+        cursor.close()
@@ -1,5 +1,7 @@
 -- 创建数据库视图
 -- 用于简化复杂查询，提高代码复用性
+-- 最新/最早年份取自 county_latest_year，访谈统计取自触发器维护的访谈聚合表
+-- （均见 16_create_summary_tables.sql），需先创建这些表
 
 USE poverty_alleviation_832;
 
@@ -29,33 +31,22 @@ SELECT
     ca_latest.AgriOutputValue,
     ca_latest.GrainOutput,
     -- 访谈统计
-    COALESCE(interview_stats.interview_count, 0) AS InterviewCount,
-    COALESCE(interview_stats.avg_quality, 0) AS AvgInterviewQuality
+    COALESCE(interview_stats.InterviewCount, 0) AS InterviewCount,
+    COALESCE(interview_stats.QualitySum / NULLIF(interview_stats.QualityCount, 0), 0) AS AvgInterviewQuality
 FROM county c
 LEFT JOIN poverty_counties pc ON c.CountyCode = pc.CountyCode
 -- 获取最新年份的经济数据
-LEFT JOIN county_economy ce_latest ON c.CountyCode = ce_latest.CountyCode
-    AND ce_latest.Year = (
-        SELECT MAX(Year) 
-        FROM county_economy 
-        WHERE CountyCode = c.CountyCode
-    )
+LEFT JOIN county_latest_year ey ON c.CountyCode = ey.CountyCode
+    AND ey.SourceTable = 'county_economy'
+LEFT JOIN county_economy ce_latest ON ey.CountyCode = ce_latest.CountyCode
+    AND ce_latest.Year = ey.LatestYear
 -- 获取最新年份的农业数据
-LEFT JOIN county_agriculture ca_latest ON c.CountyCode = ca_latest.CountyCode
-    AND ca_latest.Year = (
-        SELECT MAX(Year) 
-        FROM county_agriculture 
-        WHERE CountyCode = c.CountyCode
-    )
+LEFT JOIN county_latest_year ay ON c.CountyCode = ay.CountyCode
+    AND ay.SourceTable = 'county_agriculture'
+LEFT JOIN county_agriculture ca_latest ON ay.CountyCode = ca_latest.CountyCode
+    AND ca_latest.Year = ay.LatestYear
 -- 访谈统计
-LEFT JOIN (
-    SELECT 
-        CountyCode,
-        COUNT(*) AS interview_count,
-        AVG(Quality) AS avg_quality
-    FROM interviews
-    GROUP BY CountyCode
-) interview_stats ON c.CountyCode = interview_stats.CountyCode;
+LEFT JOIN county_interview_stats interview_stats ON c.CountyCode = interview_stats.CountyCode;
 
 -- 2. 调研员工作统计视图
 -- 整合调研员信息、负责县域、访谈统计
@@ -76,23 +67,14 @@ SELECT
     -- 工作统计
     s.CompletedInterviews,
     s.PendingInterviews,
-    COALESCE(interview_stats.total_interviews, 0) AS ActualInterviewCount,
-    COALESCE(interview_stats.avg_quality, 0) AS AvgInterviewQuality,
-    COALESCE(interview_stats.latest_interview_date, NULL) AS LatestInterviewDate,
+    COALESCE(interview_stats.InterviewCount, 0) AS ActualInterviewCount,
+    COALESCE(interview_stats.QualitySum / NULLIF(interview_stats.QualityCount, 0), 0) AS AvgInterviewQuality,
+    interview_stats.LatestInterviewDate AS LatestInterviewDate,
     -- 访谈覆盖的县域数
-    COALESCE(interview_stats.covered_counties, 0) AS CoveredCounties
+    COALESCE(interview_stats.CoveredCounties, 0) AS CoveredCounties
 FROM surveyors s
 LEFT JOIN county c ON s.CountyCode = c.CountyCode
-LEFT JOIN (
-    SELECT 
-        SurveyorID,
-        COUNT(*) AS total_interviews,
-        AVG(Quality) AS avg_quality,
-        MAX(InterviewDate) AS latest_interview_date,
-        COUNT(DISTINCT CountyCode) AS covered_counties
-    FROM interviews
-    GROUP BY SurveyorID
-) interview_stats ON s.SurveyorID = interview_stats.SurveyorID;
+LEFT JOIN surveyor_interview_stats interview_stats ON s.SurveyorID = interview_stats.SurveyorID;
 
 -- 3. 贫困县汇总视图
 -- 整合贫困县信息、摘帽状态、经济指标变化趋势
@@ -121,31 +103,20 @@ SELECT
         ELSE NULL
     END AS GDPGrowthRate,
     -- 访谈统计
-    COALESCE(interview_stats.interview_count, 0) AS InterviewCount
+    COALESCE(interview_stats.InterviewCount, 0) AS InterviewCount
 FROM poverty_counties pc
 -- 摘帽年份的经济数据
 LEFT JOIN county_economy ce_exit ON pc.CountyCode = ce_exit.CountyCode
     AND ce_exit.Year = pc.ExitYear
+-- 经济数据的最新/最早年份
+LEFT JOIN county_latest_year ey ON pc.CountyCode = ey.CountyCode
+    AND ey.SourceTable = 'county_economy'
 -- 最新年份的经济数据（如果没有摘帽年份数据）
-LEFT JOIN county_economy ce_latest ON pc.CountyCode = ce_latest.CountyCode
-    AND ce_latest.Year = (
-        SELECT MAX(Year) 
-        FROM county_economy 
-        WHERE CountyCode = pc.CountyCode
-    )
+LEFT JOIN county_economy ce_latest ON ey.CountyCode = ce_latest.CountyCode
+    AND ce_latest.Year = ey.LatestYear
 -- 最早年份的经济数据（用于计算增长率）
-LEFT JOIN county_economy ce_old ON pc.CountyCode = ce_old.CountyCode
-    AND ce_old.Year = (
-        SELECT MIN(Year) 
-        FROM county_economy 
-        WHERE CountyCode = pc.CountyCode
-    )
+LEFT JOIN county_economy ce_old ON ey.CountyCode = ce_old.CountyCode
+    AND ce_old.Year = ey.EarliestYear
 -- 访谈统计
-LEFT JOIN (
-    SELECT 
-        CountyCode,
-        COUNT(*) AS interview_count
-    FROM interviews
-    GROUP BY CountyCode
-) interview_stats ON pc.CountyCode = interview_stats.CountyCode;
+LEFT JOIN county_interview_stats interview_stats ON pc.CountyCode = interview_stats.CountyCode;
 
@@ -1,5 +1,6 @@
 -- 创建存储过程
 -- 用于封装复杂业务逻辑，提高执行效率
+-- 最新年份取自 county_latest_year，访谈统计取自访谈聚合表（见 16_create_summary_tables.sql），需先创建这些表
 
 USE poverty_alleviation_832;
 
@@ -28,27 +29,22 @@ BEGIN
         ca_latest.Year as LatestAgriYear,
         ca_latest.AgriOutputValue, ca_latest.GrainOutput,
         -- 访谈统计
-        COALESCE(interview_stats.interview_count, 0) as InterviewCount,
-        COALESCE(interview_stats.avg_quality, 0) as AvgInterviewQuality,
-        interview_stats.latest_interview_date as LatestInterviewDate,
+        COALESCE(interview_stats.InterviewCount, 0) as InterviewCount,
+        COALESCE(interview_stats.QualitySum / NULLIF(interview_stats.QualityCount, 0), 0) as AvgInterviewQuality,
+        interview_stats.LatestInterviewDate as LatestInterviewDate,
         -- 调研员信息
         s.SurveyorID, s.Name as SurveyorName, s.TeamID
     FROM county c
     LEFT JOIN poverty_counties pc ON c.CountyCode = pc.CountyCode
-    LEFT JOIN county_economy ce_latest ON c.CountyCode = ce_latest.CountyCode
-        AND ce_latest.Year = (SELECT MAX(Year) FROM county_economy WHERE CountyCode = county_code)
-    LEFT JOIN county_agriculture ca_latest ON c.CountyCode = ca_latest.CountyCode
-        AND ca_latest.Year = (SELECT MAX(Year) FROM county_agriculture WHERE CountyCode = county_code)
-    LEFT JOIN (
-        SELECT 
-            CountyCode,
-            COUNT(*) as interview_count,
-            AVG(Quality) as avg_quality,
-            MAX(InterviewDate) as latest_interview_date
-        FROM interviews
-        WHERE CountyCode = county_code
-        GROUP BY CountyCode
-    ) interview_stats ON c.CountyCode = interview_stats.CountyCode
+    LEFT JOIN county_latest_year ey ON c.CountyCode = ey.CountyCode
+        AND ey.SourceTable = 'county_economy'
+    LEFT JOIN county_economy ce_latest ON ey.CountyCode = ce_latest.CountyCode
+        AND ce_latest.Year = ey.LatestYear
+    LEFT JOIN county_latest_year ay ON c.CountyCode = ay.CountyCode
+        AND ay.SourceTable = 'county_agriculture'
+    LEFT JOIN county_agriculture ca_latest ON ay.CountyCode = ca_latest.CountyCode
+        AND ca_latest.Year = ay.LatestYear
+    LEFT JOIN county_interview_stats interview_stats ON c.CountyCode = interview_stats.CountyCode
     LEFT JOIN surveyors s ON c.CountyCode = s.CountyCode
     WHERE c.CountyCode = county_code;
 END //
@@ -78,10 +74,14 @@ BEGIN
         COUNT(DISTINCT i.SurveyorID) as ActiveSurveyors,
         COUNT(DISTINCT i.CountyCode) as CoveredCounties
     FROM poverty_counties pc
-    LEFT JOIN county_economy ce ON pc.CountyCode = ce.CountyCode
-        AND ce.Year = (SELECT MAX(Year) FROM county_economy WHERE CountyCode = pc.CountyCode)
-    LEFT JOIN county_agriculture ca ON pc.CountyCode = ca.CountyCode
-        AND ca.Year = (SELECT MAX(Year) FROM county_agriculture WHERE CountyCode = pc.CountyCode)
+    LEFT JOIN county_latest_year ey ON pc.CountyCode = ey.CountyCode
+        AND ey.SourceTable = 'county_economy'
+    LEFT JOIN county_economy ce ON ey.CountyCode = ce.CountyCode
+        AND ce.Year = ey.LatestYear
+    LEFT JOIN county_latest_year ay ON pc.CountyCode = ay.CountyCode
+        AND ay.SourceTable = 'county_agriculture'
+    LEFT JOIN county_agriculture ca ON ay.CountyCode = ca.CountyCode
+        AND ca.Year = ay.LatestYear
     LEFT JOIN interviews i ON pc.CountyCode = i.CountyCode
     WHERE pc.Region = region_name;
 END //
@@ -96,25 +96,23 @@ BEGIN
     SELECT 
         s.SurveyorID, s.Name, s.TeamID, s.Department,
         s.CountyCode, c.CountyName,
-        -- 访谈统计
-        COUNT(i.InterviewID) as TotalInterviews,
-        AVG(i.Quality) as AvgQuality,
+        -- 访谈统计（触发器维护的聚合表，按主键读取）
+        COALESCE(st.InterviewCount, 0) as TotalInterviews,
+        st.QualitySum / NULLIF(st.QualityCount, 0) as AvgQuality,
         s.CompletedInterviews as AssignedInterviews,
         CASE 
             WHEN s.CompletedInterviews > 0 
-            THEN (COUNT(i.InterviewID) * 100.0 / s.CompletedInterviews)
+            THEN (COALESCE(st.InterviewCount, 0) * 100.0 / s.CompletedInterviews)
             ELSE 0 
         END as CompletionRate,
         -- 覆盖范围
-        COUNT(DISTINCT i.CountyCode) as CoveredCounties,
-        MAX(i.InterviewDate) as LatestInterviewDate,
-        MIN(i.InterviewDate) as FirstInterviewDate
+        COALESCE(st.CoveredCounties, 0) as CoveredCounties,
+        st.LatestInterviewDate as LatestInterviewDate,
+        st.FirstInterviewDate as FirstInterviewDate
     FROM surveyors s
     LEFT JOIN county c ON s.CountyCode = c.CountyCode
-    LEFT JOIN interviews i ON s.SurveyorID = i.SurveyorID
-    WHERE s.SurveyorID = surveyor_id
-    GROUP BY s.SurveyorID, s.Name, s.TeamID, s.Department, 
-             s.CountyCode, c.CountyName, s.CompletedInterviews;
+    LEFT JOIN surveyor_interview_stats st ON s.SurveyorID = st.SurveyorID
+    WHERE s.SurveyorID = surveyor_id;
 END //
 DELIMITER ;
 
@@ -0,0 +1,149 @@
+-- 创建汇总表（物化视图）
+-- 将耗时的视图查询结果落地为带索引的实体表，由导入脚本全量重建、由写入接口按县增量刷新
+-- 维护逻辑见 backend/summaries.py，已有数据库可运行 python backend/init_summaries.py 创建并填充
+
+USE poverty_alleviation_832;
+
+-- 1. 各县各年度事实表的最新/最早年份（关键指标非空的年份，指标定义见 summaries.LATEST_YEAR_METRICS）
+-- 视图、存储过程和接口中"最新年份"的查询都改为按 (CountyCode, SourceTable) 主键连接本表
+CREATE TABLE IF NOT EXISTS county_latest_year (
+    CountyCode CHAR(6) NOT NULL COMMENT '县域代码',
+    SourceTable VARCHAR(32) NOT NULL COMMENT '年度事实表名',
+    LatestYear INT NOT NULL COMMENT '关键指标非空的最新年份',
+    EarliestYear INT NOT NULL COMMENT '关键指标非空的最早年份',
+    PRIMARY KEY (CountyCode, SourceTable),
+    INDEX idx_source_latest (SourceTable, LatestYear)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='各县各年度表的最新年份';
+
+-- 2. 访谈增量聚合：由 interviews 上的触发器逐行维护（见 08_create_triggers.sql），
+-- 读接口按主键读取，不再对 interviews 分组聚合；平均质量 = QualitySum / QualityCount
+CREATE TABLE IF NOT EXISTS surveyor_interview_stats (
+    SurveyorID VARCHAR(20) PRIMARY KEY COMMENT '调研员ID',
+    InterviewCount INT NOT NULL DEFAULT 0 COMMENT '访谈数',
+    QualitySum DECIMAL(12, 1) NOT NULL DEFAULT 0 COMMENT '质量评分之和',
+    QualityCount INT NOT NULL DEFAULT 0 COMMENT '有质量评分的访谈数',
+    FirstInterviewDate DATE COMMENT '最早访谈日期',
+    LatestInterviewDate DATE COMMENT '最新访谈日期',
+    CoveredCounties INT NOT NULL DEFAULT 0 COMMENT '访谈覆盖的县域数',
+    -- 访谈数高于平均值的调研员按访谈数倒序读取（覆盖索引）
+    INDEX idx_interview_count (InterviewCount, QualitySum, QualityCount),
+    FOREIGN KEY (SurveyorID) REFERENCES surveyors(SurveyorID) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='调研员访谈聚合';
+
+CREATE TABLE IF NOT EXISTS county_interview_stats (
+    CountyCode CHAR(6) PRIMARY KEY COMMENT '县域代码',
+    InterviewCount INT NOT NULL DEFAULT 0 COMMENT '访谈数',
+    QualitySum DECIMAL(12, 1) NOT NULL DEFAULT 0 COMMENT '质量评分之和',
+    QualityCount INT NOT NULL DEFAULT 0 COMMENT '有质量评分的访谈数',
+    LatestInterviewDate DATE COMMENT '最新访谈日期',
+    FOREIGN KEY (CountyCode) REFERENCES county(CountyCode) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='县域访谈聚合';
+
+-- 调研员访谈过的县域集合，用于维护 CoveredCounties（去重县数）
+CREATE TABLE IF NOT EXISTS surveyor_county_interviews (
+    SurveyorID VARCHAR(20) NOT NULL COMMENT '调研员ID',
+    CountyCode CHAR(6) NOT NULL COMMENT '县域代码',
+    InterviewCount INT NOT NULL DEFAULT 0 COMMENT '该调研员在该县的访谈数',
+    PRIMARY KEY (SurveyorID, CountyCode),
+    FOREIGN KEY (SurveyorID) REFERENCES surveyors(SurveyorID) ON DELETE CASCADE,
+    FOREIGN KEY (CountyCode) REFERENCES county(CountyCode) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='调研员访谈覆盖的县域集合';
+
+-- 3. 县域完整信息汇总表（v_county_complete_info 的物化结果）
+CREATE TABLE IF NOT EXISTS county_complete_info (
+    CountyCode CHAR(6) PRIMARY KEY COMMENT '县域代码',
+    CountyName VARCHAR(100) COMMENT '县域名称',
+    Province VARCHAR(50) COMMENT '所属省份',
+    City VARCHAR(50) COMMENT '所属城市',
+    Longitude DECIMAL(10, 6) COMMENT '经度',
+    Latitude DECIMAL(10, 6) COMMENT '纬度',
+    LandArea DECIMAL(12, 2) COMMENT '行政区域土地面积(平方公里)',
+    Region VARCHAR(20) COMMENT '所属地域',
+    ExitYear INT COMMENT '摘帽年份',
+    LatestEconYear INT COMMENT '最新经济数据年份',
+    GDP DECIMAL(15, 2) COMMENT '地区生产总值(万元)',
+    PerCapitaGDP DECIMAL(10, 2) COMMENT '人均地区生产总值(元/人)',
+    RuralDisposableIncome DECIMAL(10, 2) COMMENT '农村居民人均可支配收入(元)',
+    FiscalRevenue DECIMAL(15, 2) COMMENT '地方财政一般预算收入(万元)',
+    FiscalExpenditure DECIMAL(15, 2) COMMENT '地方财政一般预算支出(万元)',
+    LatestAgriYear INT COMMENT '最新农业数据年份',
+    AgriOutputValue DECIMAL(15, 2) COMMENT '农林牧渔业总产值(万元)',
+    GrainOutput DECIMAL(12, 2) COMMENT '粮食总产量(吨)',
+    InterviewCount INT NOT NULL DEFAULT 0 COMMENT '访谈数',
+    AvgInterviewQuality DECIMAL(7, 5) NOT NULL DEFAULT 0 COMMENT '平均访谈质量',
+    DataCompleteness TINYINT NOT NULL DEFAULT 0 COMMENT '数据完整性评分（GDP、农业产值、访谈各计1分）',
+    RefreshedAt TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT '刷新时间',
+    INDEX idx_region (Region),
+    INDEX idx_exit_year (ExitYear),
+    INDEX idx_province (Province),
+    INDEX idx_gdp (GDP),
+    -- 县列表按 评分降序、摘帽年份、省份、县名 排序，降序索引（MySQL 8.0）使其按索引顺序读取
+    INDEX idx_completeness_order (DataCompleteness DESC, ExitYear, Province, CountyName)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='县域完整信息汇总表';
+
+-- 4. 县域增长指标表：每个贫困县、每个指标（GDP/Income/Fiscal）一行，摘帽前后增长率与CAGR
+-- 由 backend/growth_metrics.py 在导入结束时对经济面板向量化计算后全量写入
+CREATE TABLE IF NOT EXISTS county_growth_metrics (
+    CountyCode CHAR(6) NOT NULL COMMENT '县域代码',
+    Metric VARCHAR(20) NOT NULL COMMENT '指标：GDP/Income/Fiscal',
+    Province VARCHAR(50) COMMENT '所属省份',
+    Region VARCHAR(20) COMMENT '所属地域',
+    ExitYear INT COMMENT '摘帽年份',
+    StartYear INT COMMENT '最早有数据的年份',
+    StartValue DECIMAL(15, 2) COMMENT '最早年份数值',
+    AnchorYear INT COMMENT '摘帽后（含摘帽当年）首个有数据的年份',
+    AnchorValue DECIMAL(15, 2) COMMENT '摘帽基准年份数值',
+    LatestYear INT COMMENT '最新有数据的年份',
+    LatestValue DECIMAL(15, 2) COMMENT '最新年份数值',
+    PostExitGrowth DOUBLE COMMENT '摘帽后增长率(%)：基准年到最新年',
+    PostExitCAGR DOUBLE COMMENT '摘帽后年均复合增长率(%)',
+    PreExitGrowth DOUBLE COMMENT '摘帽前增长率(%)：最早年到基准年',
+    PreExitCAGR DOUBLE COMMENT '摘帽前年均复合增长率(%)',
+    PRIMARY KEY (CountyCode, Metric),
+    INDEX idx_post_growth (Metric, PostExitGrowth),
+    INDEX idx_post_cagr (Metric, PostExitCAGR),
+    INDEX idx_pre_growth (Metric, PreExitGrowth),
+    INDEX idx_pre_cagr (Metric, PreExitCAGR),
+    FOREIGN KEY (CountyCode) REFERENCES county(CountyCode) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='县域增长指标表';
+
+-- 5. 地区统计立方体：地区 × 省份 × 摘帽年份 的全部维度组合（GroupBy 标明分组维度，空串为全国合计）
+-- 由 backend/region_cube.py 在导入结束和新增访谈时向量化计算后全量写入
+CREATE TABLE IF NOT EXISTS region_statistics_cube (
+    CubeID INT AUTO_INCREMENT PRIMARY KEY,
+    GroupBy VARCHAR(40) NOT NULL COMMENT '分组维度（逗号分隔），空串为全国合计',
+    Region VARCHAR(20) COMMENT '所属地域',
+    Province VARCHAR(50) COMMENT '所属省份',
+    ExitYear INT COMMENT '摘帽年份（分组含该维度时 NULL 表示未摘帽）',
+    CountyCount INT NOT NULL DEFAULT 0 COMMENT '贫困县数',
+    ExitedCount INT NOT NULL DEFAULT 0 COMMENT '已摘帽县数',
+    GDPCount INT NOT NULL DEFAULT 0 COMMENT 'GDP 非空县数',
+    GDPSum DECIMAL(20, 2) COMMENT 'GDP 合计',
+    GDPMean DECIMAL(17, 2) COMMENT 'GDP 均值',
+    GDPMedian DECIMAL(17, 2) COMMENT 'GDP 中位数',
+    PerCapitaGDPCount INT NOT NULL DEFAULT 0 COMMENT 'PerCapitaGDP 非空县数',
+    PerCapitaGDPSum DECIMAL(20, 2) COMMENT 'PerCapitaGDP 合计',
+    PerCapitaGDPMean DECIMAL(17, 2) COMMENT 'PerCapitaGDP 均值',
+    PerCapitaGDPMedian DECIMAL(17, 2) COMMENT 'PerCapitaGDP 中位数',
+    RuralIncomeCount INT NOT NULL DEFAULT 0 COMMENT 'RuralIncome 非空县数',
+    RuralIncomeSum DECIMAL(20, 2) COMMENT 'RuralIncome 合计',
+    RuralIncomeMean DECIMAL(17, 2) COMMENT 'RuralIncome 均值',
+    RuralIncomeMedian DECIMAL(17, 2) COMMENT 'RuralIncome 中位数',
+    AgriOutputCount INT NOT NULL DEFAULT 0 COMMENT 'AgriOutput 非空县数',
+    AgriOutputSum DECIMAL(20, 2) COMMENT 'AgriOutput 合计',
+    AgriOutputMean DECIMAL(17, 2) COMMENT 'AgriOutput 均值',
+    AgriOutputMedian DECIMAL(17, 2) COMMENT 'AgriOutput 中位数',
+    InterviewCount INT NOT NULL DEFAULT 0 COMMENT '访谈数',
+    AvgInterviewQuality DECIMAL(7, 5) COMMENT '平均访谈质量',
+    CoveredCounties INT NOT NULL DEFAULT 0 COMMENT '有访谈的县数',
+    ActiveSurveyors INT NOT NULL DEFAULT 0 COMMENT '在该范围内访谈过的调研员数',
+    INDEX idx_slice (GroupBy, Region, Province, ExitYear)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='地区统计立方体';
+
+-- 6. 表数据版本：接口响应缓存的跨进程失效（见 backend/cache.py）
+-- 写接口和导入脚本在写入事务中递增所写表的版本，各worker定期读取，版本变化的缓存项即失效
+CREATE TABLE IF NOT EXISTS data_versions (
+    TableName VARCHAR(64) PRIMARY KEY COMMENT '表名',
+    Version BIGINT NOT NULL DEFAULT 0 COMMENT '数据版本号，每次写入递增',
+    UpdatedAt TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT '最近写入时间'
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='缓存失效用的表数据版本';
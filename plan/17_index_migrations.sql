@@ -0,0 +1,38 @@
+-- 索引迁移（与 backend/init_indexes.py 中的 INDEX_MIGRATIONS 一致）
+-- 推荐运行 python backend/init_indexes.py：按版本顺序执行未应用的迁移并记录到 schema_migrations，
+-- 可重复执行；python backend/init_indexes.py --check 对登记的接口查询执行 EXPLAIN，
+-- 出现全表扫描或 filesort 时返回非零状态
+
+USE poverty_alleviation_832;
+
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    Version VARCHAR(20) PRIMARY KEY COMMENT '迁移版本号',
+    Description VARCHAR(200) COMMENT '迁移说明',
+    AppliedAt TIMESTAMP DEFAULT CURRENT_TIMESTAMP COMMENT '执行时间'
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='索引迁移记录';
+
+-- 001 访谈列表按县/调研员过滤并按访谈日期倒序：复合索引取代单列外键索引
+ALTER TABLE interviews ADD INDEX idx_county_date (CountyCode, InterviewDate);
+ALTER TABLE interviews ADD INDEX idx_surveyor_date (SurveyorID, InterviewDate);
+ALTER TABLE interviews DROP INDEX idx_county;
+ALTER TABLE interviews DROP INDEX idx_surveyor;
+INSERT INTO schema_migrations (Version, Description) VALUES ('001', '访谈列表按县/调研员过滤并按访谈日期倒序：复合索引取代单列外键索引');
+
+-- 002 地图接口：按省份、县名有序读取并在索引内过滤经纬度（覆盖索引）
+ALTER TABLE county ADD INDEX idx_province_name_geo (Province, CountyName, Longitude, Latitude);
+INSERT INTO schema_migrations (Version, Description) VALUES ('002', '地图接口：按省份、县名有序读取并在索引内过滤经纬度（覆盖索引）');
+
+-- 003 县列表：数据完整性评分存为汇总表列，按 (评分降序, 摘帽年份, 省份, 县名) 索引顺序读取
+-- （新建的 county_complete_info 已包含该列和索引，只有旧库需要执行）
+ALTER TABLE county_complete_info ADD COLUMN DataCompleteness TINYINT NOT NULL DEFAULT 0
+    COMMENT '数据完整性评分（GDP、农业产值、访谈各计1分）' AFTER AvgInterviewQuality;
+UPDATE county_complete_info SET DataCompleteness =
+    CASE WHEN GDP IS NOT NULL THEN 1 ELSE 0 END +
+    CASE WHEN AgriOutputValue IS NOT NULL THEN 1 ELSE 0 END +
+    CASE WHEN InterviewCount > 0 THEN 1 ELSE 0 END;
+ALTER TABLE county_complete_info ADD INDEX idx_completeness_order (DataCompleteness DESC, ExitYear, Province, CountyName);
+INSERT INTO schema_migrations (Version, Description) VALUES ('003', '县列表：数据完整性评分存为汇总表列，按 (评分降序, 摘帽年份, 省份, 县名) 索引顺序读取');
+
+-- 004 访谈数高于平均值的调研员：从统计表出发按访谈数倒序读取（覆盖索引）
+ALTER TABLE surveyor_interview_stats ADD INDEX idx_interview_count (InterviewCount, QualitySum, QualityCount);
+INSERT INTO schema_migrations (Version, Description) VALUES ('004', '访谈数高于平均值的调研员：从统计表出发按访谈数倒序读取（覆盖索引）');